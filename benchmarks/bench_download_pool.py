@@ -0,0 +1,117 @@
+"""Throughput of the download pool vs. the former serial download thread, against a local file server.
+
+The server throttles each connection, like a CDN edge, so throughput comes from parallel transfers.
+
+Run with: blender -b --factory-startup --python benchmarks/bench_download_pool.py
+"""
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hunyuan3d_blender.ops.result_management import download_model, MAX_DOWNLOADS, MAX_DOWNLOADS_PER_HOST
+from hunyuan3d_blender.utils.download_pool import DownloadPool, PRIORITY_HIGH, PRIORITY_LOW
+
+
+FILE_COUNT = 12
+FILE_SIZE = 4 * 1024 * 1024
+LATENCY = 0.1
+BYTES_PER_SECOND = 8 * 1024 * 1024  # Per connection.
+SEND_CHUNK = 64 * 1024
+LEGACY_SLEEP = 0.5  # Pause the serial thread took between downloads.
+
+PAYLOAD = bytes(range(256)) * (FILE_SIZE // 256)
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_served = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with FileHandler.lock:
+            FileHandler.requests_served += 1
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "model/gltf-binary")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        for offset in range(0, len(PAYLOAD), SEND_CHUNK):
+            self.wfile.write(PAYLOAD[offset:offset + SEND_CHUNK])
+            time.sleep(SEND_CHUNK / BYTES_PER_SECOND)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_serial(urls: list[str], dirpath: Path) -> float:
+    start = time.perf_counter()
+    for index, url in enumerate(urls):
+        success, _filepath = download_model(url, str(dirpath / f"serial_{index}.glb"))
+        assert success
+        time.sleep(LEGACY_SLEEP)
+    return time.perf_counter() - start
+
+
+def run_pool(urls: list[str], dirpath: Path, priorities: list[int]) -> tuple[float, list[str]]:
+    pool = DownloadPool(download_model, max_workers=MAX_DOWNLOADS, max_per_host=MAX_DOWNLOADS_PER_HOST)
+    done = threading.Semaphore(0)
+    completion_order = []
+
+    def on_complete(key):
+        def callback(success, filepath):
+            assert success and Path(filepath).stat().st_size == FILE_SIZE
+            completion_order.append(key)
+            done.release()
+        return callback
+
+    start = time.perf_counter()
+    for index, (url, priority) in enumerate(zip(urls, priorities)):
+        key = f"pool_{index}"
+        pool.request(key, url, str(dirpath / f"{key}.glb"), priority=priority, on_complete=on_complete(key))
+    for _ in urls:
+        done.acquire()
+    return time.perf_counter() - start, completion_order
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    # Two host names for the same server, to exercise the per-host limit.
+    urls = [f"http://{'127.0.0.1' if i % 2 else 'localhost'}:{port}/asset_{i}.glb" for i in range(FILE_COUNT)]
+    total_mb = FILE_COUNT * FILE_SIZE / 1e6
+
+    print(f"{FILE_COUNT} files x {FILE_SIZE / 1e6:.1f} MB, {LATENCY * 1000:.0f} ms latency, "
+          f"{BYTES_PER_SECOND / 1e6:.1f} MB/s per connection")
+    print(f"pool: {MAX_DOWNLOADS} workers, {MAX_DOWNLOADS_PER_HOST} per host\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dirpath = Path(tmp)
+
+        elapsed = run_serial(urls, dirpath)
+        print(f"{'serial + sleep':<18} {elapsed:>7.2f} s {total_mb / elapsed:>7.1f} MB/s")
+
+        elapsed, _order = run_pool(urls, dirpath, [PRIORITY_LOW] * FILE_COUNT)
+        print(f"{'pool':<18} {elapsed:>7.2f} s {total_mb / elapsed:>7.1f} MB/s")
+
+        # The last requests are imports: they should finish among the first.
+        priorities = [PRIORITY_LOW] * (FILE_COUNT - 2) + [PRIORITY_HIGH] * 2
+        _elapsed, order = run_pool(urls, dirpath, priorities)
+        ranks = sorted(order.index(f"pool_{i}") for i in (FILE_COUNT - 2, FILE_COUNT - 1))
+        print(f"{'priority':<18} imports queued last finished at positions {[rank + 1 for rank in ranks]}")
+
+        # The same URL requested 4 times is transferred once.
+        FileHandler.requests_served = 0
+        _elapsed, _order = run_pool([urls[0]] * 4, dirpath, [PRIORITY_LOW] * 4)
+        print(f"{'dedup':<18} 4 requests for one URL -> {FileHandler.requests_served} transfer(s)")
+
+    server.shutdown()
+
+
+main()
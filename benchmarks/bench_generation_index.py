@@ -0,0 +1,93 @@
+"""Time to select the generations of a page, as the panel does on every redraw: the maintained
+index vs. the former list, reverse, slice and filter of the whole collection.
+
+The generations have 4 results each; a third of them are failed. The index is timed warm (a
+redraw) and rebuilt (after a generation was added or changed status).
+
+Run with: blender -b --factory-startup --python benchmarks/bench_generation_index.py
+"""
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hunyuan3d_blender.data import scn
+from hunyuan3d_blender.utils.generation_index import get_page_generations, invalidate_generation_index
+
+
+GENERATION_COUNTS = (100, 1000, 5000)
+PAGE_SIZE = 10
+REPEATS = 20
+CLASSES = (
+    scn.H3D_PG_generation_image,
+    scn.H3D_PG_intermediate_output,
+    scn.H3D_PG_generation_url_result,
+    scn.H3D_PG_generation_result,
+    scn.H3D_PG_generation_details,
+    scn.H3D_SCN_Properties,
+)
+
+
+def legacy_page(scn_h3d, wm_h3d, page_index: int) -> list:
+    """The former steps of `draw_generation_details`: filtered after slicing."""
+    generations = list(scn_h3d.generation_details)
+    start_index = page_index * wm_h3d.ui_filter_generation_page_size
+    end_index = min(start_index + wm_h3d.ui_filter_generation_page_size, len(generations))
+    if not wm_h3d.ui_filter_generation_page_order_invert:
+        generations = list(reversed(generations))
+    generations = generations[start_index:end_index]
+    return [generation for generation in generations
+            if generation.show_in_gen_ui and generation.status == wm_h3d.ui_filter_generation_status]
+
+
+def fill(scn_h3d, count: int) -> None:
+    scn_h3d.generation_details.clear()
+    for index in range(count):
+        generation = scn_h3d.generation_details.add()
+        generation.name = f"generation_{index}"
+        generation.show_in_gen_ui = True
+        generation.status = "fail" if index % 3 == 0 else "success"
+        for result_index in range(4):
+            generation.result.add().name = f"result_{index}_{result_index}"
+
+
+def measure(func) -> float:
+    """Median time in ms."""
+    func()  # Warm up.
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def main():
+    for cls in CLASSES:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.h3d = bpy.props.PointerProperty(type=scn.H3D_SCN_Properties)
+    scn_h3d = bpy.context.scene.h3d
+    wm_h3d = SimpleNamespace(ui_filter_generation_status="success", ui_filter_generation_page_size=PAGE_SIZE,
+                             ui_filter_generation_page_order_invert=False)
+
+    print(f"{'generations':>12} {'former':>10} {'index':>10} {'rebuild':>10} {'rows (former/index)':>20}")
+    for count in GENERATION_COUNTS:
+        fill(scn_h3d, count)
+        legacy_time = measure(lambda: legacy_page(scn_h3d, wm_h3d, 1))
+        index_time = measure(lambda: get_page_generations(scn_h3d, wm_h3d, 1))
+
+        def rebuild():
+            invalidate_generation_index()
+            get_page_generations(scn_h3d, wm_h3d, 1)
+
+        rebuild_time = measure(rebuild)
+        rows = f"{len(legacy_page(scn_h3d, wm_h3d, 1))}/{len(get_page_generations(scn_h3d, wm_h3d, 1))}"
+        print(f"{count:>12} {legacy_time:>7.2f} ms {index_time:>7.3f} ms {rebuild_time:>7.2f} ms {rows:>20}")
+
+
+main()
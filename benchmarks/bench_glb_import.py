@@ -0,0 +1,132 @@
+"""Main-thread stalls while importing a batch of dense GLB results: glTF importer vs. the
+threaded parse + time-sliced build pipeline.
+
+Writes synthetic results (UV spheres with ~100k faces and a 2K base color texture), then
+imports them both ways. Timers don't run in background mode, so the pipeline timer is
+driven by hand and each tick is timed.
+
+Run with: blender -b --factory-startup --python benchmarks/bench_glb_import.py
+"""
+import io
+import sys
+import json
+import time
+import struct
+import tempfile
+import numpy as np
+from pathlib import Path
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hunyuan3d_blender.utils.glb import parse_glb
+from hunyuan3d_blender.utils import glb_import
+from hunyuan3d_blender.utils.image_encode import PILImage
+
+
+RESULT_COUNT = 12
+SEGMENTS = 316  # ~100k triangles.
+TEXTURE_SIZE = 2048
+
+
+def make_sphere(segments: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    rings = segments // 2
+    u, v = np.meshgrid(np.linspace(0.0, 1.0, segments + 1), np.linspace(0.0, 1.0, rings + 1))
+    theta, phi = u * 2.0 * np.pi, v * np.pi
+    normals = np.stack([np.sin(phi) * np.cos(theta), np.cos(phi), np.sin(phi) * np.sin(theta)], axis=-1).reshape(-1, 3)
+    uvs = np.stack([u, v], axis=-1).reshape(-1, 2)
+    row = segments + 1
+    quads = np.array([[r * row + s, (r + 1) * row + s, (r + 1) * row + s + 1, r * row + s + 1]
+                      for r in range(rings) for s in range(segments)], dtype=np.uint32)
+    triangles = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+    return normals.astype(np.float32), normals.astype(np.float32), uvs.astype(np.float32), triangles
+
+
+def write_glb(filepath: Path, texture_png: bytes) -> int:
+    positions, normals, uvs, triangles = make_sphere(SEGMENTS)
+    blobs = [positions.tobytes(), normals.tobytes(), uvs.tobytes(), triangles.tobytes(), texture_png]
+    buffer_views, offset = [], 0
+    for blob in blobs:
+        buffer_views.append({"buffer": 0, "byteOffset": offset, "byteLength": len(blob)})
+        offset += (len(blob) + 3) & ~3
+    binary = b"".join(blob + b"\0" * (((len(blob) + 3) & ~3) - len(blob)) for blob in blobs)
+    gltf = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0, "name": "sphere"}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0, "NORMAL": 1, "TEXCOORD_0": 2}, "indices": 3, "material": 0}]}],
+        "materials": [{"pbrMetallicRoughness": {"baseColorTexture": {"index": 0}}}],
+        "textures": [{"source": 0}],
+        "images": [{"bufferView": 4, "mimeType": "image/png"}],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": len(positions), "type": "VEC3",
+             "min": positions.min(axis=0).tolist(), "max": positions.max(axis=0).tolist()},
+            {"bufferView": 1, "componentType": 5126, "count": len(normals), "type": "VEC3"},
+            {"bufferView": 2, "componentType": 5126, "count": len(uvs), "type": "VEC2"},
+            {"bufferView": 3, "componentType": 5125, "count": triangles.size, "type": "SCALAR"},
+        ],
+        "bufferViews": buffer_views,
+        "buffers": [{"byteLength": len(binary)}],
+    }
+    json_chunk = json.dumps(gltf).encode()
+    json_chunk += b" " * (((len(json_chunk) + 3) & ~3) - len(json_chunk))
+    with filepath.open('wb') as f:
+        f.write(struct.pack('<III', 0x46546C67, 2, 12 + 8 + len(json_chunk) + 8 + len(binary)))
+        f.write(struct.pack('<II', len(json_chunk), 0x4E4F534A) + json_chunk)
+        f.write(struct.pack('<II', len(binary), 0x004E4942) + binary)
+    return len(triangles)
+
+
+def clear_scene():
+    for collection in (bpy.data.objects, bpy.data.meshes, bpy.data.materials, bpy.data.images):
+        for datablock in list(collection):
+            collection.remove(datablock)
+
+
+def main():
+    noise = (np.random.default_rng(0).random((TEXTURE_SIZE, TEXTURE_SIZE, 3)) * 255).astype(np.uint8)
+    png = io.BytesIO()
+    PILImage.fromarray(noise).save(png, format="PNG", compress_level=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filepaths = [Path(tmp) / f"result_{i}.glb" for i in range(RESULT_COUNT)]
+        for filepath in filepaths:
+            faces = write_glb(filepath, png.getvalue())
+        print(f"{RESULT_COUNT} results x {faces} faces, {TEXTURE_SIZE}px texture\n")
+
+        start = time.perf_counter()
+        scene = parse_glb(filepaths[0])
+        scene.cleanup()
+        print(f"parse_glb (worker thread): {(time.perf_counter() - start) * 1000:.0f} ms per result")
+
+        clear_scene()
+        stalls = []
+        for filepath in filepaths:
+            start = time.perf_counter()
+            bpy.ops.import_scene.gltf(filepath=str(filepath))
+            stalls.append(time.perf_counter() - start)
+        print(f"import_scene.gltf: {sum(stalls):.2f} s total, longest main-thread stall {max(stalls) * 1000:.0f} ms")
+
+        clear_scene()
+        imported = []
+        start = time.perf_counter()
+        for i, filepath in enumerate(filepaths):
+            glb_import.request_glb_import(f"result_{i}", str(filepath), imported.append)
+        ticks = []
+        while True:
+            tick_start = time.perf_counter()
+            interval = glb_import.glb_import_timer()
+            ticks.append(time.perf_counter() - tick_start)
+            if interval is None:
+                break
+            time.sleep(interval)
+        total = time.perf_counter() - start
+        assert len(imported) == RESULT_COUNT
+        busy = np.array(ticks)
+        print(f"pipeline:          {total:.2f} s total, {busy.sum():.2f} s on the main thread in {len(ticks)} ticks, "
+              f"longest {busy.max() * 1000:.0f} ms, p95 {np.percentile(busy, 95) * 1000:.0f} ms")
+
+
+main()
@@ -0,0 +1,49 @@
+"""Encode time vs. resolution for the image-to-3D upload encoder.
+
+Run with: blender -b --factory-startup --python benchmarks/bench_image_encode.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hunyuan3d_blender.utils.image_encode import read_image_pixels, encode_pixels
+
+
+RESOLUTIONS = (256, 512, 1024, 2048, 4096)
+
+
+def make_image(size: int, alpha: bool) -> bpy.types.Image:
+    image = bpy.data.images.new(f"bench_{size}", width=size, height=size, alpha=True)
+    rng = np.random.default_rng(size)
+    # Smooth gradients plus a bit of noise compress like a real photo rather than pure noise.
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    pixels = np.empty((size, size, 4), dtype=np.float32)
+    pixels[..., 0] = x
+    pixels[..., 1] = y
+    pixels[..., 2] = 0.5 + 0.05 * rng.standard_normal((size, size))
+    pixels[..., 3] = (x > 0.1) if alpha else 1.0
+    image.pixels.foreach_set(pixels.ravel())
+    return image
+
+
+def main():
+    print(f"{'size':>6} {'alpha':>6} {'read ms':>9} {'encode ms':>10} {'format':>10} {'KiB':>8}")
+    for size in RESOLUTIONS:
+        for alpha in (False, True):
+            image = make_image(size, alpha)
+            start = time.perf_counter()
+            pixels = read_image_pixels(image)
+            read_ms = (time.perf_counter() - start) * 1000.0
+            start = time.perf_counter()
+            encoded = encode_pixels(pixels)
+            encode_ms = (time.perf_counter() - start) * 1000.0
+            print(f"{size:>6} {str(alpha):>6} {read_ms:>9.1f} {encode_ms:>10.1f} {encoded.mime_type:>10} {len(encoded.data) / 1024:>8.0f}")
+            bpy.data.images.remove(image)
+
+
+main()
@@ -0,0 +1,87 @@
+"""Poll tick time vs. number of running generations against a local mock server with injected latency.
+
+Run with: blender -b --factory-startup --python benchmarks/bench_poll_concurrency.py
+"""
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hunyuan3d_blender.api.session import get_session
+from hunyuan3d_blender.api.h3d import get_creation_details
+from hunyuan3d_blender.api.worker import fetch_generation_details
+
+
+LATENCY = 0.15
+GENERATION_COUNTS = (1, 3, 10, 50)
+API_ORIGIN = "https://3d.hunyuan.tencent.com"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = set()
+
+    def do_GET(self):
+        MockHandler.connections.add(self.client_address)
+        time.sleep(LATENCY)
+        creation_id = parse_qs(urlparse(self.path).query).get("creationsId", [""])[0]
+        body = json.dumps({"id": creation_id, "status": "processing", "result": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RedirectAdapter(HTTPAdapter):
+    """Sends API requests to the local mock server instead."""
+
+    def __init__(self, origin: str):
+        self.origin = origin
+        super().__init__()
+
+    def send(self, request, **kwargs):
+        request.url = request.url.replace(API_ORIGIN, self.origin)
+        return super().send(request, **kwargs)
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    get_session().mount("https://", RedirectAdapter(f"http://127.0.0.1:{server.server_address[1]}"))
+
+    print(f"latency {LATENCY * 1000:.0f} ms per request")
+    print(f"{'running':>8} {'sequential ms':>14} {'concurrent ms':>14} {'connections':>12}")
+    for count in GENERATION_COUNTS:
+        creation_ids = [f"creation_{i}" for i in range(count)]
+
+        start = time.perf_counter()
+        for creation_id in creation_ids:
+            get_creation_details(creation_id)
+        sequential_ms = (time.perf_counter() - start) * 1000.0
+
+        # Warm-up tick opens the pooled connections, then measure a steady-state tick.
+        list(fetch_generation_details(creation_ids))
+        MockHandler.connections.clear()
+        start = time.perf_counter()
+        results = dict(fetch_generation_details(creation_ids))
+        concurrent_ms = (time.perf_counter() - start) * 1000.0
+        assert all(results[creation_id]["id"] == creation_id for creation_id in creation_ids)
+
+        print(f"{count:>8} {sequential_ms:>14.0f} {concurrent_ms:>14.0f} {len(MockHandler.connections):>12}")
+
+    server.shutdown()
+
+
+main()
@@ -0,0 +1,85 @@
+"""Time and peak allocations of the preview pipeline, from decoded pixels to the thumbnail,
+vs. the former float32 pipeline of `get_image_from_url`, over realistic preview sizes.
+
+Both start from the decoded RGBA uint8 array, the decode itself being the same. Peak
+allocations are NumPy's, traced by tracemalloc; Pillow's internal buffers aren't.
+
+Run with: blender -b --factory-startup --python benchmarks/bench_preview_decode.py
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hunyuan3d_blender.utils.image import make_thumbnail, DEFAULT_THUMBNAIL_SIZE
+
+
+SIZES = (512, 1024, 2048)
+REPEATS = 10
+
+
+def make_preview(size: int) -> np.ndarray:
+    """A render on a white background: a shaded object covering about half the frame."""
+    pixels = np.full((size, size, 4), 255, dtype=np.uint8)
+    y, x = np.ogrid[:size, :size]
+    center, radius = size / 2, size * 0.35
+    distance = np.sqrt((x - center) ** 2 + (y - center * 1.1) ** 2)
+    inside = distance < radius
+    shade = (200 * (1 - distance / radius) + 30).astype(np.uint8)
+    pixels[..., 0][inside] = shade[inside]
+    pixels[..., 1][inside] = (shade[inside] * 0.8).astype(np.uint8)
+    pixels[..., 2][inside] = (shade[inside] * 0.6).astype(np.uint8)
+    return pixels
+
+
+def legacy_pipeline(img_array_raw: np.ndarray) -> np.ndarray:
+    """The former steps: float32 conversion, crop on a full resolution mask, flip, ravel."""
+    img = img_array_raw.astype(np.float32) / 255.0
+    r, g, b, a = img[..., 0], img[..., 1], img[..., 2], img[..., 3]
+    mask = ~((r == 1.0) & (g == 1.0) & (b == 1.0) | (a == 0.0))
+    rows = np.any(mask, axis=1)
+    cols = np.any(mask, axis=0)
+    y_min, y_max = np.where(rows)[0][[0, -1]]
+    x_min, x_max = np.where(cols)[0][[0, -1]]
+    y_min, y_max = max(0, y_min - 5), min(img.shape[0] - 1, y_max + 5)
+    x_min, x_max = max(0, x_min - 5), min(img.shape[1] - 1, x_max + 5)
+    img = img[y_min:y_max + 1, x_min:x_max + 1]
+    # Handed to `image.pixels.foreach_set`.
+    return np.flipud(img).ravel()
+
+
+def measure(func, pixels: np.ndarray) -> tuple[float, float]:
+    """Median time in ms and peak allocated MB."""
+    func(pixels)  # Warm up.
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(pixels)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func(pixels)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(times)) * 1000, peak / 2 ** 20
+
+
+def main():
+    print(f"{'size':>6} {'pipeline':>28} {'time':>10} {'peak alloc':>12} {'output':>10}")
+    for size in SIZES:
+        pixels = make_preview(size)
+        pipelines = (
+            ("former float32", legacy_pipeline),
+            ("uint8, crop only", lambda pixels: make_thumbnail(pixels, size)),
+            (f"uint8, {DEFAULT_THUMBNAIL_SIZE} px thumbnail", lambda pixels: make_thumbnail(pixels, DEFAULT_THUMBNAIL_SIZE)),
+        )
+        for name, func in pipelines:
+            elapsed, peak = measure(func, pixels)
+            output = func(pixels)
+            print(f"{size:>6} {name:>28} {elapsed:>7.2f} ms {peak:>9.2f} MB {output.nbytes / 2 ** 20:>7.2f} MB")
+
+
+main()
@@ -0,0 +1,165 @@
+"""Time to complete a page of result previews: the pooled loader vs. the former serial thread,
+against a local image server.
+
+A page of 10 generations x 4 results x 2-3 previews is ~100 images. The next page is queued
+as prefetch before the visible one, to check that visible images still go first. Each run
+starts from an empty thumbnail cache, except the last one: a project reopened with its
+previews cached. Each pool run also reports the main thread side: the longest timer tick
+spent applying loaded images, and the deepest queue of images waiting for it. A last run
+shares each URL among the 4 results of a generation, like their input image, to count the
+requests actually sent.
+
+Run with: blender -b --factory-startup --python benchmarks/bench_preview_loader.py
+"""
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import imageio.v3 as iio
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hunyuan3d_blender.utils import image as image_loader
+from hunyuan3d_blender.utils import asset_cache
+from hunyuan3d_blender.utils.asset_cache import AssetCache
+from hunyuan3d_blender.utils.image import (
+    get_image_from_url, request_image_load, wait_for_image_processing, cancel_image_loads,
+    reset_upload_stats, get_upload_stats, PRIORITY_VISIBLE, PRIORITY_PREFETCH, DEFAULT_MAX_WORKERS,
+)
+
+
+PAGE_IMAGES = 100
+IMAGE_SIZE = 512
+LATENCY = 0.1  # Per request, like a CDN round trip.
+LEGACY_SLEEP = 0.15  # Pause the serial thread took after every image.
+POLL_INTERVAL = 0.01
+RESULTS_PER_GENERATION = 4
+
+
+def make_png() -> bytes:
+    # Content in the middle of a white margin, cropped by the loader.
+    pixels = np.full((IMAGE_SIZE, IMAGE_SIZE, 4), 255, dtype=np.uint8)
+    y, x = np.mgrid[0:IMAGE_SIZE // 2, 0:IMAGE_SIZE // 2]
+    pixels[IMAGE_SIZE // 4:IMAGE_SIZE * 3 // 4, IMAGE_SIZE // 4:IMAGE_SIZE * 3 // 4, 0] = (x % 256).astype(np.uint8)
+    pixels[IMAGE_SIZE // 4:IMAGE_SIZE * 3 // 4, IMAGE_SIZE // 4:IMAGE_SIZE * 3 // 4, 1] = (y % 256).astype(np.uint8)
+    return iio.imwrite("<bytes>", pixels, extension=".png")
+
+
+PAYLOAD = make_png()
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_served = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with ImageHandler.lock:
+            ImageHandler.requests_served += 1
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def use_empty_cache(dirpath: Path) -> None:
+    asset_cache.thumbnail_cache = AssetCache(Path(tempfile.mkdtemp(dir=dirpath)))
+
+
+def remove_images(prefix: str) -> None:
+    for image in [image for image in bpy.data.images if image.name.startswith(prefix)]:
+        bpy.data.images.remove(image)
+
+
+def run_serial(urls: list[str]) -> float:
+    start = time.perf_counter()
+    for index, url in enumerate(urls):
+        assert get_image_from_url(f"serial_{index}", url) is not None
+        time.sleep(LEGACY_SLEEP)
+    return time.perf_counter() - start
+
+
+def run_pool(visible_urls: list[str], prefetch_urls: list[str], max_workers: int) -> tuple[float, int, int]:
+    """Returns the time to complete the visible page, the prefetched images loaded by then,
+    and the queued requests cancelled afterwards."""
+    image_loader.set_max_workers(max_workers)
+    reset_upload_stats()
+    visible_done = []
+    prefetch_done = []
+
+    start = time.perf_counter()
+    for index, url in enumerate(prefetch_urls):
+        request_image_load(f"pool_next_{index}", url, prefetch_done.append, priority=PRIORITY_PREFETCH)
+    for index, url in enumerate(visible_urls):
+        request_image_load(f"pool_page_{index}", url, visible_done.append, priority=PRIORITY_VISIBLE)
+    # What the image processing timer does in the UI.
+    while len(visible_done) < len(visible_urls):
+        wait_for_image_processing()
+        time.sleep(POLL_INTERVAL)
+    elapsed = time.perf_counter() - start
+
+    # Paginating away drops the prefetch still queued.
+    prefetched = len(prefetch_done)
+    cancelled = cancel_image_loads()
+    while wait_for_image_processing() is not None:
+        time.sleep(POLL_INTERVAL)
+    return elapsed, prefetched, cancelled
+
+
+def format_upload_stats() -> str:
+    stats = get_upload_stats()
+    return (f"main thread: longest tick {stats['max_tick_time'] * 1000:.1f} ms, "
+            f"queue up to {stats['max_queue_depth']}, {stats['deferred_ticks']}/{stats['ticks']} ticks deferred")
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    visible_urls = [f"{base_url}/page/{index}.png" for index in range(PAGE_IMAGES)]
+    prefetch_urls = [f"{base_url}/next/{index}.png" for index in range(PAGE_IMAGES)]
+
+    try:
+        with tempfile.TemporaryDirectory() as dirpath:
+            use_empty_cache(Path(dirpath))
+            serial_time = run_serial(visible_urls)
+            remove_images("serial_")
+            print(f"Serial thread:      {serial_time:6.2f} s for {PAGE_IMAGES} images")
+            for max_workers in sorted({1, 4, DEFAULT_MAX_WORKERS, 12}):
+                use_empty_cache(Path(dirpath))
+                pool_time, prefetched, cancelled = run_pool(visible_urls, prefetch_urls, max_workers)
+                remove_images("pool_")
+                print(f"Pool, {max_workers:2d} workers:   {pool_time:6.2f} s ({serial_time / pool_time:4.1f}x), "
+                      f"{prefetched} prefetched images loaded before the page, {cancelled} cancelled on paginate")
+                print(f"                    {format_upload_stats()}")
+
+            # Reopened project: the thumbnails of the last run are cached.
+            requests_before = ImageHandler.requests_served
+            cached_time, _prefetched, _cancelled = run_pool(visible_urls, [], DEFAULT_MAX_WORKERS)
+            remove_images("pool_")
+            print(f"Cached thumbnails:  {cached_time:6.2f} s, "
+                  f"{ImageHandler.requests_served - requests_before} requests, {format_upload_stats()}")
+
+            # Each URL requested once per result, under its own image id.
+            use_empty_cache(Path(dirpath))
+            shared_urls = [f"{base_url}/input/{index // RESULTS_PER_GENERATION}.png" for index in range(PAGE_IMAGES)]
+            requests_before = ImageHandler.requests_served
+            shared_time, _prefetched, _cancelled = run_pool(shared_urls, [], DEFAULT_MAX_WORKERS)
+            remove_images("pool_")
+            print(f"Shared URLs:        {shared_time:6.2f} s, {ImageHandler.requests_served - requests_before} requests "
+                  f"for {PAGE_IMAGES} images of {len(set(shared_urls))} URLs")
+    finally:
+        server.shutdown()
+
+
+main()
@@ -0,0 +1,62 @@
+"""Posts a StreamingJSONBody to a local HTTP stand-in and checks the received body byte-for-byte.
+
+Run with: blender -b --factory-startup --python benchmarks/check_streaming_body.py
+"""
+import os
+import sys
+import json
+import base64
+import threading
+import tracemalloc
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hunyuan3d_blender.api.streaming import StreamingJSONBody
+
+
+received = {}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        received["body"] = self.rfile.read(length)
+        received["transfer_encoding"] = self.headers.get("Transfer-Encoding")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"creationsId": "stand-in"}')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/3d/creations/generations"
+
+    payload = {"prompt": "a \"quoted\" prompt ✓", "count": 4, "enable_pbr": True, "guidance_scale": 5.0}
+    for size in (0, 1, 2, 3, 1000, 5 * 1024 * 1024 + 7):
+        data = os.urandom(size)
+        expected = json.dumps({**payload, "image": f"data:image/png;base64,{base64.b64encode(data).decode('ascii')}"}).encode('utf-8')
+
+        tracemalloc.start()
+        response = requests.post(url, data=StreamingJSONBody(payload, "image", data, "image/png"),
+                                 headers={"Content-Type": "application/json"}, timeout=30)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        response.raise_for_status()
+        assert received["body"] == expected, f"body mismatch for {size} bytes"
+        assert received["transfer_encoding"] is None, "body should be sent with Content-Length"
+        print(f"{size:>10} bytes image: body matches ({len(expected)} bytes), peak alloc {peak / 1024:.0f} KiB (includes the stand-in's copy of the body)")
+
+    server.shutdown()
+
+
+main()
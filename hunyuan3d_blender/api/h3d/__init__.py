@@ -5,5 +5,6 @@ from .getuserinfo import get_user_info
 from .quotainfo import get_quota_info
 from .config import get_h3d_config
 from .login import login_with_email
+from .errors import RateLimitError
 
-__all__ = ["generate_3d_model", "get_creation_details", "get_creations_list", "get_user_info", "get_quota_info", "get_h3d_config", "login_with_email"]
+__all__ = ["generate_3d_model", "get_creation_details", "get_creations_list", "get_user_info", "get_quota_info", "get_h3d_config", "login_with_email", "RateLimitError"]
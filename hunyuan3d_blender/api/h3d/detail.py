@@ -3,7 +3,7 @@ import uuid
 
 from ..session import get_session
 
-def get_creation_details(creations_id: str):
+def get_creation_details(creations_id: str, timeout: float = 10.0):
     """Fetches the details of a specific 3D creation task using its ID."""
 
     session = get_session()
@@ -18,7 +18,7 @@ def get_creation_details(creations_id: str):
     }
 
     try:
-        response = session.get(url, headers=headers)
+        response = session.get(url, headers=headers, timeout=timeout)
         response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
         return response.json()
     except requests.exceptions.RequestException as e:
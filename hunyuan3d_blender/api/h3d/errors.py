@@ -0,0 +1,16 @@
+class RateLimitError(Exception):
+    """Raised when the Hunyuan 3D API rejects a request because of rate or concurrency limits (HTTP 429)."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a Retry-After header given in seconds. HTTP-date values are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -1,16 +1,12 @@
 import requests
 import uuid
-import base64
-import io
+import numpy as np
 from bpy.types import Image
 
-try:
-    from PIL import Image as PILImage
-except ImportError:
-    PILImage = None
-    print("⚠️  Warning: Pillow (PIL) not available. Image-to-3D functionality will not work.")
-
 from ..session import get_session
+from .errors import RateLimitError, parse_retry_after
+from ..streaming import StreamingJSONBody
+from ...utils.image_encode import PILImage, encode_image, encode_pixels_to_budget, DEFAULT_MAX_EDGE, DEFAULT_MAX_BYTES
 
 def generate_3d_model(
     prompt: str, 
@@ -19,15 +15,20 @@ def generate_3d_model(
     count: int = 4, 
     enable_pbr: bool = True, 
     enable_low_poly: bool = False, 
-    image: Image = None,
+    image: Image | np.ndarray | None = None,
     remove_background: bool = True,
     octree_resolution: int = 256,
     inference_steps: int = 5,
     guidance_scale: float = 5.0,
-    face_count: int = 40000
+    face_count: int = 40000,
+    image_max_edge: int = DEFAULT_MAX_EDGE,
+    image_max_bytes: int = DEFAULT_MAX_BYTES
 ) -> str | None:
     """Sends a request to the Hunyuan 3D API to generate a 3D model based on a text prompt or image.
 
+        Returns the creation ID, or None on failure. Raises RateLimitError when the service
+        rejects the request because of rate or concurrency limits.
+
         Arguments:
             prompt: str - The prompt to generate the 3D model from.
             title: str - The title of the generation (usually the prompt).
@@ -35,12 +36,15 @@ def generate_3d_model(
             count: int - The number of 3D models to generate.
             enable_pbr: bool - Whether to enable PBR for the 3D model.
             enable_low_poly: bool - Whether to enable low poly for the 3D model.
-            image: Image - Optional image for image-to-3D generation.
+            image: Image | np.ndarray - Optional image for image-to-3D generation, either a Blender image
+                (main thread only) or top-down RGBA uint8 pixels from `read_image_pixels`.
             remove_background: bool - Whether to remove background from input image.
             octree_resolution: int - Resolution of the generated mesh (256, 384, or 512).
             inference_steps: int - Number of inference steps (5-50).
             guidance_scale: float - Guidance scale for generation (1.0-15.0).
             face_count: int - Maximum number of faces for texture generation.
+            image_max_edge: int - Input image is downscaled so its longest edge fits this size.
+            image_max_bytes: int - Budget in bytes for the encoded input image (as base64 data URL).
     """
 
     session = get_session()
@@ -64,34 +68,18 @@ def generate_3d_model(
     }
     
     # Add image data if provided (for image-to-3D)
+    encoded_image = None
     if image is not None:
         if PILImage is None:
             print("❌ Error: Pillow (PIL) is required for image-to-3D generation")
             return None
             
         try:
-            # Get image pixels as bytes
-            width, height = image.size
-            pixels = list(image.pixels)
-            
-            # Convert float pixels (0.0-1.0) to bytes (0-255)
-            pixel_bytes = bytearray()
-            for i in range(0, len(pixels), 4):
-                r = int(pixels[i] * 255)
-                g = int(pixels[i+1] * 255)
-                b = int(pixels[i+2] * 255)
-                a = int(pixels[i+3] * 255)
-                pixel_bytes.extend([r, g, b, a])
-            
-            # Create PIL Image (requires Pillow from wheels)
-            pil_image = PILImage.frombytes('RGBA', (width, height), bytes(pixel_bytes))
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            pil_image.save(buffer, format='PNG')
-            img_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            
-            payload["image"] = f"data:image/png;base64,{img_base64}"
+            if isinstance(image, np.ndarray):
+                encoded_image = encode_pixels_to_budget(image, image_max_edge, image_max_bytes)
+            else:
+                encoded_image = encode_image(image, image_max_edge, image_max_bytes)
+            print(f"📦 Image payload: {encoded_image.width}x{encoded_image.height} {encoded_image.mime_type}, {encoded_image.payload_size / 1024:.0f} KiB")
         except Exception as e:
             print(f"❌ Error processing image: {e}")
             return None
@@ -112,11 +100,26 @@ def generate_3d_model(
         # Note: content-length header is auto-calculated by requests library
     }
 
+    if encoded_image is not None:
+        # Stream the base64 image into the JSON body instead of building it in memory.
+        body = StreamingJSONBody(payload, "image", encoded_image.data, encoded_image.mime_type)
+        request_kwargs = {"data": body}
+    else:
+        request_kwargs = {"json": payload}
+
     try:
-        response = session.post(url, headers=headers, json=payload)
+        response = session.post(url, headers=headers, **request_kwargs)
+        if response.status_code == 429:
+            raise RateLimitError(
+                f"Generation request rejected (429): {response.text}",
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+            )
         response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
         details = response.json()
         print(details)
+        if "creationsId" not in details:
+            print(f"❌ Error: Unexpected response format from generations endpoint: {details}")
+            return None
         return details["creationsId"]
     except requests.exceptions.RequestException as e:
         print(f"❌ Error during 3D model generation request: {e}")
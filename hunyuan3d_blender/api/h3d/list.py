@@ -4,7 +4,7 @@ import datetime
 
 from ..session import get_session
 
-def get_creations_list(limit: int = 20, offset: int = 0):
+def get_creations_list(limit: int = 20, offset: int = 0, timeout: float = 10.0):
     """Fetches a list of 3D creation tasks from the Hunyuan 3D API."""
 
     session = get_session()
@@ -28,7 +28,7 @@ def get_creations_list(limit: int = 20, offset: int = 0):
     }
 
     try:
-        response = session.post(url, headers=headers, json=payload)
+        response = session.post(url, headers=headers, json=payload, timeout=timeout)
         response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 
 
 global_session = None
@@ -23,4 +24,15 @@ def delete_session():
     del global_session
     global_session = None
 
-__all__ = ["new_session", "get_session", "delete_session"]
+def ensure_pool_size(size: int):
+    """Grows the keep-alive connection pool of the session adapters to hold at least `size` connections.
+
+    Needed when issuing concurrent requests, otherwise connections beyond the default
+    pool size (10) are opened and discarded for every request.
+    """
+    session = get_session()
+    for adapter in session.adapters.values():
+        if isinstance(adapter, HTTPAdapter) and adapter._pool_maxsize < size:
+            adapter.init_poolmanager(adapter._pool_connections, size, block=adapter._pool_block)
+
+__all__ = ["new_session", "get_session", "delete_session", "ensure_pool_size"]
@@ -0,0 +1,39 @@
+import json
+import base64
+
+
+# Multiple of 3 so every chunk encodes to base64 without padding.
+CHUNK_SIZE = 3 * 16 * 1024
+
+
+class StreamingJSONBody:
+    """Request body for a JSON object with one large base64 data URL field, produced in chunks.
+
+    The bytes sent are exactly `json.dumps({**payload, key: data_url})`, but the data URL is
+    never materialized: the JSON prefix, base64 chunks of `data` and the suffix are yielded
+    one after another, so peak memory stays O(chunk_size) on top of the encoded bytes.
+    Passed as `data=` to requests, which sends it with a Content-Length taken from `len()`.
+    """
+
+    def __init__(self, payload: dict, key: str, data: bytes | memoryview, mime_type: str, chunk_size: int = CHUNK_SIZE):
+        head = json.dumps(payload)[:-1]
+        if payload:
+            head += ", "
+        head += f'{json.dumps(key)}: "data:{mime_type};base64,'
+        self._prefix = head.encode('utf-8')
+        self._suffix = b'"}'
+        self._data = memoryview(data).cast('B')
+        self._chunk_size = max(3, chunk_size - chunk_size % 3)
+        self._length = len(self._prefix) + 4 * ((len(self._data) + 2) // 3) + len(self._suffix)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        yield self._prefix
+        for offset in range(0, len(self._data), self._chunk_size):
+            yield base64.b64encode(self._data[offset:offset + self._chunk_size])
+        yield self._suffix
+
+
+__all__ = ["StreamingJSONBody"]
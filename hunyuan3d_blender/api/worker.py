@@ -0,0 +1,182 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import SimpleQueue
+from typing import Any, Iterator
+
+from .h3d import generate_3d_model, get_creation_details, get_creations_list, get_quota_info, RateLimitError
+from .session import ensure_pool_size
+
+
+# Task kinds (main thread -> worker).
+SUBMIT = 'SUBMIT'
+POLL = 'POLL'
+QUOTA = 'QUOTA'
+
+# Result kinds (worker -> main thread).
+SUBMITTED = 'SUBMITTED'
+RATE_LIMITED = 'RATE_LIMITED'
+DETAILS = 'DETAILS'
+QUOTA_INFO = 'QUOTA_INFO'
+
+
+# Upper bound of concurrent requests (and of keep-alive connections kept for them).
+MAX_CONCURRENT_REQUESTS = 64
+POLL_TIMEOUT = 10.0
+# Batched refresh: newest creations are listed (up to LIST_MAX_PAGES pages) and running
+# generations are reconciled from them; only IDs not found fall back to a detail request.
+BATCH_POLL_MIN = 2
+LIST_PAGE_SIZE = 50
+LIST_MAX_PAGES = 2
+
+
+task_queue = SimpleQueue()
+# Only the worker appends and only the main thread pops; deque appends/pops are atomic.
+result_queue = deque()
+thread = None
+executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="h3d_network")
+    return executor
+
+
+def fetch_generation_details(creation_ids: list[str]) -> Iterator[tuple[str, dict | None]]:
+    """Fetches the details of many generations concurrently, yielding them as they arrive.
+
+    Requests fan out over a pool of at most MAX_CONCURRENT_REQUESTS threads sharing one
+    keep-alive connection pool, so the wall time is ~1 RTT for up to that many generations.
+    """
+    if len(creation_ids) == 1:
+        yield creation_ids[0], get_creation_details(creation_ids[0], timeout=POLL_TIMEOUT)
+        return
+
+    ensure_pool_size(min(len(creation_ids), MAX_CONCURRENT_REQUESTS))
+    futures = {
+        _get_executor().submit(get_creation_details, creation_id, POLL_TIMEOUT): creation_id
+        for creation_id in creation_ids
+    }
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def _get_list_items(response: Any) -> list[dict]:
+    if isinstance(response, list):
+        return response
+    if isinstance(response, dict):
+        for key in ("creations", "list", "data"):
+            if isinstance(response.get(key), list):
+                return response[key]
+    return []
+
+
+def fetch_generation_statuses(creation_ids: list[str]) -> Iterator[tuple[str, dict | None]]:
+    """Refreshes many generations with as few requests as possible.
+
+    One `creations/list` page usually contains every running generation since they are
+    the newest ones; per-ID `detail` requests are only issued for those not found.
+    """
+    if len(creation_ids) < BATCH_POLL_MIN:
+        yield from fetch_generation_details(creation_ids)
+        return
+
+    missing = set(creation_ids)
+    for page in range(LIST_MAX_PAGES):
+        response = get_creations_list(limit=LIST_PAGE_SIZE, offset=page * LIST_PAGE_SIZE, timeout=POLL_TIMEOUT)
+        items = _get_list_items(response)
+        for item in items:
+            creation_id = item.get("id", "")
+            if creation_id in missing:
+                missing.discard(creation_id)
+                yield creation_id, item
+        if not missing or len(items) < LIST_PAGE_SIZE:
+            break
+
+    if missing:
+        yield from fetch_generation_details([creation_id for creation_id in creation_ids if creation_id in missing])
+
+
+def _submit_generation(job_id: str, data: dict) -> None:
+    creation_id = None
+    try:
+        creation_id = generate_3d_model(**data)
+    except RateLimitError as e:
+        print(f"❌ {e}")
+        result_queue.append((RATE_LIMITED, job_id, e.retry_after))
+        return
+    except Exception as e:
+        print(f"❌ Network worker error on submission '{job_id}': {e}")
+    # Always answer, so the job doesn't stay in flight forever.
+    result_queue.append((SUBMITTED, job_id, creation_id))
+
+
+def _process_task(kind: str, key: str, args: Any) -> None:
+    if kind == SUBMIT:
+        # Uploads can be slow; run them alongside polls instead of blocking the worker.
+        _get_executor().submit(_submit_generation, key, args)
+    elif kind == QUOTA:
+        quota_info = get_quota_info()
+        result_queue.append((QUOTA_INFO, key, quota_info.remainQuota if quota_info else None))
+    elif kind == POLL:
+        for creation_id, details in fetch_generation_statuses(args):
+            result_queue.append((DETAILS, creation_id, details))
+
+
+def _thread_network_worker():
+    while True:
+        kind, key, args = task_queue.get()
+        if kind is None:
+            break
+        try:
+            _process_task(kind, key, args)
+        except Exception as e:
+            print(f"❌ Network worker error on {kind} '{key}': {e}")
+
+
+def _ensure_thread():
+    global thread
+    if thread is None or not thread.is_alive():
+        thread = threading.Thread(target=_thread_network_worker, name="h3d_network_worker", daemon=True)
+        thread.start()
+
+
+def request_submission(job_id: str, data: dict) -> None:
+    """Queues a generation request. Its creation ID (or None) comes back as a SUBMITTED result.
+
+    `data` are the keyword arguments of `generate_3d_model` and must not reference Blender data.
+    """
+    _ensure_thread()
+    task_queue.put((SUBMIT, job_id, data))
+
+
+def request_quota() -> None:
+    """Queues a quota refresh. The remaining quota (or None) comes back as a QUOTA_INFO result."""
+    _ensure_thread()
+    task_queue.put((QUOTA, "", None))
+
+
+def request_poll(creation_ids: list[str]) -> None:
+    """Queues a status refresh. Each generation comes back as a DETAILS result (response dict or None)."""
+    if not creation_ids:
+        return
+    _ensure_thread()
+    task_queue.put((POLL, "", list(creation_ids)))
+
+
+def drain_results() -> Iterator[tuple[str, str, Any]]:
+    """Yields all results produced by the worker so far. Call from the main thread."""
+    while len(result_queue) > 0:
+        yield result_queue.popleft()
+
+
+def unregister():
+    global thread, executor
+    if thread is not None and thread.is_alive():
+        task_queue.put((None, "", None))
+    thread = None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
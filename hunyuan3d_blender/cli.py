@@ -0,0 +1,221 @@
+"""Headless batch generation, for `blender --background` on render-farm nodes.
+
+Usage (the module path depends on where the extension is installed):
+
+    blender -b --python-expr "from bl_ext.user_default.hunyuan3d_bridge import cli; cli.main()" -- \\
+        --input prompts.jsonl --output-dir ./generations
+
+The input is a JSONL or CSV file with one generation per row. Columns/keys are the
+arguments of `generate_3d_model` (`prompt`, `style`, `count`, `enable_pbr`, `face_count`...),
+plus `image`: a path to an input image, relative to the input file.
+Credentials are taken from --token/--user-id, or from the addon config file.
+"""
+import sys
+import csv
+import json
+import time
+import uuid
+import argparse
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import worker
+from .api.session import new_session
+from .utils.admission import AdmissionController
+from .utils.poll_scheduler import PollScheduler
+from .utils.image_encode import PILImage, downscale_pixels, DEFAULT_MAX_EDGE, DEFAULT_MAX_BYTES
+from .ops.result_management import download_model
+from .prefs import config_file
+
+
+TICK_INTERVAL = 0.25
+MAX_DOWNLOADS = 4
+
+INT_ARGUMENTS = {"count", "octree_resolution", "inference_steps", "face_count", "image_max_edge", "image_max_bytes"}
+FLOAT_ARGUMENTS = {"guidance_scale"}
+BOOL_ARGUMENTS = {"enable_pbr", "enable_low_poly", "remove_background"}
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="hunyuan3d_blender.cli", description="Batch Hunyuan 3D generation")
+    parser.add_argument("--input", required=True, type=Path, help="JSONL or CSV file with one generation per row")
+    parser.add_argument("--output-dir", required=True, type=Path, help="Directory where GLB files are downloaded")
+    parser.add_argument("--token", default="", help="Hunyuan 3D 'hy_token' cookie")
+    parser.add_argument("--user-id", default="", help="Hunyuan 3D 'hy_user' cookie")
+    parser.add_argument("--concurrency", type=int, default=3, help="Initial number of concurrent generations")
+    parser.add_argument("--image-max-edge", type=int, default=DEFAULT_MAX_EDGE)
+    parser.add_argument("--image-max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    return parser.parse_args(argv)
+
+
+def _parse_value(key: str, value):
+    if not isinstance(value, str):
+        return value
+    if key in INT_ARGUMENTS:
+        return int(value)
+    if key in FLOAT_ARGUMENTS:
+        return float(value)
+    if key in BOOL_ARGUMENTS:
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return value
+
+
+def read_jobs(filepath: Path) -> list[dict]:
+    if filepath.suffix.lower() == ".csv":
+        with filepath.open('r', encoding='utf-8', newline='') as f:
+            rows = [row for row in csv.DictReader(f)]
+    else:
+        with filepath.open('r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    return [{key: _parse_value(key, value) for key, value in row.items() if value not in ("", None)} for row in rows]
+
+
+def load_image_pixels(filepath: Path, max_edge: int) -> np.ndarray:
+    if PILImage is None:
+        raise RuntimeError("Pillow (PIL) is required for image-to-3D generation")
+    with PILImage.open(filepath) as pil_image:
+        pixels = np.asarray(pil_image.convert('RGBA'))
+    return downscale_pixels(pixels, max_edge)
+
+
+def build_generation_data(row: dict, base_dirpath: Path, args: argparse.Namespace) -> dict:
+    data = dict(row)
+    data.setdefault("prompt", "high quality 3D model" if "image" in data else "")
+    data.setdefault("title", data["prompt"])
+    data.setdefault("image_max_edge", args.image_max_edge)
+    data.setdefault("image_max_bytes", args.image_max_bytes)
+    if image_path := data.pop("image", None):
+        data["image"] = load_image_pixels(base_dirpath / image_path, data["image_max_edge"])
+    return data
+
+
+def login(args: argparse.Namespace) -> bool:
+    token, user_id = args.token, args.user_id
+    if (not token or not user_id) and config_file.exists():
+        raw_data = config_file.read_text()
+        config_data = json.loads(raw_data) if raw_data.strip() else {}
+        token = token or config_data.get('h3d_cookie_token', '')
+        user_id = user_id or config_data.get('h3d_cookie_user_id', '')
+    if not token or not user_id:
+        print("❌ Error: No credentials, pass --token and --user-id or set them in the addon preferences.")
+        return False
+    new_session().cookies.update({"hy_token": token, "hy_user": user_id, "hy_source": 'web'})
+    return True
+
+
+def _download_results(creation_id: str, response: dict, output_dir: Path) -> list[tuple[str, bool]]:
+    downloads = []
+    for result in response.get("result", []):
+        glb_url = result.get("urlResult", {}).get("glb", "")
+        if result.get("status") != "success" or not glb_url:
+            continue
+        filepath = output_dir / creation_id / f"{result.get('assetId') or result.get('taskId')}.glb"
+        success, _filepath = download_model(glb_url, str(filepath))
+        downloads.append((str(filepath), success))
+    return downloads
+
+
+def run(args: argparse.Namespace) -> dict:
+    rows = read_jobs(args.input)
+    base_dirpath = args.input.parent
+    queue = [(uuid.uuid4().hex, row) for row in rows]
+    queue.reverse()  # pop() from the end keeps input order.
+
+    admission = AdmissionController(initial_limit=max(1, args.concurrency))
+    scheduler = PollScheduler()
+    pending_polls: set[str] = set()
+    # job_id -> input row, kept to re-queue it when rate limited.
+    submitting: dict[str, dict] = {}
+    downloads = []
+    summary = {"jobs": len(rows), "submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "downloaded": 0, "download_errors": 0}
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOADS, thread_name_prefix="h3d_cli_download") as download_pool:
+        while queue or admission.in_flight > 0:
+            for kind, key, result in worker.drain_results():
+                if kind == worker.SUBMITTED:
+                    row = submitting.pop(key, None)
+                    if result is None:
+                        admission.on_rejected(key)
+                        summary["rejected"] += 1
+                        print(f"❌ Rejected: {row.get('prompt', '') if row else key}")
+                    else:
+                        admission.on_accepted(key, result)
+                        scheduler.add(result)
+                        summary["submitted"] += 1
+                        print(f"✅ Submitted {result}")
+                elif kind == worker.RATE_LIMITED:
+                    admission.on_rate_limited(key, result)
+                    queue.append((key, submitting.pop(key)))
+                elif kind == worker.QUOTA_INFO:
+                    admission.on_quota(result)
+                elif kind == worker.DETAILS:
+                    pending_polls.discard(key)
+                    if result is None:
+                        scheduler.postpone(key)
+                        continue
+                    status = result.get("status")
+                    if status in {"success", "fail"}:
+                        scheduler.remove(key)
+                        admission.on_finished(key)
+                        summary["succeeded" if status == "success" else "failed"] += 1
+                        print(f"{'✅' if status == 'success' else '❌'} Generation {key}: {status}")
+                        if status == "success":
+                            downloads.append(download_pool.submit(_download_results, key, result, args.output_dir))
+                    else:
+                        scheduler.update(key, result)
+
+            if queue and admission.needs_quota_refresh():
+                admission.on_quota_requested()
+                worker.request_quota()
+
+            if queue and admission.remaining_quota is not None and admission.remaining_quota <= 0 and admission.in_flight == 0:
+                print("❌ Quota exhausted, stopping with jobs left in the queue.")
+                break
+
+            while queue and admission.can_admit():
+                job_id, row = queue.pop()
+                try:
+                    data = build_generation_data(row, base_dirpath, args)
+                except Exception as e:
+                    print(f"❌ Error preparing job {row}: {e}")
+                    summary["rejected"] += 1
+                    continue
+                submitting[job_id] = row
+                admission.on_submit(job_id)
+                worker.request_submission(job_id, data)
+
+            due = [creation_id for creation_id in scheduler.get_due() if creation_id not in pending_polls]
+            pending_polls.update(due)
+            worker.request_poll(due)
+
+            time.sleep(TICK_INTERVAL)
+
+        for future in downloads:
+            for _filepath, success in future.result():
+                summary["downloaded" if success else "download_errors"] += 1
+
+    summary["not_submitted"] = len(queue)
+    summary["elapsed_seconds"] = round(time.monotonic() - start, 1)
+    return summary
+
+
+def main(argv: list[str] | None = None) -> None:
+    if argv is None:
+        # Blender passes script arguments after "--".
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+    if not login(args):
+        sys.exit(2)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    summary = run(args)
+    worker.unregister()
+
+    (args.output_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+    print("\nSummary:")
+    for key, value in summary.items():
+        print(f"  {key}: {value}")
+    failed = summary["rejected"] + summary["failed"] + summary["download_errors"] + summary["not_submitted"]
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,34 @@
+from bpy.types import Object, PropertyGroup, Mesh
+from bpy.props import PointerProperty, CollectionProperty, FloatProperty, IntProperty
+
+
+class H3D_PG_lod_level(PropertyGroup):
+    mesh: PointerProperty(type=Mesh, name="Mesh")
+    ratio: FloatProperty(name="Ratio", default=1.0, min=0.0, max=1.0, subtype='FACTOR')
+
+
+class H3D_OBJ_Properties(PropertyGroup):
+    # Level 0 is the full resolution mesh.
+    levels: CollectionProperty(type=H3D_PG_lod_level)
+    active_level: IntProperty(name="Active Level", default=0, min=0)
+
+
+# --- Type Hints ---
+
+class LODLevel:
+    mesh: Mesh
+    ratio: float
+
+class OBJ_Properties:
+    levels: list[LODLevel]
+    active_level: int
+
+
+# --- Register and unregister ---
+
+def register():
+    Object.h3d_lod = PointerProperty(type=H3D_OBJ_Properties)
+
+def unregister():
+    if hasattr(Object, "h3d_lod"):
+        del Object.h3d_lod
@@ -4,12 +4,22 @@ from bpy.types import Scene, PropertyGroup, Image, ImageTexture
 from bpy.props import PointerProperty, StringProperty, IntProperty, FloatProperty, BoolProperty, EnumProperty, CollectionProperty
 from typing import List, Dict, Any
 
-from ..utils.image import request_image_load
+from ..utils.image import request_image_load, PRIORITY_VISIBLE
+from ..utils.page_previews import schedule_page_previews
+from ..utils.generation_index import invalidate_generation_index
+from ..utils.lod_switch import update_lod_mode
+
+
+def _set_if_changed(owner, attr: str, value) -> None:
+    """Assigns `value` only if it differs: any assignment runs the property's update callback."""
+    if getattr(owner, attr) != value:
+        setattr(owner, attr, value)
 
 
 class H3D_PG_generation_image(PropertyGroup):
     def update_url(self, context):
-        self.load_image()
+        # Loaded if it's on the page shown.
+        schedule_page_previews()
 
     @property
     def texture(self) -> ImageTexture | None:
@@ -28,7 +38,7 @@ class H3D_PG_generation_image(PropertyGroup):
                 # layout.prop(self, "image", text="")
                 layout.template_ID_preview(self, "image_ptr", hide_buttons=True)
 
-    def load_image(self):
+    def load_image(self, priority: int = PRIORITY_VISIBLE):
         def on_load_complete(image: Image):
             print(f"H3D UI: Image '{self.name}' load completed.")
             self.image = image
@@ -41,7 +51,7 @@ class H3D_PG_generation_image(PropertyGroup):
         if self.image_ptr is not None:
             return
 
-        if self.filepath and os.path.exist(self.filepath) and os.path.isfile(self.filepath):
+        if self.filepath and os.path.isfile(self.filepath):
             self.image = bpy.data.images.load(self.filepath, check_existing=True)
             return
 
@@ -52,16 +62,14 @@ class H3D_PG_generation_image(PropertyGroup):
             self.name,
             self.url,
             on_complete_callback=on_load_complete,
-            on_error_callback=on_load_error
+            on_error_callback=on_load_error,
+            priority=priority
         )
 
     @property
     def image(self) -> Image | None:
-        if self.image_ptr is not None:
-            return self.image_ptr
-        else:
-            self.load_image()
-        return None
+        # Read from draw code: loads are requested by `schedule_page_previews`, not here.
+        return self.image_ptr
     
     @image.setter
     def image(self, image: Image) -> None:
@@ -70,7 +78,7 @@ class H3D_PG_generation_image(PropertyGroup):
 
     name: StringProperty(name="Name", default="")
     image_ptr: PointerProperty(type=Image, name="Image")
-    url: StringProperty(name="URL", default="") # , update=update_url)
+    url: StringProperty(name="URL", default="", update=update_url)
     filepath: StringProperty(name="Filepath", subtype='FILE_PATH', default="")
 
 
@@ -88,10 +96,11 @@ class H3D_PG_intermediate_output(PropertyGroup):
 
     def load_from_response(self, asset_id: str, response: Dict[str, Any]) -> None:
         self.gif.name = f"{asset_id}_result_intermediate"
-        self.gif.url = response.get("gif_url", "")
+        # Rewritten on every poll: a new URL schedules the page previews, the same one doesn't.
+        _set_if_changed(self.gif, "url", response.get("gif_url", ""))
         self.glb_url = response.get("glb_url", "")
         self.image.name = f"{asset_id}_input_intermediate"
-        self.image.url = response.get("image_url", "")
+        _set_if_changed(self.image, "url", response.get("image_url", ""))
         self.created = response.get("created", 0)
 
 
@@ -114,11 +123,11 @@ class H3D_PG_generation_url_result(PropertyGroup):
             return
         self.glb = response.get("glb", "")
         self.gif.name = f"{asset_id}_result"
-        self.gif.url = response.get("gif", "")
+        _set_if_changed(self.gif, "url", response.get("gif", ""))
         self.obj = response.get("obj", "")
         self.mtl = response.get("mtl", "")
         self.image.name = f"{asset_id}_input"
-        self.image.url = response.get("image_url", "")
+        _set_if_changed(self.image, "url", response.get("image_url", ""))
         self.geometryGif = response.get("geometryGif", "")
         self.geometryGlb = response.get("geometryGlb", "")
         self.textureGif = response.get("textureGif", "")
@@ -146,7 +155,7 @@ class H3D_PG_generation_result(PropertyGroup):
     intermediate_output: PointerProperty(type=H3D_PG_intermediate_output, name="Intermediate Result")
 
     # User data.
-    fav: BoolProperty(name="Fav", default=False)
+    fav: BoolProperty(name="Fav", default=False, update=invalidate_generation_index)
     saved: BoolProperty(name="Saved", default=False)
 
     def load_from_response(self, response: Dict[str, Any]) -> None:
@@ -181,7 +190,7 @@ class H3D_PG_generation_details(PropertyGroup):
     title: StringProperty(name="Title", default="")
     style: StringProperty(name="Style", default="")
     count: IntProperty(name="Count", default=4)
-    status: EnumProperty(name="Status", default="wait", items=[
+    status: EnumProperty(name="Status", default="wait", update=invalidate_generation_index, items=[
         ("wait", "Wait", "Wait", 'STRIP_COLOR_03', 0),
         ("fail", "Failed", "Failed", 'STRIP_COLOR_01', 1),
         ("processing", "Processing", "Processing", 'STRIP_COLOR_05', 2),
@@ -198,8 +207,8 @@ class H3D_PG_generation_details(PropertyGroup):
 
     result: CollectionProperty(type=H3D_PG_generation_result)
 
-    show_in_gen_ui: BoolProperty(name="Show in UI", default=False)
-    expand_in_gen_ui: BoolProperty(name="Expanded in UI", default=False)
+    show_in_gen_ui: BoolProperty(name="Show in UI", default=False, update=invalidate_generation_index)
+    expand_in_gen_ui: BoolProperty(name="Expanded in UI", default=False, update=lambda self, context: schedule_page_previews())
 
     def get_result(self, task_id: str, create: bool = True) -> H3D_PG_generation_result:
         generation_result = self.result.get(task_id)
@@ -230,6 +239,7 @@ class H3D_PG_generation_details(PropertyGroup):
             if id < 0 or id >= len(self.result):
                 return
             self.result.remove(id)
+            invalidate_generation_index()
 
     def load_from_response(self, response: Dict[str, Any]) -> None:
         def _load_result_data() -> None:
@@ -249,7 +259,8 @@ class H3D_PG_generation_details(PropertyGroup):
                 gen_detail.load_from_response(result_data)
 
         if len(self.result) > 0 and self.creation_id == response.get("id", ""):
-            self.status = response.get("status", self.status)
+            # Polled often: the index is only invalidated when the status actually changes.
+            _set_if_changed(self, "status", response.get("status", self.status))
             _load_result_data()
             self.updated_at = response.get("updatedAt", self.updated_at)
             self.wait_time = response.get("waitTime", self.wait_time)
@@ -263,7 +274,7 @@ class H3D_PG_generation_details(PropertyGroup):
         self.title = response.get("title", "")
         self.style = response.get("style", "")
         self.count = response.get("n", 4)
-        self.status = response.get("status", "wait")
+        _set_if_changed(self, "status", response.get("status", "wait"))
         self.wait_time = response.get("waitTime", 0)
         self.trace_id = response.get("traceId", "")
         self.created_at = response.get("createdAt", 0)
@@ -277,12 +288,20 @@ class H3D_PG_generation_details(PropertyGroup):
 
 class H3D_SCN_Properties(PropertyGroup):
     generation_details: CollectionProperty(type=H3D_PG_generation_details)
+
+    lod_mode: EnumProperty(name="Level of Detail", default='FULL', update=update_lod_mode, items=[
+        ('FULL', "Full", "Show imported results at full resolution", 'MESH_UVSPHERE', 0),
+        ('PROXY', "Proxy", "Show the lowest level of detail in the viewport", 'MESH_ICOSPHERE', 1),
+        ('DISTANCE', "Distance", "Pick the level of detail by distance to the viewport", 'DRIVER_DISTANCE', 2),
+    ])
+    lod_distance: FloatProperty(name="LOD Distance", description="Distance from the viewport at which each next level of detail is used", default=10.0, min=0.1, subtype='DISTANCE', update=update_lod_mode)
     
     def new_generation(self, creation_id: str) -> H3D_PG_generation_details:
         new_generation = self.generation_details.add()
         new_generation.creation_id = creation_id
-        new_generation.show_in_gen_ui = True  # new generation should be shown in the generations UI.
+        _set_if_changed(new_generation, "show_in_gen_ui", True)  # new generation should be shown in the generations UI.
         new_generation.expand_in_gen_ui = True  # new generation should be expanded in the generations UI.
+        invalidate_generation_index()
         return new_generation
 
     def get_generation(self, creation_id: str) -> H3D_PG_generation_details:
@@ -295,6 +314,7 @@ class H3D_SCN_Properties(PropertyGroup):
             if generation_id >= len(self.generation_details):
                 return
             self.generation_details.remove(generation_id)
+            invalidate_generation_index()
         elif isinstance(generation_id, str):
             for index, gen in enumerate(self.generation_details):
                 if gen.name == generation_id:
@@ -385,6 +405,8 @@ class GenerationDetails:
 
 class SCN_Properties:
     generation_details: List[GenerationDetails] | Dict[str, GenerationDetails]
+    lod_mode: str
+    lod_distance: float
     
     def new_generation(self, creation_id: str) -> GenerationDetails: pass
     def get_generation(self, creation_id: str) -> GenerationDetails: pass
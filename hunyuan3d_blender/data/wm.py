@@ -1,6 +1,11 @@
 from bpy.types import WindowManager, PropertyGroup, Image
 from bpy.props import StringProperty, BoolProperty, PointerProperty, EnumProperty, IntProperty, FloatProperty
 
+from ..utils.image import cancel_image_loads
+from ..utils.preview_animation import stop_preview_animation
+from ..utils.page_previews import schedule_page_previews
+from ..utils.generation_index import get_page_count
+
 
 class H3D_WM_Properties(PropertyGroup):
     h3d_login_type: EnumProperty(name="Login Type", default="GUEST", items=[
@@ -55,6 +60,11 @@ class H3D_WM_Properties(PropertyGroup):
         min=10000,
         max=100000
     )
+    h3d_generation_low_poly: BoolProperty(
+        name="Low Poly",
+        description="Generate low poly models, lighter to import and to place many times",
+        default=False
+    )
     h3d_show_advanced: BoolProperty(
         name="Show Advanced Settings",
         description="Show advanced generation settings",
@@ -75,25 +85,47 @@ class H3D_WM_Properties(PropertyGroup):
         ('RENDER', "Render", "Display rendered shading", 'SHADING_RENDERED', 1),
     ))
 
-    ui_filter_generation_status: EnumProperty(name="UI Filter Generation Status", default="ALL", items=[
+    def update_ui_animate_previews(self, context):
+        if not self.ui_animate_previews:
+            stop_preview_animation()
+
+    ui_animate_previews: BoolProperty(
+        name="Animated Previews",
+        description="Play the turntable animation of a result preview (one at a time) with its play button",
+        default=False,
+        update=update_ui_animate_previews
+    )
+
+    def update_ui_filter_generation(self, context):
+        # The pages are not the same anymore: back to the first one.
+        cancel_image_loads()
+        schedule_page_previews()
+        if self.ui_filter_generation_page_index != 0:
+            self.ui_filter_generation_page_index = 0
+
+    ui_filter_generation_status: EnumProperty(name="UI Filter Generation Status", default="ALL", update=update_ui_filter_generation, items=[
         ("ALL", "All", "All", 'STRIP_COLOR_09', 0),
         ("wait", "Wait", "Wait", 'STRIP_COLOR_03', 1),
         ("fail", "Failed", "Failed", 'STRIP_COLOR_01', 2),
         ("processing", "Processing", "Processing", 'STRIP_COLOR_05', 3),
         ("success", "Success", "Success", 'STRIP_COLOR_04', 4),
+        ("FAV", "Favorites", "Generations with a favorite result", 'SOLO_ON', 5),
     ])
-    ui_filter_generation_page_order_invert: BoolProperty(name="Page Order Invert", default=False)
+    ui_filter_generation_page_order_invert: BoolProperty(name="Page Order Invert", default=False, update=update_ui_filter_generation)
 
     def update_ui_filter_generation_page_index(self, context):
+        # Previews of the page left are not needed anymore.
+        cancel_image_loads()
+        schedule_page_previews()
         if self.ui_filter_generation_page_index == 0:
             return
-        scn_h3d = context.scene.h3d
-        generation_count = len(scn_h3d.generation_details) - 1
-        max_pages = generation_count // self.ui_filter_generation_page_size
-        if self.ui_filter_generation_page_index > max_pages:
-            self.ui_filter_generation_page_index = max_pages
+        last_page_index = get_page_count(context.scene.h3d, self) - 1
+        if self.ui_filter_generation_page_index > last_page_index:
+            self.ui_filter_generation_page_index = last_page_index
         
     def update_ui_filter_generation_page_size(self, context):
+        cancel_image_loads()
+        schedule_page_previews()
         if self.ui_filter_generation_page_index != 0:
             self.ui_filter_generation_page_index = 0
 
@@ -117,10 +149,12 @@ class WM_Properties:
     h3d_generation_inference_steps: int
     h3d_generation_guidance_scale: float
     h3d_generation_face_count: int
+    h3d_generation_low_poly: bool
     h3d_show_advanced: bool
     
     ui_image_preview_scale: str
     ui_image_preview_shading_type: str
+    ui_animate_previews: bool
     ui_filter_generation_status: str
     ui_filter_generation_page_order_invert: bool
     ui_filter_generation_page_index: int
@@ -9,129 +9,274 @@ import time
 import re
 from typing import Optional
 import pathlib
+from dataclasses import dataclass, field
 from urllib.parse import urlparse
 from collections import deque
-from threading import Thread
-from shutil import move
+from threading import Event
 
 from ..data import H3D_Data
 from ..data.scn import GenerationDetails
 from ..prefs import get_prefs
 from ..utils import TimerManager
+from ..utils.ui import ui_tag_redraw
+from ..utils.job_journal import get_job_journal
+from ..utils.download_pool import DownloadPool, PRIORITY_HIGH, PRIORITY_LOW
+from ..utils.asset_cache import get_asset_cache
+from ..utils.glb_import import request_glb_import
+from ..utils.glb import inspect_glb, GLBError
+from ..utils.asset_registry import register_imported_asset, find_imported_asset, instance_imported_asset
 
 
-download_request_queue = deque()
-thread = None
-import_request_queue = deque()
-
+MAX_DOWNLOADS = 6
+MAX_DOWNLOADS_PER_HOST = 3
 
-saved_in_tempfiles: dict[str, str] = {}
+import_request_queue = deque()
 
 
-def _thread_download_request():
-    global download_request_queue
-    while len(download_request_queue) > 0:
-        asset_id, url, filepath, do_import = download_request_queue.popleft()
-        success, filepath = download_model(url, filepath)
-        if success and do_import:
-            import_request_queue.append((asset_id, filepath))
-        time.sleep(0.5)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# progress_key (asset_id) -> progress of the running download. Written by download threads.
+download_progress: dict[str, "DownloadProgress"] = {}
 
 
 def _timer_import_request():
-    global thread, import_request_queue
-    if thread is None or not thread.is_alive():
-        return None
-    
+    global import_request_queue
     while len(import_request_queue) > 0:
         asset_id, filepath = import_request_queue.popleft()
         import_model(asset_id, filepath)
-    
+
+    # Keep download progress shown in the result rows up to date.
+    ui_tag_redraw("VIEW_3D", "UI")
+
+    if not download_pool.is_busy() and len(import_request_queue) == 0:
+        return None
     return 0.5
 
 
 def import_model(name: str, filepath: str) -> bool:
+    """Starts a background import of the GLB; the object named `name` appears once built."""
     if os.path.exists(filepath):
         print(f"Attempting to import GLB: {filepath}")
-        bpy.ops.import_scene.gltf(filepath=filepath)
-        bpy.context.active_object.name = name
+
+        def on_complete(root):
+            # Later imports of the same asset become instances of this one.
+            if root is not None:
+                register_imported_asset(name, root)
+
+        request_glb_import(name, filepath, on_complete, lod_ratios=get_prefs().lod_ratio_values)
         return True
     else:
         print(f"ERROR: GLB file not found at {filepath}")
         return False
 
 
-def download_model(url: str, download_path: Optional[str] = None) -> tuple[bool, str | None]:
+@dataclass
+class DownloadProgress:
+    downloaded: int = 0
+    total: int | None = None
+    started_at: float = field(default_factory=time.monotonic)
+    # Bytes already on disk when this attempt started (resumed downloads).
+    resumed_from: int = 0
+
+    @property
+    def bytes_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        if elapsed <= 0.0:
+            return 0.0
+        return (self.downloaded - self.resumed_from) / elapsed
+
+    @property
+    def eta(self) -> float | None:
+        speed = self.bytes_per_second
+        if self.total is None or speed <= 0.0:
+            return None
+        return (self.total - self.downloaded) / speed
+
+    def format(self) -> str:
+        text = f"{self.downloaded / 1e6:.1f}"
+        if self.total:
+            text = f"{self.downloaded / self.total * 100:.0f}% of {self.total / 1e6:.1f}"
+        text += f" MB · {self.bytes_per_second / 1e6:.1f} MB/s"
+        if (eta := self.eta) is not None:
+            text += f" · ETA {eta:.0f}s"
+        return text
+
+
+def get_download_progress(key: str) -> DownloadProgress | None:
+    return download_progress.get(key)
+
+
+def _get_filename(url: str, content_disposition: str | None) -> str:
+    filename = "downloaded_model.glb"
+    if content_disposition:
+        matches = re.findall(r'filename="?([^;"]+)"?', content_disposition)
+        if matches:
+            filename = matches[0]
+    else:
+        parsed_url_obj = urlparse(url)
+        if parsed_url_obj.path:
+            path_part = parsed_url_obj.path
+            if path_part.endswith('.glb'):
+                filename = os.path.basename(path_part)
+
+    if not filename.lower().endswith('.glb'):
+        filename += ".glb"
+    return filename
+
+
+def _get_total_size(response: requests.Response, offset: int) -> int | None:
+    content_range = response.headers.get('content-range')
+    if content_range and '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        if total.isdigit():
+            return int(total)
+    content_length = response.headers.get('content-length')
+    if content_length and content_length.isdigit():
+        return offset + int(content_length)
+    return None
+
+
+def download_model(url: str, download_path: Optional[str] = None, progress_key: Optional[str] = None,
+                   cancel_event: Optional[Event] = None) -> tuple[bool, str | None]:
+    """Downloads a model in chunks to a `.part` file, renamed into place once complete.
+
+    Memory use doesn't depend on the asset size. Retries resume from the bytes already
+    on disk using HTTP Range requests. Progress is published under `progress_key`
+    (see `get_download_progress`) while the download runs. Setting `cancel_event` stops
+    the download between chunks, keeping the `.part` file to resume later.
+    """
     print(f"Attempting to download GLB from: {url}")
-    
-    global saved_in_tempfiles
-    if url in saved_in_tempfiles:
-        tempfilepath = saved_in_tempfiles[url]
-        if os.path.exists(tempfilepath) and os.path.isfile(tempfilepath):
-            if not download_path:
-                # use cached, no need to re-download it lol.
+
+    progress = DownloadProgress()
+    if progress_key:
+        download_progress[progress_key] = progress
+
+    try:
+        attemps = 3
+        while attemps > 0:
+            part_path = f"{download_path}.part" if download_path else None
+            offset = os.path.getsize(part_path) if part_path and os.path.isfile(part_path) else 0
+            # Identity encoding so byte ranges refer to the file itself.
+            headers = {'Accept-Encoding': 'identity'}
+            if offset > 0:
+                headers['Range'] = f"bytes={offset}-"
+            try:
+                with requests.get(url, headers=headers, stream=True, allow_redirects=True, timeout=30) as response:
+                    if response.status_code == 416:
+                        # Stale or already complete partial file: start over.
+                        os.remove(part_path)
+                        continue
+                    response.raise_for_status()
+                    if offset > 0 and response.status_code != 206:
+                        print("Server ignored the range request, restarting download")
+                        offset = 0
+
+                    if not download_path:
+                        default_save_dir = bpy.app.tempdir if bpy.app.tempdir else os.getcwd()
+                        download_path = os.path.join(default_save_dir, _get_filename(url, response.headers.get('content-disposition')))
+                        part_path = f"{download_path}.part"
+                    os.makedirs(os.path.dirname(download_path), exist_ok=True)
+
+                    progress.total = _get_total_size(response, offset)
+                    progress.downloaded = progress.resumed_from = offset
+                    progress.started_at = time.monotonic()
+
+                    print(f"Downloading to: {download_path}" + (f" (resuming at {offset} bytes)" if offset else ""))
+                    with open(part_path, 'ab' if offset > 0 else 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            if cancel_event is not None and cancel_event.is_set():
+                                print(f"Download cancelled: {url}")
+                                return False, download_path
+                            f.write(chunk)
+                            progress.downloaded += len(chunk)
+
+                if progress.total is not None and os.path.getsize(part_path) < progress.total:
+                    raise requests.exceptions.ConnectionError(f"Incomplete download ({os.path.getsize(part_path)}/{progress.total} bytes)")
+
+                os.replace(part_path, download_path)
+                print(f"GLB downloaded successfully to {download_path}")
                 return True, download_path
-            move(tempfilepath, download_path)
-            # from tempfiles to actual user save directory path.
-            return True, download_path
-
-    attemps = 3
-    while attemps > 0:
-        try:
-            response = requests.get(url, allow_redirects=True, timeout=30)
-            response.raise_for_status()
-
-            content_disposition = response.headers.get('content-disposition')
-            filename = "downloaded_model.glb"
-            if content_disposition:
-                matches = re.findall(r'filename="?([^;"]+)"?', content_disposition)
-                if matches:
-                    filename = matches[0]
-            else:
-                parsed_url_obj = urlparse(url)
-                if parsed_url_obj.path:
-                    path_part = parsed_url_obj.path
-                    if path_part.endswith('.glb'):
-                        filename = os.path.basename(path_part)
-            
-            if not filename.lower().endswith('.glb'):
-                filename += ".glb"
-
-            if not download_path:
-                default_save_dir = bpy.app.tempdir if bpy.app.tempdir else os.getcwd()
-                download_path = os.path.join(default_save_dir, filename)
-            
-            os.makedirs(os.path.dirname(download_path), exist_ok=True)
-
-            print(f"Downloading to: {download_path}")
-            with open(download_path, 'wb') as f:
-                f.write(response.content)
-
-            print(f"GLB downloaded successfully to {download_path}")
-            return True, download_path
-        except requests.exceptions.RequestException as e:
-            print(f"Error downloading GLB: {e}")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-        attemps -= 1
+            except requests.exceptions.RequestException as e:
+                print(f"Error downloading GLB: {e}")
+            except Exception as e:
+                print(f"An unexpected error occurred: {e}")
+            attemps -= 1
+    finally:
+        if progress_key:
+            download_progress.pop(progress_key, None)
 
     return False, download_path
 
 
+def _get_url_kind(url: str) -> str:
+    suffix = pathlib.PurePosixPath(urlparse(url).path).suffix.lower().lstrip('.')
+    return suffix or "glb"
+
+
+def fetch_asset(asset_id: str, url: str, filepath: Optional[str] = None, progress_key: Optional[str] = None,
+                cancel_event: Optional[Event] = None) -> tuple[bool, str | None]:
+    """Gets a result file through the asset cache, downloading it only on a cache miss.
+
+    The file is copied to `filepath`; without one, the cached path is returned.
+    """
+    asset_cache = get_asset_cache()
+    kind = _get_url_kind(url)
+    cached_filepath = asset_cache.lookup(asset_id, kind)
+    if cached_filepath is None:
+        success, download_path = download_model(url, str(asset_cache.get_download_path(asset_id, kind)), progress_key, cancel_event)
+        if not success:
+            return False, filepath
+        info = None
+        if kind == "glb":
+            try:
+                info = inspect_glb(download_path).to_dict()
+            except (GLBError, OSError, KeyError, ValueError) as e:
+                print(f"⚠️  Warning: Could not inspect GLB {download_path}: {e}")
+        cached_filepath = asset_cache.store(asset_id, kind, download_path, url, info=info)
+    if filepath is None:
+        return True, str(cached_filepath)
+    asset_cache.materialize(cached_filepath, filepath)
+    return True, filepath
+
+
+def _download_pool_func(url: str, filepath: str | None, key: str, cancel_event: Event) -> tuple[bool, str | None]:
+    # Download pool keys are asset IDs.
+    return fetch_asset(key, url, filepath, progress_key=key, cancel_event=cancel_event)
+
+
+download_pool = DownloadPool(_download_pool_func, max_workers=MAX_DOWNLOADS, max_per_host=MAX_DOWNLOADS_PER_HOST)
+
 
 def request_download_model(asset_id: str, url: str, filepath: str | None = None, do_import: bool = False) -> None:
-    global thread, download_request_queue
+    """Queues a download on the download pool. Imports run ahead of plain saves.
 
-    download_request_queue.append((asset_id, url, filepath, do_import))
+    Files already in the asset cache aren't downloaded, but still copied by a pool worker:
+    the copy can be large, or to another volume.
+    """
+    def on_complete(success: bool, filepath: str | None):
+        if success and do_import:
+            import_request_queue.append((asset_id, filepath))
+
+    download_pool.request(
+        asset_id,
+        url,
+        filepath,
+        priority=PRIORITY_HIGH if do_import else PRIORITY_LOW,
+        on_complete=on_complete
+    )
 
-    if thread is None or not thread.is_alive():
-        thread = Thread(target=_thread_download_request)
-        thread.start()
-        
     if not TimerManager.exists('import_model_request_timer'):
         TimerManager.add('import_model_request_timer', _timer_import_request)
 
 
+def is_download_pending(asset_id: str) -> bool:
+    return download_pool.is_pending(asset_id)
+
+
+def get_cached_model_info(asset_id: str) -> dict | None:
+    """Face count, bounds... of the result GLB if it's in the asset cache, without reading it."""
+    return get_asset_cache().get_info(asset_id, "glb")
+
+
 class H3D_OT_save_result(Operator):
     bl_label = "Save Result"
     bl_idname = "h3d.save_result"
@@ -161,34 +306,42 @@ class H3D_OT_save_result(Operator):
 
         glb_url = result.url_result.glb
         filepath = str(dirpath / f"{result.asset_id}.glb")
-        if not self.do_import:
-            success, _output = download_model(
-                glb_url,
-                filepath,
-            )
-            if not success:
-                return {'CANCELLED'}
-        else:
-            request_download_model(
-                result.asset_id,
-                glb_url,
-                filepath,
-                self.do_import
-            )
+        request_download_model(
+            result.asset_id,
+            glb_url,
+            filepath,
+            self.do_import
+        )
 
-        images = (
-            # result.url_result.image.image,  # same as `intermediate_output.image.image`
-            result.url_result.gif.image,
-            result.intermediate_output.image.image,
-            result.intermediate_output.gif.image,
+        # The panel only holds thumbnails: the full resolution previews are downloaded to be saved.
+        previews = (
+            # result.url_result.image,  # same as `intermediate_output.image`
+            result.url_result.gif,
+            result.intermediate_output.image,
+            result.intermediate_output.gif,
         )
-        for image in images:
-            if image:
-                image.save(filepath=str(dirpath / f"{image.name}.{image.file_format.lower()}"), save_copy=False)
+        for preview in previews:
+            if preview.url:
+                suffix = pathlib.PurePosixPath(urlparse(preview.url).path).suffix.lower() or ".png"
+                request_download_model(preview.name, preview.url, str(dirpath / f"{preview.name}{suffix}"))
         result.saved = True
         return {'FINISHED'}
 
 
+class H3D_OT_cancel_download(Operator):
+    bl_label = "Cancel Download"
+    bl_idname = "h3d.cancel_download"
+    bl_description = "Cancel the download of the result model"
+
+    asset_id: StringProperty(name="Asset ID", default="", options={'SKIP_SAVE'})
+
+    def execute(self, context):
+        if not download_pool.cancel(self.asset_id):
+            return {'CANCELLED'}
+        ui_tag_redraw("VIEW_3D", "UI")
+        return {'FINISHED'}
+
+
 class H3D_OT_discard_result(Operator):
     bl_label = "Discard Result"
     bl_idname = "h3d.discard_result"
@@ -217,6 +370,9 @@ class H3D_OT_discard_result(Operator):
             if image is None:
                 continue
             bpy.data.images.remove(image, do_unlink=True, do_ui_user=True)
+        download_pool.cancel(result.asset_id)
+        for preview in (result.url_result.gif, result.intermediate_output.image, result.intermediate_output.gif):
+            download_pool.cancel(preview.name)
         generation.remove_result(self.result_id)
         return {'FINISHED'}
 
@@ -224,10 +380,15 @@ class H3D_OT_discard_result(Operator):
 class H3D_OT_import_result_model(Operator):
     bl_label = "Import Result Model"
     bl_idname = "h3d.import_result_model"
-    bl_description = "Import the result model"
+    bl_description = "Import the result model. If it's already in the file, add a linked duplicate instead (Shift: independent copy)"
 
     generation_id: StringProperty(name="Generation ID", default="", options={'SKIP_SAVE'})
     result_id: StringProperty(name="Result ID", default="", options={'SKIP_SAVE'})
+    deep_copy: BoolProperty(name="Deep Copy", description="Copy mesh and materials instead of sharing them with the existing import", default=False, options={'SKIP_SAVE'})
+
+    def invoke(self, context, event):
+        self.deep_copy = event.shift
+        return self.execute(context)
 
     def execute(self, context):
         scn_h3d = H3D_Data.SCN(context)
@@ -240,6 +401,10 @@ class H3D_OT_import_result_model(Operator):
             self.report({'ERROR'}, "Result not found")
             return {'CANCELLED'}
 
+        if (source := find_imported_asset(result.asset_id)) is not None:
+            instance_imported_asset(source, deep_copy=self.deep_copy)
+            return {'FINISHED'}
+
         if not result.saved:
             # Dont use preferences but temp dir by default.
             if result.url_result.glb:
@@ -267,15 +432,17 @@ class H3D_OT_import_result_model(Operator):
                     self.report({'ERROR'}, "Result not found")
                     return {'CANCELLED'}
 
-            bpy.ops.import_scene.gltf(filepath=filepath)
+            import_model(result.asset_id, filepath)
         return {'FINISHED'}
 
 
 def purge_invalid_generations():
     h3d_scn = H3D_Data.SCN()
+    # Journaled generations are still being tracked and get resumed, not purged.
+    resumable_ids = set(get_job_journal().get_running_creation_ids())
     to_remove_generations: list[GenerationDetails] = []
     for generation in h3d_scn.generation_details:
-        if generation.status in {'wait', 'processing'}:
+        if generation.status in {'wait', 'processing'} and generation.name not in resumable_ids:
             to_remove_generations.append(generation)
 
     if len(to_remove_generations) == 0:
@@ -283,10 +450,11 @@ def purge_invalid_generations():
 
     print("Purging invalid AI generations...")
 
-    for gen in to_remove_generations:
-        for result in gen.result:
-            bpy.ops.discard_result(generation_id=gen.name, result_id=result.name)
-        h3d_scn.remove_generation(gen.name)
+    for gen_name in [gen.name for gen in to_remove_generations]:
+        gen = h3d_scn.get_generation(gen_name)
+        for result_name in [result.name for result in gen.result]:
+            bpy.ops.h3d.discard_result(generation_id=gen_name, result_id=result_name)
+        h3d_scn.remove_generation(gen_name)
 
 
 def register():
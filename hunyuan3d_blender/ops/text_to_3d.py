@@ -1,25 +1,41 @@
 import bpy
+import uuid
+from bpy.app.handlers import persistent
 from bpy.types import Operator, Image
 from bpy.props import StringProperty, IntProperty, BoolProperty, PointerProperty, FloatProperty
 from collections import deque
-from ..api.h3d import generate_3d_model, get_creation_details
+from ..api import worker
 from ..utils import TimerManager
+from ..utils.image_encode import read_image_pixels, downscale_pixels
+from ..utils.poll_scheduler import PollScheduler
+from ..utils.admission import AdmissionController
+from ..utils.job_journal import get_job_journal
 from ..data import H3D_Data
-from ..data.scn import GenerationDetails
 from ..utils.ui import ui_tag_redraw
+from ..prefs import get_prefs
 
 
 # Constants
 DEFAULT_IMAGE_PROMPT = "high quality 3D model"
+# The timer only drains worker results and schedules work, so it can tick often.
+TIMER_INTERVAL = 0.25
 
 
-currently_processing_count = 0
+# (job_id, generate_3d_model arguments) waiting for admission.
 generation_queue = deque()
 timer_id = "generation_timer"
-running_generations: dict[str, GenerationDetails] = {}
+# job_id -> submitted data, for requests handed to the network worker but not answered yet.
+submitting_generations: dict[str, dict] = {}
+admission = AdmissionController()
+# Running generations by creation_id, with their next poll time.
+running_generations = PollScheduler()
+# creation_ids with a poll request in flight.
+pending_polls: set[str] = set()
+# Path of the open file before a save, to move its jobs when saved as another file.
+saved_from_filepath = ""
 
 
-def get_all_running_generations() -> dict[str, GenerationDetails]:
+def get_all_running_generations() -> PollScheduler:
     global running_generations
     return running_generations
 
@@ -28,52 +44,129 @@ def get_queue_count() -> int:
     return len(generation_queue)
 
 def get_currently_processing_count() -> int:
-    global currently_processing_count
-    return currently_processing_count
+    return admission.in_flight
 
+def get_admission_controller() -> AdmissionController:
+    return admission
 
-def generation_timer():
-    global currently_processing_count, generation_queue, running_generations
-    if currently_processing_count < 3:
-        if len(generation_queue) > 0:
-            data = generation_queue.popleft()
-            if creation_id := generate_3d_model(**data):
-                currently_processing_count -= 1
-                h3d_scn = H3D_Data.SCN()
-                running_generations[creation_id] = h3d_scn.new_generation(creation_id)
-            else:
-                print("Failed to generate 3D model")
-                return 4.0
-
-    if currently_processing_count == 0:
+
+def _get_job_scn(job: dict | None):
+    """Scene properties a journaled job writes its generation to, or None while the .blend
+    file it was started from isn't the one open."""
+    if job is None or job.get("blend_filepath", "") != bpy.data.filepath:
         return None
+    scene = bpy.data.scenes.get(job.get("scene", ""))
+    if scene is None:
+        # Renamed or removed since: the file is right, the active scene will do.
+        return H3D_Data.SCN()
+    return scene.h3d
 
-    # get all generation details
-    completed_generations = []
-    invalid_generations = []
-    for creation_id, generation in running_generations.items():
-        creation_details = get_creation_details(creation_id)
-        if creation_details is None:
-            continue
-        generation.load_from_response(creation_details)
-        if generation.status == "success":
-            completed_generations.append(creation_id)
-            currently_processing_count -= 1
-        if generation.status == 'fail':
-            invalid_generations.append(creation_id)
-
-    for creation_id in completed_generations:
-        running_generations.pop(creation_id)
-
-    for creation_id in invalid_generations:
-        running_generations.pop(creation_id)
-        h3d_scn = H3D_Data.SCN()
+
+def _on_generation_submitted(job_id: str, creation_id: str | None) -> None:
+    submitting_generations.pop(job_id, None)
+    journal = get_job_journal()
+    if creation_id is None:
+        admission.on_rejected(job_id)
+        journal.record_done(job_id)
+        print("Failed to generate 3D model")
+        return
+    admission.on_accepted(job_id, creation_id)
+    journal.record_running(job_id, creation_id)
+    h3d_scn = _get_job_scn(journal.get_job(job_id))
+    if h3d_scn is None:
+        # Another file was opened meanwhile: resumed once its own file is open again.
+        admission.on_finished(creation_id)
+        return
+    h3d_scn.new_generation(creation_id)
+    # Due right away so the new generation shows its initial state.
+    running_generations.add(creation_id)
+
+
+def _on_generation_rate_limited(job_id: str, retry_after: float | None) -> None:
+    data = submitting_generations.pop(job_id, None)
+    admission.on_rate_limited(job_id, retry_after)
+    if data is not None:
+        # Not consumed by the service: back to the front of the queue.
+        generation_queue.appendleft((job_id, data))
+
+
+def _release_generation(creation_id: str) -> None:
+    """Stops polling a generation, still pending in the journal."""
+    running_generations.remove(creation_id)
+    admission.on_finished(creation_id)
+
+
+def _finish_generation(creation_id: str) -> None:
+    _release_generation(creation_id)
+    get_job_journal().record_creation_done(creation_id)
+
+
+def _on_generation_details(creation_id: str, creation_details: dict | None) -> None:
+    pending_polls.discard(creation_id)
+    if creation_id not in running_generations:
+        return
+    if creation_details is None:
+        running_generations.postpone(creation_id)
+        return
+    h3d_scn = _get_job_scn(get_job_journal().get_creation_job(creation_id))
+    if h3d_scn is None:
+        # Its file isn't open: left pending for when it is.
+        _release_generation(creation_id)
+        return
+    generation = h3d_scn.get_generation(creation_id)
+    if generation is None:
+        # Its file is open and resumed it, so removed by the user while it was running.
+        _finish_generation(creation_id)
+        return
+    generation.load_from_response(creation_details)
+    if generation.status == "success":
+        _finish_generation(creation_id)
+    elif generation.status == 'fail':
+        _finish_generation(creation_id)
         h3d_scn.remove_generation(creation_id)
+    else:
+        running_generations.update(creation_id, creation_details)
+
+
+def generation_timer():
+    global generation_queue, running_generations
+
+    # Apply everything the network worker has finished since the last tick.
+    results_applied = False
+    for kind, key, result in worker.drain_results():
+        if kind == worker.SUBMITTED:
+            _on_generation_submitted(key, result)
+        elif kind == worker.RATE_LIMITED:
+            _on_generation_rate_limited(key, result)
+        elif kind == worker.QUOTA_INFO:
+            admission.on_quota(result)
+        elif kind == worker.DETAILS:
+            _on_generation_details(key, result)
+        results_applied = True
 
-    # update UI
-    ui_tag_redraw("VIEW_3D", "UI")
+    if len(generation_queue) > 0 and admission.needs_quota_refresh():
+        admission.on_quota_requested()
+        worker.request_quota()
 
-    return 4.0
+    while len(generation_queue) > 0 and admission.can_admit():
+        job_id, data = generation_queue.popleft()
+        submitting_generations[job_id] = data
+        admission.on_submit(job_id)
+        worker.request_submission(job_id, data)
+
+    due_generations = [
+        creation_id for creation_id in running_generations.get_due()
+        if creation_id not in pending_polls
+    ]
+    pending_polls.update(due_generations)
+    worker.request_poll(due_generations)
+
+    if results_applied:
+        ui_tag_redraw("VIEW_3D", "UI")
+
+    if len(generation_queue) == 0 and get_currently_processing_count() == 0:
+        return None
+    return TIMER_INTERVAL
 
 
 class H3D_OT_TextTo3D(Operator):
@@ -91,6 +184,7 @@ class H3D_OT_TextTo3D(Operator):
     inference_steps: IntProperty(name="Inference Steps", default=5)
     guidance_scale: FloatProperty(name="Guidance Scale", default=5.0)
     face_count: IntProperty(name="Face Count", default=40000)
+    enable_low_poly: BoolProperty(name="Low Poly", default=False)
 
     def execute(self, context):
         if self.count == 0:
@@ -107,26 +201,114 @@ class H3D_OT_TextTo3D(Operator):
         # If only image is provided (no prompt), use a descriptive default
         if not prompt:
             prompt = DEFAULT_IMAGE_PROMPT
-        
+
+        prefs = get_prefs()
+        pixels = None
+        if self.image:
+            # Pixels must be read on the main thread; encoding happens on the network worker.
+            pixels = downscale_pixels(read_image_pixels(self.image), prefs.image_upload_max_edge)
         self.add_to_queue({
             "prompt": prompt,
             "title": prompt,
             "style": "" if self.style == 'DEFAULT' else self.style,
             "count": self.count,
             "enable_pbr": self.use_pbr,
-            "enable_low_poly": False,
-            "image": self.image,
+            "enable_low_poly": self.enable_low_poly,
+            "image": pixels,
             "remove_background": self.remove_background,
             "octree_resolution": self.octree_resolution,
             "inference_steps": self.inference_steps,
             "guidance_scale": self.guidance_scale,
-            "face_count": self.face_count
+            "face_count": self.face_count,
+            "image_max_edge": prefs.image_upload_max_edge,
+            "image_max_bytes": prefs.image_upload_max_bytes
         })
         return {'FINISHED'}
 
     def add_to_queue(self, data: dict):
-        generation_queue.append(data)
-        global timer_id
-        if TimerManager.exists(timer_id):
-            return
-        TimerManager.add(timer_id, generation_timer)
+        job_id = uuid.uuid4().hex
+        get_job_journal().record_queued(job_id, data, bpy.data.filepath, bpy.context.scene.name)
+        generation_queue.append((job_id, data))
+        ensure_generation_timer()
+
+
+def ensure_generation_timer():
+    global timer_id
+    if TimerManager.exists(timer_id):
+        return
+    TimerManager.add(timer_id, generation_timer)
+
+
+def resume_journaled_jobs():
+    """Picks up the jobs left queued or running by a previous session or while another file
+    was open, those of the open .blend file only, so no creation is submitted twice."""
+    journal = get_job_journal()
+    blend_filepath = bpy.data.filepath
+
+    # Jobs of the file left stay queued in the journal.
+    for job in [job for job in generation_queue if _get_job_scn(journal.get_job(job[0])) is None]:
+        generation_queue.remove(job)
+    for creation_id in list(running_generations):
+        if _get_job_scn(journal.get_creation_job(creation_id)) is None:
+            _release_generation(creation_id)
+
+    queued_ids = {job_id for job_id, _data in generation_queue} | set(submitting_generations)
+    for job_id, data in journal.iter_queued(blend_filepath):
+        if job_id not in queued_ids:
+            generation_queue.append((job_id, data))
+
+    for creation_id in journal.get_running_creation_ids(blend_filepath):
+        if creation_id in running_generations:
+            continue
+        h3d_scn = _get_job_scn(journal.get_creation_job(creation_id))
+        if h3d_scn.get_generation(creation_id) is None:
+            h3d_scn.new_generation(creation_id)
+        admission.on_resumed(creation_id)
+        running_generations.add(creation_id)
+
+    if len(generation_queue) > 0 or len(running_generations) > 0:
+        print(f"Resuming {len(generation_queue)} queued and {len(running_generations)} running AI generations...")
+        ensure_generation_timer()
+    return None
+
+
+@persistent
+def _on_load_post(*args):
+    if not TimerManager.exists('resume_journaled_jobs'):
+        TimerManager.add('resume_journaled_jobs', resume_journaled_jobs, first_interval=0.0)
+
+
+@persistent
+def _on_save_pre(*args):
+    global saved_from_filepath
+    saved_from_filepath = bpy.data.filepath
+
+
+@persistent
+def _on_save_post(*args):
+    """The live jobs of the file (unsaved, or saved as another) now belong to the saved file."""
+    journal = get_job_journal()
+    job_ids = [job_id for job_id, _data in generation_queue] + list(submitting_generations)
+    for creation_id in running_generations:
+        job_ids.extend(job_id for job_id, job in journal.jobs.items() if job.get("creation_id") == creation_id)
+    for job_id in job_ids:
+        job = journal.get_job(job_id)
+        if job is not None and job.get("blend_filepath", "") == saved_from_filepath != bpy.data.filepath:
+            journal.record_target(job_id, bpy.data.filepath, job.get("scene", ""))
+
+
+def register():
+    bpy.app.handlers.load_post.append(_on_load_post)
+    bpy.app.handlers.save_pre.append(_on_save_pre)
+    bpy.app.handlers.save_post.append(_on_save_post)
+    TimerManager.add('resume_journaled_jobs', resume_journaled_jobs, first_interval=1.0)
+
+
+def unregister():
+    for handlers, handler in (
+        (bpy.app.handlers.load_post, _on_load_post),
+        (bpy.app.handlers.save_pre, _on_save_pre),
+        (bpy.app.handlers.save_post, _on_save_post),
+    ):
+        if handler in handlers:
+            handlers.remove(handler)
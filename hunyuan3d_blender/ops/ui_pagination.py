@@ -1,6 +1,8 @@
 from bpy.types import Operator
 from bpy.props import IntProperty
 
+from ..utils.generation_index import get_page_count
+
 
 class H3D_OT_FilterGenerationPageIndexFirst(Operator):
     bl_idname = "h3d.filter_generation_page_index_first"
@@ -21,7 +23,7 @@ class H3D_OT_FilterGenerationPageIndexLast(Operator):
     def execute(self, context):
         scn_h3d = context.scene.h3d
         wm_h3d = context.window_manager.h3d
-        wm_h3d.ui_filter_generation_page_index = len(scn_h3d.generation_details) // wm_h3d.ui_filter_generation_page_size
+        wm_h3d.ui_filter_generation_page_index = get_page_count(scn_h3d, wm_h3d) - 1
         return {'FINISHED'}
 
 
@@ -0,0 +1,33 @@
+from bpy.types import Operator
+from bpy.props import StringProperty
+
+from ..data import H3D_Data
+from ..utils.preview_animation import start_preview_animation, stop_preview_animation
+from ..utils import preview_animation
+
+
+class H3D_OT_toggle_preview_animation(Operator):
+    bl_idname = "h3d.toggle_preview_animation"
+    bl_label = "Play Turntable"
+    bl_description = "Play or stop the turntable animation of the result preview"
+
+    generation_id: StringProperty(name="Generation ID", default="", options={'SKIP_SAVE'})
+    result_id: StringProperty(name="Result ID", default="", options={'SKIP_SAVE'})
+
+    def execute(self, context):
+        scn_h3d = H3D_Data.SCN(context)
+        generation = scn_h3d.get_generation(self.generation_id)
+        result = generation.get_result(self.result_id) if generation is not None else None
+        if result is None:
+            self.report({'ERROR'}, "Result not found")
+            return {'CANCELLED'}
+        gif = result.url_result.gif if result.url_result.gif.url else result.intermediate_output.gif
+        if not gif.url:
+            self.report({'ERROR'}, "Result has no turntable animation")
+            return {'CANCELLED'}
+
+        if preview_animation.animated_key == gif.name:
+            stop_preview_animation()
+        else:
+            start_preview_animation(gif.name, gif.url)
+        return {'FINISHED'}
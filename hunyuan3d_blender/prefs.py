@@ -1,11 +1,16 @@
 from bpy.types import AddonPreferences, WindowManager, PropertyGroup
-from bpy.props import StringProperty, PointerProperty
+from bpy.props import StringProperty, PointerProperty, IntProperty, FloatProperty, BoolProperty
 import bpy
 
 from pathlib import Path
 import json
 
 from .utils import TimerManager
+from .utils.image_encode import DEFAULT_MAX_EDGE, DEFAULT_MAX_BYTES
+from .utils.asset_cache import get_asset_cache, DEFAULT_MAX_BYTES as DEFAULT_CACHE_MAX_BYTES
+from .utils.lod import DEFAULT_LOD_RATIOS, parse_lod_ratios
+from .utils.image import DEFAULT_MAX_WORKERS as DEFAULT_PREVIEW_WORKERS, set_max_workers as set_preview_max_workers
+from .utils.image import DEFAULT_THUMBNAIL_SIZE, set_thumbnail_max_size
 
 
 config_path = Path(bpy.utils.user_resource('CONFIG'))
@@ -36,6 +41,77 @@ class H3D_Preferences(AddonPreferences):
     h3d_cookie_token: StringProperty(name="Token", default="", subtype="PASSWORD", update=lambda prefs, ctx: prefs.backup_prop('h3d_cookie_token'))
     h3d_cookie_user_id: StringProperty(name="User ID", default="", update=lambda prefs, ctx: prefs.backup_prop('h3d_cookie_user_id'))
 
+    image_upload_max_edge: IntProperty(
+        name="Max Image Size",
+        description="Input images for Image-to-3D are downscaled so their longest edge fits this size (in pixels)",
+        default=DEFAULT_MAX_EDGE, min=256, max=8192,
+        update=lambda prefs, ctx: prefs.backup_prop('image_upload_max_edge')
+    )
+    image_upload_max_megabytes: FloatProperty(
+        name="Max Image Payload (MB)",
+        description="Size budget of the encoded input image sent for Image-to-3D",
+        default=DEFAULT_MAX_BYTES / (1024 * 1024), min=0.25, max=32.0,
+        update=lambda prefs, ctx: prefs.backup_prop('image_upload_max_megabytes')
+    )
+
+    def update_asset_cache_max_gigabytes(self, context):
+        self.backup_prop('asset_cache_max_gigabytes')
+        get_asset_cache().set_max_bytes(self.asset_cache_max_bytes)
+
+    asset_cache_max_gigabytes: FloatProperty(
+        name="Asset Cache Size (GB)",
+        description="Downloaded result files are kept in a local cache so they are never downloaded twice; the least recently used are removed beyond this size",
+        default=DEFAULT_CACHE_MAX_BYTES / (1024 ** 3), min=0.1, max=1024.0,
+        update=update_asset_cache_max_gigabytes
+    )
+
+    def update_preview_load_workers(self, context):
+        self.backup_prop('preview_load_workers')
+        set_preview_max_workers(self.preview_load_workers)
+
+    preview_load_workers: IntProperty(
+        name="Preview Downloads",
+        description="Number of result preview images downloaded at the same time",
+        default=DEFAULT_PREVIEW_WORKERS, min=1, max=16,
+        update=update_preview_load_workers
+    )
+
+    def update_preview_thumbnail_size(self, context):
+        self.backup_prop('preview_thumbnail_size')
+        set_thumbnail_max_size(self.preview_thumbnail_size)
+
+    preview_thumbnail_size: IntProperty(
+        name="Preview Size",
+        description="Result previews are kept as thumbnails with their longest edge at this size (in pixels); full resolution images are only downloaded when saving a result",
+        default=DEFAULT_THUMBNAIL_SIZE, min=64, max=2048,
+        update=update_preview_thumbnail_size
+    )
+
+    import_lods: BoolProperty(
+        name="Import Levels of Detail",
+        description="Also build decimated meshes with downsampled textures when importing results",
+        default=False,
+        update=lambda prefs, ctx: prefs.backup_prop('import_lods')
+    )
+    lod_ratios: StringProperty(
+        name="LOD Ratios",
+        description="Comma separated face ratios of each level of detail",
+        default=", ".join(str(ratio) for ratio in DEFAULT_LOD_RATIOS),
+        update=lambda prefs, ctx: prefs.backup_prop('lod_ratios')
+    )
+
+    @property
+    def lod_ratio_values(self) -> tuple[float, ...]:
+        return parse_lod_ratios(self.lod_ratios) if self.import_lods else ()
+
+    @property
+    def image_upload_max_bytes(self) -> int:
+        return int(self.image_upload_max_megabytes * 1024 * 1024)
+
+    @property
+    def asset_cache_max_bytes(self) -> int:
+        return int(self.asset_cache_max_gigabytes * 1024 ** 3)
+
     def draw(self, context):
         layout = self.layout
         
@@ -44,6 +120,19 @@ class H3D_Preferences(AddonPreferences):
         login_box.prop(self, "h3d_cookie_user_id")
 
         layout.prop(self, "generations_save_dirpath")
+        layout.prop(self, "asset_cache_max_gigabytes")
+        layout.prop(self, "preview_load_workers")
+        layout.prop(self, "preview_thumbnail_size")
+
+        lod_box = layout.box()
+        lod_box.label(text="Import", icon='IMPORT')
+        lod_box.prop(self, "import_lods")
+        lod_box.prop(self, "lod_ratios")
+
+        upload_box = layout.box()
+        upload_box.label(text="Image-to-3D Upload", icon='IMAGE_DATA')
+        upload_box.prop(self, "image_upload_max_edge")
+        upload_box.prop(self, "image_upload_max_megabytes")
 
 
 def get_prefs() -> H3D_Preferences:
@@ -64,6 +153,13 @@ def load_prefs_from_config_file():
         prefs.generations_save_dirpath = config_data.get('generations_save_dirpath', '')
         prefs.h3d_cookie_token = config_data.get('h3d_cookie_token', '')
         prefs.h3d_cookie_user_id = config_data.get('h3d_cookie_user_id', '')
+        prefs.image_upload_max_edge = config_data.get('image_upload_max_edge', DEFAULT_MAX_EDGE)
+        prefs.image_upload_max_megabytes = config_data.get('image_upload_max_megabytes', DEFAULT_MAX_BYTES / (1024 * 1024))
+        prefs.asset_cache_max_gigabytes = config_data.get('asset_cache_max_gigabytes', DEFAULT_CACHE_MAX_BYTES / (1024 ** 3))
+        prefs.preview_load_workers = config_data.get('preview_load_workers', DEFAULT_PREVIEW_WORKERS)
+        prefs.preview_thumbnail_size = config_data.get('preview_thumbnail_size', DEFAULT_THUMBNAIL_SIZE)
+        prefs.import_lods = config_data.get('import_lods', False)
+        prefs.lod_ratios = config_data.get('lod_ratios', ", ".join(str(ratio) for ratio in DEFAULT_LOD_RATIOS))
 
 
 def register():
@@ -3,8 +3,11 @@ from bpy.types import Panel
 
 from ..data import H3D_Data
 from ..api.session import get_session
-from ..ops.text_to_3d import get_currently_processing_count, get_queue_count
+from ..ops.text_to_3d import get_currently_processing_count, get_queue_count, get_admission_controller
+from ..ops.result_management import get_download_progress, is_download_pending, get_cached_model_info
 from ..utils.image import get_image_from_url
+from ..utils.generation_index import get_page_generations, get_page_count
+from ..utils.preview_animation import get_animated_icon
 from ..prefs import get_prefs
 
 
@@ -38,6 +41,35 @@ class H3D_PT_Panel(Panel):
         header.label(text="Generation Details")
         if generation_details_subpanel:
             self.draw_generation_details(context, generation_details_subpanel)
+        header, lod_subpanel = layout.panel('H3D_PT_lod', default_closed=True)
+        header.label(text="Level of Detail")
+        if lod_subpanel:
+            self.draw_lod(context, lod_subpanel)
+
+    def draw_lod(self, context: bpy.types.Context, layout: bpy.types.UILayout):
+        scn_h3d = H3D_Data.SCN(context)
+        prefs = get_prefs()
+
+        col = layout.column()
+        col.prop(prefs, "import_lods")
+        sub = col.column()
+        sub.active = prefs.import_lods
+        sub.prop(prefs, "lod_ratios")
+
+        layout.row().prop(scn_h3d, "lod_mode", expand=True)
+        row = layout.row()
+        row.active = scn_h3d.lod_mode == 'DISTANCE'
+        row.prop(scn_h3d, "lod_distance")
+
+        obj = context.active_object
+        if obj is not None and obj.type == 'MESH' and len(obj.h3d_lod.levels) > 1:
+            box = layout.box().column(align=True)
+            for index, level in enumerate(obj.h3d_lod.levels):
+                if level.mesh is None:
+                    continue
+                row = box.row()
+                row.label(text=f"LOD{index}", icon='RADIOBUT_ON' if index == obj.h3d_lod.active_level else 'RADIOBUT_OFF')
+                row.label(text=f"{len(level.mesh.polygons):,} faces")
 
     def draw_login(self, context: bpy.types.Context, layout: bpy.types.UILayout):
         wm_h3d = H3D_Data.WM(context)
@@ -107,6 +139,7 @@ class H3D_PT_Panel(Panel):
                             text="Guidance Scale")
             advanced_box.prop(wm_h3d, "h3d_generation_face_count", 
                             text="Face Count")
+            advanced_box.prop(wm_h3d, "h3d_generation_low_poly")
 
         op = generation_box.operator("h3d.text_to_3d", text="Generate")
         op.prompt = wm_h3d.h3d_generation_prompt
@@ -119,6 +152,7 @@ class H3D_PT_Panel(Panel):
         op.inference_steps = wm_h3d.h3d_generation_inference_steps
         op.guidance_scale = wm_h3d.h3d_generation_guidance_scale
         op.face_count = wm_h3d.h3d_generation_face_count
+        op.enable_low_poly = wm_h3d.h3d_generation_low_poly
 
     def draw_generation_details(self, context: bpy.types.Context, layout: bpy.types.UILayout):
         scn_h3d = H3D_Data.SCN(context)
@@ -130,8 +164,13 @@ class H3D_PT_Panel(Panel):
         split = box.split(factor=0.5)
         process_count = get_currently_processing_count()
         queue_count = get_queue_count()
-        split.label(text=f"Processing {process_count}")
+        admission = get_admission_controller()
+        split.label(text=f"Processing {process_count}/{admission.limit}")
         split.label(text=f"Queue {queue_count}")
+        if admission.remaining_quota is not None:
+            row = box.row()
+            row.alert = admission.remaining_quota <= 0
+            row.label(text=f"Remaining Quota {admission.remaining_quota}")
 
         # --- Filter. ---
         filter_box = layout.box().row()
@@ -142,22 +181,15 @@ class H3D_PT_Panel(Panel):
         sub.prop(wm_h3d, "ui_filter_generation_page_order_invert", text="", toggle=True, icon='SORT_DESC' if wm_h3d.ui_filter_generation_page_order_invert else 'SORT_ASC')
         sub.prop(wm_h3d, 'ui_image_preview_shading_type', text='', expand=True, icon_only=True)
         sub.prop(wm_h3d, "ui_image_preview_scale", text="", expand=False, icon='IMAGE_DATA', icon_only=True)
+        sub.prop(wm_h3d, "ui_animate_previews", text="", toggle=True, icon='RENDER_ANIMATION')
 
 
-        filter_status: str = wm_h3d.ui_filter_generation_status
-        use_filter_status = filter_status != "ALL"
-        
         current_page_index = wm_h3d.ui_filter_generation_page_index
-        max_pages = len(scn_h3d.generation_details) // wm_h3d.ui_filter_generation_page_size
+        # Index of the last page.
+        max_pages = get_page_count(scn_h3d, wm_h3d) - 1
 
-        generations = list(scn_h3d.generation_details)
-        start_index = current_page_index * wm_h3d.ui_filter_generation_page_size
-        end_index = min(start_index + wm_h3d.ui_filter_generation_page_size, len(generations))
-
-        if not wm_h3d.ui_filter_generation_page_order_invert:
-            generations = list(reversed(generations))
-            
-        generations = generations[start_index:end_index]
+        # Only the generations of the page, already filtered.
+        generations = get_page_generations(scn_h3d, wm_h3d, current_page_index)
         
         # --- List of generations. ---
         if wm_h3d.ui_image_preview_scale == "AUTO":
@@ -170,11 +202,6 @@ class H3D_PT_Panel(Panel):
 
         generation_col = layout.column(align=True)
         for gen_index, generation in enumerate(generations):
-            if not generation.show_in_gen_ui:
-                continue
-            if use_filter_status and generation.status != filter_status:
-                continue
-
             if gen_index > 0:
                 generation_col.separator(factor=0.5)
 
@@ -215,7 +242,10 @@ class H3D_PT_Panel(Panel):
                 else:
                     row.box().label(text="", icon='IMAGE_DATA')
                 # Right
-                if result.url_result.gif.url and result.url_result.gif.image and show_render_image:
+                animated_gif = result.url_result.gif if result.url_result.gif.url else result.intermediate_output.gif
+                if wm_h3d.ui_animate_previews and (animated_icon := get_animated_icon(animated_gif.name)):
+                    row.template_icon(animated_icon, scale=image_preview_scale)
+                elif result.url_result.gif.url and result.url_result.gif.image and show_render_image:
                     result.url_result.gif.draw_preview(row, image_preview_scale)
                 elif result.intermediate_output.gif.url and result.intermediate_output.gif.image:
                     result.intermediate_output.gif.draw_preview(row, image_preview_scale)
@@ -254,7 +284,25 @@ class H3D_PT_Panel(Panel):
                         op.generation_id = generation.name
                         op.result_id = result.name
                     actions_row.separator()
+                    if wm_h3d.ui_animate_previews and animated_gif.url:
+                        is_playing = get_animated_icon(animated_gif.name) is not None
+                        op = actions_row.operator("h3d.toggle_preview_animation", text="", icon='PAUSE' if is_playing else 'PLAY', depress=is_playing)
+                        op.generation_id = generation.name
+                        op.result_id = result.name
                     actions_row.prop(result, "fav", text="", icon='SOLO_ON' if result.fav else 'SOLO_OFF')
+                    if model_info := get_cached_model_info(result.asset_id):
+                        size_text = ""
+                        if model_info.get("bbox_min") and model_info.get("bbox_max"):
+                            size = [high - low for low, high in zip(model_info["bbox_min"], model_info["bbox_max"])]
+                            size_text = " · " + " x ".join(f"{value:.2f}" for value in size)
+                        result_box.label(text=f"{model_info['face_count']:,} faces{size_text}", icon='MESH_DATA')
+                    if is_download_pending(result.asset_id):
+                        download_row = result_box.row(align=True)
+                        if download_progress := get_download_progress(result.asset_id):
+                            download_row.label(text=download_progress.format(), icon='SORT_ASC')
+                        else:
+                            download_row.label(text="Download queued", icon='SORTTIME')
+                        download_row.operator("h3d.cancel_download", text="", icon='X').asset_id = result.asset_id
 
         # Filter.
         footer_col = layout.column(align=True)
@@ -0,0 +1,91 @@
+import time
+
+
+INITIAL_LIMIT = 3
+MAX_LIMIT = 32
+BASE_BACKOFF = 15.0
+MAX_BACKOFF = 300.0
+QUOTA_REFRESH_INTERVAL = 60.0
+
+
+class AdmissionController:
+    """Decides when queued generations may be submitted.
+
+    In-flight jobs are tracked from submission until they finish, whatever the outcome.
+    The concurrency limit adapts to the service (AIMD): it grows by one for each accepted
+    submission made at full capacity, and halves on a 429. After a 429, nothing is
+    submitted until Retry-After (or an exponential backoff) elapses. Submissions also
+    pause when the last known remaining quota is exhausted.
+    """
+
+    def __init__(self, initial_limit: int = INITIAL_LIMIT, max_limit: int = MAX_LIMIT):
+        self.limit = initial_limit
+        self.max_limit = max_limit
+        self.submitting: set[str] = set()
+        self.running: set[str] = set()
+        self.blocked_until = 0.0
+        self.rate_limited_count = 0
+        self.remaining_quota: int | None = None
+        self.quota_checked_at: float | None = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.submitting) + len(self.running)
+
+    def can_admit(self, now: float | None = None) -> bool:
+        if now is None:
+            now = time.monotonic()
+        if now < self.blocked_until:
+            return False
+        if self.remaining_quota is not None and self.remaining_quota <= 0:
+            return False
+        return self.in_flight < self.limit
+
+    def needs_quota_refresh(self, now: float | None = None) -> bool:
+        if now is None:
+            now = time.monotonic()
+        return self.quota_checked_at is None or now - self.quota_checked_at >= QUOTA_REFRESH_INTERVAL
+
+    def on_quota_requested(self, now: float | None = None) -> None:
+        self.quota_checked_at = time.monotonic() if now is None else now
+
+    def on_quota(self, remaining_quota: int | None) -> None:
+        if remaining_quota is None:
+            return
+        if remaining_quota <= 0 and (self.remaining_quota is None or self.remaining_quota > 0):
+            print("⚠️  Warning: Hunyuan 3D quota exhausted, queued generations are on hold.")
+        self.remaining_quota = remaining_quota
+
+    def on_submit(self, job_id: str) -> None:
+        self.submitting.add(job_id)
+
+    def on_accepted(self, job_id: str, creation_id: str) -> None:
+        at_capacity = self.in_flight >= self.limit
+        self.submitting.discard(job_id)
+        self.running.add(creation_id)
+        self.rate_limited_count = 0
+        if at_capacity:
+            self.limit = min(self.max_limit, self.limit + 1)
+        if self.remaining_quota is not None:
+            self.remaining_quota -= 1
+
+    def on_resumed(self, creation_id: str) -> None:
+        """Tracks a generation submitted in a previous session."""
+        self.running.add(creation_id)
+
+    def on_rejected(self, job_id: str) -> None:
+        self.submitting.discard(job_id)
+
+    def on_rate_limited(self, job_id: str, retry_after: float | None, now: float | None = None) -> None:
+        if now is None:
+            now = time.monotonic()
+        self.submitting.discard(job_id)
+        self.limit = max(1, self.limit // 2)
+        if retry_after is None:
+            retry_after = min(MAX_BACKOFF, BASE_BACKOFF * (2 ** self.rate_limited_count))
+        self.rate_limited_count += 1
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        print(f"⚠️  Warning: Hunyuan 3D rate limit hit, retrying in {retry_after:.0f}s with up to {self.limit} concurrent generations.")
+
+    def on_finished(self, creation_id: str) -> None:
+        self.running.discard(creation_id)
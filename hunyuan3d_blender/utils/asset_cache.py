@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any
+
+from .paths import get_user_data_dir
+
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+THUMBNAIL_CACHE_MAX_BYTES = 256 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+# ioctl cloning a file on Linux copy-on-write filesystems (Btrfs, XFS...).
+FICLONE = 0x40049409
+
+
+class AssetCache:
+    """Persistent, content-addressed cache of downloaded result files (GLB, OBJ, FBX, GIF...).
+
+    Entries are keyed by `asset_id` + kind (the URL kind, e.g. "glb") and point to a blob
+    named after the SHA-256 of its content, so identical files are stored once. The index
+    file maps keys to blobs in least-recently-used order, and the least recently used
+    entries are evicted once the blobs exceed `max_bytes`. Files are handed out as copies
+    (copy-on-write clones where supported), never sharing the blob's inode, so edits to a
+    saved file can't corrupt the cache. Thread-safe.
+    """
+
+    def __init__(self, dirpath: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.dirpath = dirpath
+        self.blobs_dirpath = dirpath / "blobs"
+        self.tmp_dirpath = dirpath / "tmp"
+        self.index_filepath = dirpath / "index.json"
+        self.max_bytes = max_bytes
+        self.blobs_dirpath.mkdir(parents=True, exist_ok=True)
+        self.tmp_dirpath.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # "<asset_id>.<kind>" -> {"blob", "size", "url", "used", "info"}, least recently used first.
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def get_key(asset_id: str, kind: str) -> str:
+        return f"{asset_id}.{kind.lower()}"
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._get_total_bytes()
+
+    # --- Index. ---
+
+    def _load(self) -> None:
+        if not self.index_filepath.exists():
+            return
+        try:
+            entries = json.loads(self.index_filepath.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Warning: Asset cache index is unreadable, starting empty: {e}")
+            return
+        for key, entry in sorted(entries.items(), key=lambda item: item[1].get("used", 0)):
+            if (self.blobs_dirpath / entry.get("blob", "")).is_file():
+                self._entries[key] = entry
+
+    def _save(self) -> None:
+        """Writes the index atomically. Caller holds the lock."""
+        tmp_filepath = self.index_filepath.with_suffix(".json.tmp")
+        tmp_filepath.write_text(json.dumps(self._entries), encoding='utf-8')
+        os.replace(tmp_filepath, self.index_filepath)
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Persists the LRU order updated by lookups."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _get_total_bytes(self) -> int:
+        blob_sizes = {entry["blob"]: entry["size"] for entry in self._entries.values()}
+        return sum(blob_sizes.values())
+
+    def _remove_blob(self, blob: str) -> bool:
+        """Deletes a blob file. False if it's in use (open or mapped, on Windows)."""
+        try:
+            (self.blobs_dirpath / blob).unlink(missing_ok=True)
+        except PermissionError as e:
+            print(f"⚠️  Warning: Could not remove cached file {blob}, still in use: {e}")
+            return False
+        return True
+
+    def _evict(self) -> None:
+        """Drops least recently used entries until the cache fits, always keeping the newest one.
+        Entries whose blob can't be removed yet are kept, to be evicted later. Caller holds the lock."""
+        total_bytes = self._get_total_bytes()
+        kept = []
+        while len(self._entries) > 1 and total_bytes > self.max_bytes:
+            key, entry = self._entries.popitem(last=False)
+            if any(other["blob"] == entry["blob"] for other in self._entries.values()):
+                continue  # Blob still used by another entry.
+            if not self._remove_blob(entry["blob"]):
+                kept.append((key, entry))
+                continue
+            total_bytes -= entry["size"]
+        # Back in front: still the least recently used.
+        for key, entry in reversed(kept):
+            self._entries[key] = entry
+            self._entries.move_to_end(key, last=False)
+
+    # --- Public API. ---
+
+    def lookup(self, asset_id: str, kind: str) -> Path | None:
+        key = self.get_key(asset_id, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            filepath = self.blobs_dirpath / entry["blob"]
+            if not filepath.is_file():
+                del self._entries[key]
+                self._save()
+                return None
+            entry["used"] = time.time()
+            self._entries.move_to_end(key)
+            self._dirty = True
+            return filepath
+
+    def get_info(self, asset_id: str, kind: str) -> dict[str, Any] | None:
+        """Metadata stored with the entry (e.g. GLB counts and bounds). Doesn't count as a use."""
+        with self._lock:
+            entry = self._entries.get(self.get_key(asset_id, kind))
+            return entry.get("info") if entry is not None else None
+
+    def update_info(self, asset_id: str, kind: str, info: dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._entries.get(self.get_key(asset_id, kind))
+            if entry is not None:
+                entry["info"] = info
+                self._dirty = True
+
+    def get_download_path(self, asset_id: str, kind: str) -> Path:
+        """Stable path to download into before `store`, so partial downloads can resume."""
+        return self.tmp_dirpath / self.get_key(asset_id, kind)
+
+    def store(self, asset_id: str, kind: str, filepath: str | Path, url: str = "", info: dict[str, Any] | None = None) -> Path:
+        """Moves a downloaded file into the cache and returns its cached path."""
+        filepath = Path(filepath)
+        sha256 = hashlib.sha256()
+        with filepath.open('rb') as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                sha256.update(chunk)
+        blob = f"{sha256.hexdigest()}.{kind.lower()}"
+        blob_filepath = self.blobs_dirpath / blob
+        size = filepath.stat().st_size
+
+        with self._lock:
+            if blob_filepath.is_file():
+                filepath.unlink(missing_ok=True)
+            else:
+                os.replace(filepath, blob_filepath)
+            key = self.get_key(asset_id, kind)
+            self._entries[key] = {"blob": blob, "size": size, "url": url, "used": time.time(), "info": info}
+            self._entries.move_to_end(key)
+            self._evict()
+            self._save()
+        return blob_filepath
+
+    def remove(self, asset_id: str, kind: str) -> None:
+        key = self.get_key(asset_id, kind)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return
+            if not any(other["blob"] == entry["blob"] for other in self._entries.values()):
+                self._remove_blob(entry["blob"])
+            self._save()
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+            self._save()
+
+    @staticmethod
+    def _clone(cached_filepath: Path, filepath: Path) -> bool:
+        """Copy-on-write clone, on Linux filesystems supporting it. False if not cloned."""
+        if not sys.platform.startswith("linux"):
+            return False
+        import fcntl
+        try:
+            with cached_filepath.open('rb') as src, filepath.open('wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            # Other volume, or no copy-on-write support.
+            filepath.unlink(missing_ok=True)
+            return False
+        shutil.copystat(cached_filepath, filepath)
+        return True
+
+    @staticmethod
+    def materialize(cached_filepath: Path, filepath: str | Path) -> None:
+        """Places a copy of a cached file at `filepath`, cloned when the filesystem supports it.
+        Never a hardlink: editing the file in place would change the cached blob."""
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        if filepath.exists():
+            if filepath.resolve() == cached_filepath.resolve():
+                return
+            # Possibly a hardlink to the blob, from an earlier version: replaced, not written through.
+            filepath.unlink()
+        if not AssetCache._clone(cached_filepath, filepath):
+            shutil.copy2(cached_filepath, filepath)
+
+
+asset_cache = None
+thumbnail_cache = None
+
+
+def get_asset_cache() -> AssetCache:
+    global asset_cache
+    if asset_cache is None:
+        asset_cache = AssetCache(get_user_data_dir("assets"))
+    return asset_cache
+
+
+def get_thumbnail_cache() -> AssetCache:
+    """Cache of the preview thumbnails, keyed by URL hash (see `utils.image`)."""
+    global thumbnail_cache
+    if thumbnail_cache is None:
+        thumbnail_cache = AssetCache(get_user_data_dir("thumbnails"), THUMBNAIL_CACHE_MAX_BYTES)
+    return thumbnail_cache
+
+
+def unregister():
+    for cache in (asset_cache, thumbnail_cache):
+        if cache is not None:
+            cache.flush()
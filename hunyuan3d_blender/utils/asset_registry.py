@@ -0,0 +1,72 @@
+import bpy
+from bpy.types import Object
+
+
+# Custom property tagging the root object of an imported result with its asset ID.
+ASSET_ID_PROP = "h3d_asset_id"
+
+# asset_id -> name of a root object. A hint only: objects can be renamed or deleted,
+# so entries are checked on lookup and the file is scanned on a miss.
+imported_assets: dict[str, str] = {}
+
+
+def register_imported_asset(asset_id: str, root: Object) -> None:
+    root[ASSET_ID_PROP] = asset_id
+    imported_assets[asset_id] = root.name
+
+
+def find_imported_asset(asset_id: str) -> Object | None:
+    """Returns a root object of the asset already in the file, if any."""
+    name = imported_assets.get(asset_id)
+    obj = bpy.data.objects.get(name) if name else None
+    if obj is not None and obj.get(ASSET_ID_PROP) == asset_id:
+        return obj
+    imported_assets.pop(asset_id, None)
+    # Renamed, or imported before the file was reloaded.
+    for obj in bpy.data.objects:
+        if obj.get(ASSET_ID_PROP) == asset_id:
+            imported_assets[asset_id] = obj.name
+            return obj
+    return None
+
+
+def _copy_hierarchy(obj: Object, parent: Object | None, collection: bpy.types.Collection, deep_copy: bool) -> Object:
+    # Object.copy() keeps sharing the object data: a linked duplicate.
+    new_obj = obj.copy()
+    if deep_copy and obj.data is not None:
+        data = obj.data
+        lod = getattr(obj, "h3d_lod", None)
+        if lod is not None and len(lod.levels) > 0 and lod.levels[0].mesh is not None:
+            # The full resolution mesh, not the level of detail swapped in.
+            data = lod.levels[0].mesh
+        new_obj.data = data.copy()
+        # The level of detail chain would swap the copied mesh back to the shared ones.
+        if lod is not None:
+            new_obj.h3d_lod.levels.clear()
+            new_obj.h3d_lod.active_level = 0
+        for slot in new_obj.material_slots:
+            if slot.material is not None:
+                slot.material = slot.material.copy()
+    if parent is not None:
+        new_obj.parent = parent
+    collection.objects.link(new_obj)
+    for child in obj.children:
+        _copy_hierarchy(child, new_obj, collection, deep_copy)
+    return new_obj
+
+
+def instance_imported_asset(source: Object, deep_copy: bool = False) -> Object:
+    """Adds another instance of an imported asset at the 3D cursor, sharing mesh and
+    material data with `source`, or with copies of them if `deep_copy`."""
+    context = bpy.context
+    collection = context.view_layer.active_layer_collection.collection
+    root = _copy_hierarchy(source, None, collection, deep_copy)
+    root.parent = None
+    root.matrix_world = source.matrix_world.copy()
+    root.location = context.scene.cursor.location
+
+    for obj in context.view_layer.objects.selected:
+        obj.select_set(False)
+    root.select_set(True)
+    context.view_layer.objects.active = root
+    return root
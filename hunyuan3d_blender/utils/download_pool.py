@@ -0,0 +1,195 @@
+import heapq
+import shutil
+import itertools
+import threading
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+from typing import Callable, Optional
+
+
+# Lower value runs first.
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+
+@dataclass
+class DownloadWaiter:
+    key: str
+    filepath: str | None
+    on_complete: Optional[Callable[[bool, str | None], None]] = None
+
+
+@dataclass
+class DownloadJob:
+    url: str
+    host: str
+    priority: int
+    waiters: list[DownloadWaiter] = field(default_factory=list)
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    running: bool = False
+
+
+class DownloadPool:
+    """Bounded pool of download threads.
+
+    - Jobs run by priority (then FIFO), with at most `max_per_host` at once per host.
+    - Requests for a URL already queued or downloading attach to the existing job instead
+      of downloading it again; the file is copied to each extra destination once done.
+    - Requests can be cancelled by key; a job is cancelled once none of its requests remain.
+      A cancelled job stays registered until its worker exits: requesting its URL again
+      meanwhile attaches to it and restarts it afterwards, so two workers never write the
+      same partial file.
+
+    `download_func(url, filepath, progress_key, cancel_event)` does the transfer and
+    returns `(success, filepath)`. Completion callbacks run on the download threads.
+    """
+
+    def __init__(self, download_func: Callable, max_workers: int = 6, max_per_host: int = 3):
+        self.download_func = download_func
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self._condition = threading.Condition()
+        self._heap: list[tuple[int, int, DownloadJob]] = []
+        self._counter = itertools.count()
+        self._jobs_by_url: dict[str, DownloadJob] = {}
+        self._jobs_by_key: dict[str, DownloadJob] = {}
+        self._host_counts: dict[str, int] = {}
+        self._worker_count = 0
+        self._idle_workers = 0
+
+    # --- Public API. ---
+
+    def request(self, key: str, url: str, filepath: str | None = None, priority: int = PRIORITY_LOW,
+                on_complete: Optional[Callable[[bool, str | None], None]] = None) -> None:
+        waiter = DownloadWaiter(key, filepath, on_complete)
+        with self._condition:
+            job = self._jobs_by_url.get(url)
+            if job is None or (job.cancel_event.is_set() and not job.running):
+                job = DownloadJob(url, urlparse(url).netloc, priority)
+                self._jobs_by_url[url] = job
+                self._push(job)
+            elif job.running:
+                # Restarted with this priority if it was cancelled (see `_finish`).
+                job.priority = min(job.priority, priority)
+            elif priority < job.priority:
+                # Promote: the stale heap entry is skipped when popped.
+                job.priority = priority
+                self._push(job)
+            job.waiters.append(waiter)
+            self._jobs_by_key[key] = job
+            self._condition.notify()
+            self._ensure_workers()
+
+    def cancel(self, key: str) -> bool:
+        """Drops the request made with `key`. Returns False if there was none."""
+        with self._condition:
+            job = self._jobs_by_key.pop(key, None)
+            if job is None:
+                return False
+            job.waiters = [waiter for waiter in job.waiters if waiter.key != key]
+            if not job.waiters:
+                job.cancel_event.set()
+                if not job.running and self._jobs_by_url.get(job.url) is job:
+                    del self._jobs_by_url[job.url]
+            return True
+
+    def is_pending(self, key: str) -> bool:
+        with self._condition:
+            return key in self._jobs_by_key
+
+    def is_busy(self) -> bool:
+        with self._condition:
+            return len(self._jobs_by_url) > 0
+
+    # --- Internals. ---
+
+    def _push(self, job: DownloadJob) -> None:
+        heapq.heappush(self._heap, (job.priority, next(self._counter), job))
+
+    def _ensure_workers(self) -> None:
+        """Starts a worker unless one is idle or the pool is full. Caller holds the lock."""
+        if self._idle_workers == 0 and self._worker_count < self.max_workers:
+            self._worker_count += 1
+            threading.Thread(target=self._worker, name="h3d_download", daemon=True).start()
+
+    def _pop_runnable(self) -> DownloadJob | None:
+        """Pops the best job whose host has a free slot. Caller holds the lock."""
+        skipped = []
+        job = None
+        while self._heap:
+            priority, order, candidate = heapq.heappop(self._heap)
+            if candidate.cancel_event.is_set() or candidate.running or priority != candidate.priority:
+                continue  # Cancelled, already taken, or a stale entry.
+            if self._host_counts.get(candidate.host, 0) >= self.max_per_host:
+                skipped.append((priority, order, candidate))
+                continue
+            job = candidate
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return job
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                job = self._pop_runnable()
+                if job is None:
+                    if not self._heap:
+                        self._worker_count -= 1
+                        return
+                    # Everything left waits for a busy host.
+                    self._idle_workers += 1
+                    self._condition.wait(timeout=1.0)
+                    self._idle_workers -= 1
+                    continue
+                job.running = True
+                self._host_counts[job.host] = self._host_counts.get(job.host, 0) + 1
+                primary = job.waiters[0]
+
+            success, filepath = False, None
+            try:
+                success, filepath = self.download_func(job.url, primary.filepath, primary.key, job.cancel_event)
+            except Exception as e:
+                print(f"Error downloading {job.url}: {e}")
+
+            with self._condition:
+                self._host_counts[job.host] -= 1
+                waiters = self._finish(job, success)
+
+            for waiter in waiters:
+                waiter_success, waiter_filepath = success, filepath
+                if success and waiter.filepath and waiter.filepath != filepath:
+                    try:
+                        shutil.copyfile(filepath, waiter.filepath)
+                        waiter_filepath = waiter.filepath
+                    except OSError as e:
+                        print(f"Error copying download to {waiter.filepath}: {e}")
+                        waiter_success = False
+                if waiter.on_complete is not None:
+                    try:
+                        waiter.on_complete(waiter_success, waiter_filepath)
+                    except Exception as e:
+                        print(f"Error in download callback for '{waiter.key}': {e}")
+
+    def _finish(self, job: DownloadJob, success: bool) -> list[DownloadWaiter]:
+        """Unregisters a job its worker is done with and returns the waiters to notify.
+        Caller holds the lock."""
+        if not success and job.cancel_event.is_set() and job.waiters:
+            # Requested again while cancelled: restarted now that nothing writes the file.
+            retry = DownloadJob(job.url, job.host, job.priority, waiters=job.waiters)
+            self._jobs_by_url[job.url] = retry
+            for waiter in retry.waiters:
+                self._jobs_by_key[waiter.key] = retry
+            self._push(retry)
+            self._condition.notify_all()
+            self._ensure_workers()
+            return []
+
+        if self._jobs_by_url.get(job.url) is job:
+            del self._jobs_by_url[job.url]
+        waiters = list(job.waiters)
+        for waiter in waiters:
+            if self._jobs_by_key.get(waiter.key) is job:
+                del self._jobs_by_key[waiter.key]
+        self._condition.notify_all()
+        return waiters
@@ -0,0 +1,99 @@
+"""Index of the generations listed by the panel, kept between redraws: filtering and
+paginating only touches the generations of the page drawn."""
+import bpy
+from bpy.app.handlers import persistent
+from dataclasses import dataclass, field
+
+
+FILTER_ALL = "ALL"
+FILTER_FAVORITES = "FAV"
+
+
+@dataclass
+class GenerationIndex:
+    # Positions in `generation_details` (oldest first) of the generations shown in the UI.
+    order: list[int] = field(default_factory=list)
+    by_status: dict[str, list[int]] = field(default_factory=dict)
+    # With at least one favorite result.
+    favorites: list[int] = field(default_factory=list)
+
+
+generation_index: GenerationIndex | None = None
+# (scene properties pointer, generation count) the index was built for.
+generation_index_key = None
+
+
+def invalidate_generation_index(*args) -> None:
+    """Rebuilds the index on its next use. Call when generations are added, removed, or change
+    status, visibility or favorites. Takes (and ignores) property update arguments."""
+    global generation_index
+    generation_index = None
+
+
+def _build_generation_index(scn_h3d) -> GenerationIndex:
+    index = GenerationIndex()
+    for position, generation in enumerate(scn_h3d.generation_details):
+        if not generation.show_in_gen_ui:
+            continue
+        index.order.append(position)
+        index.by_status.setdefault(generation.status, []).append(position)
+        if any(result.fav for result in generation.result):
+            index.favorites.append(position)
+    return index
+
+
+def get_generation_index(scn_h3d) -> GenerationIndex:
+    global generation_index, generation_index_key
+    # The count also catches changes that missed an invalidation, like an undo.
+    key = (scn_h3d.as_pointer(), len(scn_h3d.generation_details))
+    if generation_index is None or generation_index_key != key:
+        generation_index = _build_generation_index(scn_h3d)
+        generation_index_key = key
+    return generation_index
+
+
+def get_filtered_positions(scn_h3d, wm_h3d) -> list[int]:
+    """Positions of the generations that pass the panel filter, oldest first."""
+    index = get_generation_index(scn_h3d)
+    filter_status = wm_h3d.ui_filter_generation_status
+    if filter_status == FILTER_ALL:
+        return index.order
+    if filter_status == FILTER_FAVORITES:
+        return index.favorites
+    return index.by_status.get(filter_status, [])
+
+
+def get_page_count(scn_h3d, wm_h3d) -> int:
+    """Pages of filtered generations, at least one (maybe empty)."""
+    page_size = wm_h3d.ui_filter_generation_page_size
+    return max(1, -(-len(get_filtered_positions(scn_h3d, wm_h3d)) // page_size))
+
+
+def get_page_generations(scn_h3d, wm_h3d, page_index: int) -> list:
+    """Generations of a page, in the order the panel lists them: newest first, unless inverted."""
+    positions = get_filtered_positions(scn_h3d, wm_h3d)
+    page_size = wm_h3d.ui_filter_generation_page_size
+    if wm_h3d.ui_filter_generation_page_order_invert:
+        page_positions = positions[page_index * page_size:(page_index + 1) * page_size]
+    else:
+        end = max(0, len(positions) - page_index * page_size)
+        page_positions = reversed(positions[max(0, end - page_size):end])
+    generation_details = scn_h3d.generation_details
+    return [generation_details[position] for position in page_positions]
+
+
+@persistent
+def _on_file_change(*args):
+    invalidate_generation_index()
+
+
+def register():
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(_on_file_change)
+
+
+def unregister():
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _on_file_change in handlers:
+            handlers.remove(_on_file_change)
+    invalidate_generation_index()
@@ -0,0 +1,540 @@
+"""Minimal GLB (binary glTF 2.0) reader, producing NumPy arrays ready for Blender.
+
+Pure Python + NumPy, no `bpy`: safe to run on worker threads. Geometry is converted to
+Blender's axes (Z up) and to Blender's UV convention. Embedded images are extracted as
+files, not decoded, so Blender can load them lazily like its own glTF importer does.
+
+Files are memory-mapped and accessors are NumPy views over the mapping, so only the
+pages actually read are loaded: `inspect_glb` gets bounds and counts from the JSON
+chunk alone.
+"""
+import os
+import json
+import mmap
+import base64
+import struct
+import tempfile
+import numpy as np
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any
+
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+COMPONENT_DTYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+MODE_TRIANGLES = 4
+
+MIME_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp"}
+
+# glTF is Y up, Blender is Z up: (x, y, z) -> (x, -z, y).
+AXIS_CONVERSION = np.array([[1, 0, 0], [0, 0, -1], [0, 1, 0]], dtype=np.float32)
+
+# Extensions the import handles. Files using any other one go through Blender's glTF importer,
+# even when it's optional: ignoring it would import wrong UVs, emission, etc.
+SUPPORTED_EXTENSIONS = {"EXT_texture_webp"}
+
+
+class GLBError(Exception):
+    """Raised for files that aren't valid GLB."""
+
+
+class GLBUnsupportedError(GLBError):
+    """Raised for valid files using features this reader doesn't handle (Draco, sparse accessors...)."""
+
+
+@dataclass
+class GLBImage:
+    name: str
+    # Extracted encoded file (PNG/JPEG/WebP), owned by the caller once parsed.
+    filepath: str
+    non_color: bool = False
+
+
+@dataclass
+class GLBMaterial:
+    name: str
+    base_color_factor: tuple[float, float, float, float] = (1.0, 1.0, 1.0, 1.0)
+    metallic_factor: float = 1.0
+    roughness_factor: float = 1.0
+    emissive_factor: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    alpha_mode: str = "OPAQUE"
+    alpha_cutoff: float = 0.5
+    double_sided: bool = False
+    # Image indices, or None.
+    base_color_image: int | None = None
+    metallic_roughness_image: int | None = None
+    normal_image: int | None = None
+    normal_scale: float = 1.0
+    occlusion_image: int | None = None
+    emissive_image: int | None = None
+
+
+@dataclass
+class GLBMesh:
+    name: str
+    positions: np.ndarray  # (n, 3) float32
+    triangles: np.ndarray  # (m, 3) uint32
+    normals: np.ndarray | None = None  # (n, 3) float32
+    uvs: np.ndarray | None = None  # (n, 2) float32
+    material_indices: np.ndarray | None = None  # (m,) int32, into `materials`
+    # glTF material index of each material slot (None: no material).
+    materials: list[int | None] = field(default_factory=list)
+
+    @property
+    def face_count(self) -> int:
+        return len(self.triangles)
+
+
+@dataclass
+class GLBObject:
+    name: str
+    mesh: int
+    # World matrix in Blender axes, row-major 4x4.
+    matrix: np.ndarray
+
+
+@dataclass
+class GLBLevel:
+    """Reduced copy of a scene's meshes and images, for a level of detail."""
+    ratio: float
+    # Aligned with `GLBScene.meshes` and `GLBScene.images`.
+    meshes: list[GLBMesh] = field(default_factory=list)
+    images: list[GLBImage] = field(default_factory=list)
+
+
+@dataclass
+class GLBScene:
+    filepath: str
+    images: list[GLBImage] = field(default_factory=list)
+    materials: list[GLBMaterial] = field(default_factory=list)
+    meshes: list[GLBMesh] = field(default_factory=list)
+    objects: list[GLBObject] = field(default_factory=list)
+    lods: list[GLBLevel] = field(default_factory=list)
+
+    def cleanup(self) -> None:
+        """Removes the extracted image files."""
+        for image in self.images + [image for level in self.lods for image in level.images]:
+            try:
+                os.remove(image.filepath)
+            except OSError:
+                pass
+
+
+@dataclass
+class GLBInfo:
+    vertex_count: int
+    face_count: int
+    mesh_count: int
+    material_count: int
+    # World bounds in Blender axes, None for files without geometry.
+    bbox_min: tuple[float, float, float] | None
+    bbox_max: tuple[float, float, float] | None
+    # (width, height) of each image, None where the header couldn't be read.
+    image_sizes: list[tuple[int, int] | None]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "vertex_count": self.vertex_count,
+            "face_count": self.face_count,
+            "mesh_count": self.mesh_count,
+            "material_count": self.material_count,
+            "bbox_min": self.bbox_min,
+            "bbox_max": self.bbox_max,
+            "image_sizes": self.image_sizes,
+        }
+
+
+def read_glb_chunks(data) -> tuple[dict[str, Any], memoryview]:
+    """Splits GLB data into its JSON document and its binary chunk."""
+    view = memoryview(data)
+    if len(view) < 20:
+        raise GLBError("File too small to be a GLB")
+    magic, version, length = struct.unpack_from('<III', view, 0)
+    if magic != GLB_MAGIC:
+        raise GLBError("Not a GLB file")
+    if version != 2:
+        raise GLBUnsupportedError(f"Unsupported glTF version {version}")
+
+    gltf = None
+    binary = memoryview(b"")
+    offset = 12
+    while offset + 8 <= min(length, len(view)):
+        chunk_length, chunk_type = struct.unpack_from('<II', view, offset)
+        chunk = view[offset + 8:offset + 8 + chunk_length]
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(bytes(chunk))
+        elif chunk_type == CHUNK_BIN and len(binary) == 0:
+            binary = chunk
+        offset += 8 + chunk_length
+    if gltf is None:
+        raise GLBError("GLB has no JSON chunk")
+    return gltf, binary
+
+
+class GLBFile:
+    """Read-only, memory-mapped GLB file.
+
+    `gltf` is the parsed JSON chunk and `binary` a view of the BIN chunk over the mapping.
+    Arrays from `accessor` are views too: copy what must outlive `close`.
+    """
+
+    def __init__(self, filepath: str | Path):
+        self.filepath = Path(filepath)
+        self._file = self.filepath.open('rb')
+        try:
+            if os.fstat(self._file.fileno()).st_size < 20:
+                raise GLBError("File too small to be a GLB")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.gltf, self.binary = read_glb_chunks(self._mmap)
+        except Exception:
+            self._file.close()
+            raise
+
+    def accessor(self, index: int) -> np.ndarray:
+        return read_accessor(self.gltf, self.binary, index)
+
+    def close(self) -> None:
+        try:
+            self.binary.release()
+            self._mmap.close()
+        except BufferError:
+            # Views still in use: the mapping closes once they are garbage collected.
+            pass
+        self._file.close()
+
+    def __enter__(self) -> "GLBFile":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def read_accessor(gltf: dict[str, Any], binary: memoryview, index: int) -> np.ndarray:
+    """Returns the accessor as a (count, components) array.
+
+    Tightly packed data is a view of `binary`; interleaved data (byteStride) is a strided
+    view. Normalized integer data is converted to float32.
+    """
+    accessor = gltf["accessors"][index]
+    if "sparse" in accessor:
+        raise GLBUnsupportedError("Sparse accessors are not supported")
+    dtype = np.dtype(COMPONENT_DTYPES[accessor["componentType"]]).newbyteorder('<')
+    components = TYPE_SIZES[accessor["type"]]
+    count = accessor["count"]
+    if "bufferView" not in accessor:
+        return np.zeros((count, components), dtype=dtype)
+
+    buffer_view = gltf["bufferViews"][accessor["bufferView"]]
+    if buffer_view.get("buffer", 0) != 0:
+        raise GLBUnsupportedError("External buffers are not supported")
+    offset = buffer_view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    element_size = dtype.itemsize * components
+    stride = buffer_view.get("byteStride") or element_size
+    if count > 0 and offset + stride * (count - 1) + element_size > len(binary):
+        raise GLBError(f"Accessor {index} is out of the buffer bounds")
+
+    if stride == element_size:
+        array = np.frombuffer(binary, dtype=dtype, count=count * components, offset=offset).reshape(count, components)
+    else:
+        array = np.ndarray((count, components), dtype=dtype, buffer=binary, offset=offset, strides=(stride, dtype.itemsize))
+
+    if accessor.get("normalized") and dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        array = np.maximum(array.astype(np.float32) / info.max, -1.0)
+    return array
+
+
+def _get_node_matrix(node: dict[str, Any]) -> np.ndarray:
+    if "matrix" in node:
+        # glTF matrices are column-major.
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    rotation = np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+    matrix = np.identity(4)
+    matrix[:3, :3] = rotation * np.array(node.get("scale", (1.0, 1.0, 1.0)))
+    matrix[:3, 3] = node.get("translation", (0.0, 0.0, 0.0))
+    return matrix
+
+
+def _iter_mesh_nodes(gltf: dict[str, Any]):
+    """Yields (node, world matrix in glTF axes) for nodes with a mesh, in the default scene."""
+    nodes = gltf.get("nodes", [])
+    scenes = gltf.get("scenes", [])
+    if scenes:
+        roots = scenes[gltf.get("scene", 0)].get("nodes", [])
+    else:
+        roots = range(len(nodes))
+    stack = [(index, np.identity(4)) for index in reversed(roots)]
+    while stack:
+        index, parent_matrix = stack.pop()
+        node = nodes[index]
+        matrix = parent_matrix @ _get_node_matrix(node)
+        if "mesh" in node:
+            yield node, matrix
+        stack.extend((child, matrix) for child in reversed(node.get("children", [])))
+
+
+def _read_mesh(gltf: dict[str, Any], binary: memoryview, index: int) -> GLBMesh:
+    mesh = gltf["meshes"][index]
+    positions, normals, uvs, triangles, material_indices = [], [], [], [], []
+    materials: list[int | None] = []
+    vertex_offset = 0
+    for primitive in mesh.get("primitives", []):
+        if primitive.get("mode", MODE_TRIANGLES) != MODE_TRIANGLES:
+            raise GLBUnsupportedError("Only triangle primitives are supported")
+        attributes = primitive.get("attributes", {})
+        if "POSITION" not in attributes:
+            continue
+        primitive_positions = read_accessor(gltf, binary, attributes["POSITION"])
+        count = len(primitive_positions)
+        positions.append(primitive_positions)
+        normals.append(read_accessor(gltf, binary, attributes["NORMAL"]) if "NORMAL" in attributes else None)
+        uvs.append(read_accessor(gltf, binary, attributes["TEXCOORD_0"]) if "TEXCOORD_0" in attributes else None)
+
+        if "indices" in primitive:
+            primitive_triangles = read_accessor(gltf, binary, primitive["indices"]).reshape(-1, 3)
+        else:
+            primitive_triangles = np.arange(count, dtype=np.uint32).reshape(-1, 3)
+        triangles.append(primitive_triangles.astype(np.uint32) + vertex_offset)
+        vertex_offset += count
+
+        material = primitive.get("material")
+        if material not in materials:
+            materials.append(material)
+        material_indices.append(np.full(len(primitive_triangles), materials.index(material), dtype=np.int32))
+
+    if not positions:
+        raise GLBError(f"Mesh {index} has no geometry")
+
+    result = GLBMesh(
+        name=mesh.get("name") or f"Mesh_{index}",
+        positions=np.concatenate(positions).astype(np.float32) @ AXIS_CONVERSION.T,
+        triangles=np.concatenate(triangles),
+        material_indices=np.concatenate(material_indices),
+        materials=materials,
+    )
+    if all(array is not None for array in normals):
+        result.normals = np.concatenate(normals).astype(np.float32) @ AXIS_CONVERSION.T
+    if any(array is not None for array in uvs):
+        result.uvs = np.concatenate([
+            array if array is not None else np.zeros((len(primitive_positions), 2), dtype=np.float32)
+            for array, primitive_positions in zip(uvs, positions)
+        ]).astype(np.float32)
+        # glTF V goes down from the top of the image, Blender's goes up.
+        result.uvs[:, 1] = 1.0 - result.uvs[:, 1]
+    return result
+
+
+def _get_texture_image(gltf: dict[str, Any], texture_info: dict[str, Any] | None) -> int | None:
+    if texture_info is None:
+        return None
+    texture = gltf.get("textures", [])[texture_info["index"]]
+    source = texture.get("source")
+    if source is None:
+        source = texture.get("extensions", {}).get("EXT_texture_webp", {}).get("source")
+    return source
+
+
+def _read_material(gltf: dict[str, Any], index: int) -> GLBMaterial:
+    material = gltf["materials"][index]
+    if material.get("alphaMode") == "MASK":
+        raise GLBUnsupportedError("Alpha mask materials are not supported")
+    pbr = material.get("pbrMetallicRoughness", {})
+    normal_texture = material.get("normalTexture")
+    return GLBMaterial(
+        name=material.get("name") or f"Material_{index}",
+        base_color_factor=tuple(pbr.get("baseColorFactor", (1.0, 1.0, 1.0, 1.0))),
+        metallic_factor=pbr.get("metallicFactor", 1.0),
+        roughness_factor=pbr.get("roughnessFactor", 1.0),
+        emissive_factor=tuple(material.get("emissiveFactor", (0.0, 0.0, 0.0))),
+        alpha_mode=material.get("alphaMode", "OPAQUE"),
+        alpha_cutoff=material.get("alphaCutoff", 0.5),
+        double_sided=material.get("doubleSided", False),
+        base_color_image=_get_texture_image(gltf, pbr.get("baseColorTexture")),
+        metallic_roughness_image=_get_texture_image(gltf, pbr.get("metallicRoughnessTexture")),
+        normal_image=_get_texture_image(gltf, normal_texture),
+        normal_scale=normal_texture.get("scale", 1.0) if normal_texture else 1.0,
+        occlusion_image=_get_texture_image(gltf, material.get("occlusionTexture")),
+        emissive_image=_get_texture_image(gltf, material.get("emissiveTexture")),
+    )
+
+
+def _extract_image(gltf: dict[str, Any], binary: memoryview, index: int, glb_filepath: Path, dirpath: str) -> GLBImage:
+    image = gltf["images"][index]
+    name = image.get("name") or f"{glb_filepath.stem}_{index}"
+    mime_type = image.get("mimeType", "image/png")
+    if "bufferView" in image:
+        buffer_view = gltf["bufferViews"][image["bufferView"]]
+        offset = buffer_view.get("byteOffset", 0)
+        data = binary[offset:offset + buffer_view["byteLength"]]
+    elif image.get("uri", "").startswith("data:"):
+        header, _, encoded = image["uri"].partition(",")
+        mime_type = header[5:].split(';')[0] or mime_type
+        data = base64.b64decode(encoded)
+    elif "uri" in image:
+        data = (glb_filepath.parent / image["uri"]).read_bytes()
+    else:
+        raise GLBError(f"Image {index} has no data")
+
+    fd, filepath = tempfile.mkstemp(prefix=f"{name}_", suffix=MIME_EXTENSIONS.get(mime_type, ".png"), dir=dirpath)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    return GLBImage(name=name, filepath=filepath)
+
+
+def _read_image_size(data: memoryview) -> tuple[int, int] | None:
+    """Width and height from a PNG or JPEG header, without decoding the image."""
+    if len(data) >= 24 and bytes(data[:8]) == b"\x89PNG\r\n\x1a\n":
+        width, height = struct.unpack_from('>II', data, 16)
+        return width, height
+    if len(data) >= 4 and bytes(data[:2]) == b"\xff\xd8":
+        offset = 2
+        while offset + 9 <= len(data):
+            if data[offset] != 0xFF:
+                return None
+            marker = data[offset + 1]
+            segment_length = struct.unpack_from('>H', data, offset + 2)[0]
+            # Start of frame markers, except DHT, JPG and DAC.
+            if 0xC0 <= marker <= 0xCF and marker not in {0xC4, 0xC8, 0xCC}:
+                height, width = struct.unpack_from('>HH', data, offset + 5)
+                return width, height
+            offset += 2 + segment_length
+    return None
+
+
+def inspect_glb(filepath: str | Path) -> GLBInfo:
+    """Counts and world bounds of a GLB, read from its JSON chunk and accessor bounds.
+
+    Only touches the JSON chunk and image headers; positions are read only when their
+    accessor has no min/max (which the spec requires).
+    """
+    with GLBFile(filepath) as glb:
+        gltf = glb.gltf
+        accessors = gltf.get("accessors", [])
+        conversion = np.identity(4)
+        conversion[:3, :3] = AXIS_CONVERSION
+
+        vertex_count = face_count = 0
+        corners = []
+        mesh_indices = set()
+        for node, matrix in _iter_mesh_nodes(gltf):
+            mesh_indices.add(node["mesh"])
+            for primitive in gltf["meshes"][node["mesh"]].get("primitives", []):
+                position_index = primitive.get("attributes", {}).get("POSITION")
+                if position_index is None:
+                    continue
+                accessor = accessors[position_index]
+                vertex_count += accessor["count"]
+                if "indices" in primitive:
+                    face_count += accessors[primitive["indices"]]["count"] // 3
+                else:
+                    face_count += accessor["count"] // 3
+                if "min" in accessor and "max" in accessor:
+                    bounds = np.array([accessor["min"], accessor["max"]], dtype=np.float64)
+                else:
+                    positions = glb.accessor(position_index)
+                    bounds = np.array([positions.min(axis=0), positions.max(axis=0)], dtype=np.float64)
+                    del positions
+                box = np.array([[x, y, z, 1.0] for x in bounds[:, 0] for y in bounds[:, 1] for z in bounds[:, 2]])
+                corners.append(box @ (conversion @ matrix).T)
+
+        image_sizes = []
+        for image in gltf.get("images", []):
+            size = None
+            if "bufferView" in image:
+                buffer_view = gltf["bufferViews"][image["bufferView"]]
+                offset = buffer_view.get("byteOffset", 0)
+                # Headers are small; SOF markers may follow JPEG metadata.
+                header = glb.binary[offset:offset + min(buffer_view["byteLength"], 64 * 1024)]
+                size = _read_image_size(header)
+                header.release()
+            image_sizes.append(size)
+
+        bbox_min = bbox_max = None
+        if corners:
+            points = np.concatenate(corners)[:, :3]
+            bbox_min = tuple(points.min(axis=0).tolist())
+            bbox_max = tuple(points.max(axis=0).tolist())
+        return GLBInfo(
+            vertex_count=vertex_count,
+            face_count=face_count,
+            mesh_count=len(mesh_indices),
+            material_count=len(gltf.get("materials", [])),
+            bbox_min=bbox_min,
+            bbox_max=bbox_max,
+            image_sizes=image_sizes,
+        )
+
+
+def parse_glb(filepath: str | Path, images_dirpath: str | None = None) -> GLBScene:
+    """Reads a GLB file into a `GLBScene`. Embedded images are written to `images_dirpath`
+    (the system temp dir by default); call `GLBScene.cleanup` once they are loaded."""
+    filepath = Path(filepath)
+    with GLBFile(filepath) as glb:
+        return _parse_glb(filepath, glb.gltf, glb.binary, images_dirpath)
+
+
+def _parse_glb(filepath: Path, gltf: dict[str, Any], binary: memoryview, images_dirpath: str | None) -> GLBScene:
+
+    extensions = set(gltf.get("extensionsRequired", [])) | set(gltf.get("extensionsUsed", []))
+    unsupported = extensions - SUPPORTED_EXTENSIONS
+    if unsupported:
+        raise GLBUnsupportedError(f"Unsupported glTF extensions: {', '.join(sorted(unsupported))}")
+
+    scene = GLBScene(filepath=str(filepath))
+    mesh_indices: dict[int, int] = {}
+    for node, matrix in _iter_mesh_nodes(gltf):
+        if node["mesh"] not in mesh_indices:
+            mesh_indices[node["mesh"]] = len(scene.meshes)
+            scene.meshes.append(_read_mesh(gltf, binary, node["mesh"]))
+        conversion = np.identity(4)
+        conversion[:3, :3] = AXIS_CONVERSION
+        scene.objects.append(GLBObject(
+            name=node.get("name") or scene.meshes[mesh_indices[node["mesh"]]].name,
+            mesh=mesh_indices[node["mesh"]],
+            matrix=conversion @ matrix @ conversion.T,
+        ))
+
+    used_materials = {index for mesh in scene.meshes for index in mesh.materials if index is not None}
+    scene.materials = [_read_material(gltf, index) for index in range(len(gltf.get("materials", [])))]
+
+    non_color_images = set()
+    used_images = set()
+    for index in used_materials:
+        material = scene.materials[index]
+        for image_index in (material.base_color_image, material.emissive_image):
+            if image_index is not None:
+                used_images.add(image_index)
+        for image_index in (material.metallic_roughness_image, material.normal_image, material.occlusion_image):
+            if image_index is not None:
+                used_images.add(image_index)
+                non_color_images.add(image_index)
+
+    images_dirpath = images_dirpath or tempfile.gettempdir()
+    try:
+        for index in range(len(gltf.get("images", []))):
+            if index in used_images:
+                image = _extract_image(gltf, binary, index, filepath, images_dirpath)
+                image.non_color = index in non_color_images
+            else:
+                image = GLBImage(name=f"{filepath.stem}_{index}", filepath="")
+            scene.images.append(image)
+    except Exception:
+        scene.cleanup()
+        raise
+    return scene
@@ -0,0 +1,305 @@
+import bpy
+import time
+import numpy as np
+from mathutils import Matrix
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+
+from .glb import parse_glb, GLBScene, GLBMesh, GLBMaterial, GLBUnsupportedError
+from .lod import build_lods
+from .lod_switch import update_scene_lods, ensure_lod_switch_timer
+from .timer_manager import TimerManager
+
+
+MAX_PARSE_WORKERS = 2
+# Main-thread time spent building per timer tick, in seconds.
+SLICE_BUDGET = 0.008
+TIMER_INTERVAL = 0.01
+
+timer_id = "glb_import_timer"
+executor = None
+# (name, filepath, GLBScene | None, error, on_complete) parsed by the workers, waiting to be built.
+parsed_queue = deque()
+# Number of requested imports not yet taken from `parsed_queue`. Main thread only.
+pending_parses = 0
+# Generators building the current import, one step per `next()`.
+active_builds = deque()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=MAX_PARSE_WORKERS, thread_name_prefix="h3d_glb_parse")
+    return executor
+
+
+def _parse(name: str, filepath: str, on_complete, lod_ratios: tuple[float, ...]):
+    try:
+        scene = parse_glb(filepath)
+    except Exception as e:
+        parsed_queue.append((name, filepath, None, e, on_complete))
+        return
+    if lod_ratios:
+        try:
+            build_lods(scene, lod_ratios)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not build levels of detail for '{name}': {e}")
+    parsed_queue.append((name, filepath, scene, None, on_complete))
+
+
+# --- Main-thread building. ---
+
+def _build_image(glb_image) -> bpy.types.Image:
+    # Loaded lazily from the extracted file and packed as-is, like the glTF importer does.
+    image = bpy.data.images.load(glb_image.filepath)
+    image.name = glb_image.name
+    if glb_image.non_color:
+        image.colorspace_settings.name = 'Non-Color'
+    image.pack()
+    return image
+
+
+def _build_material(glb_material: GLBMaterial, images: list) -> bpy.types.Material:
+    material = bpy.data.materials.new(glb_material.name)
+    if material.node_tree is None:
+        material.use_nodes = True
+    material.use_backface_culling = not glb_material.double_sided
+    if glb_material.alpha_mode == "BLEND":
+        material.surface_render_method = 'BLENDED'
+
+    node_tree = material.node_tree
+    nodes, links = node_tree.nodes, node_tree.links
+    bsdf = next((node for node in nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    if bsdf is None:
+        nodes.clear()
+        bsdf = nodes.new('ShaderNodeBsdfPrincipled')
+        output = nodes.new('ShaderNodeOutputMaterial')
+        output.location = (300, 0)
+        links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+
+    def add_texture(image_index: int | None, y: float):
+        if image_index is None or images[image_index] is None:
+            return None
+        node = nodes.new('ShaderNodeTexImage')
+        node.image = images[image_index]
+        node.location = (-700, y)
+        return node
+
+    bsdf.inputs['Base Color'].default_value = glb_material.base_color_factor
+    bsdf.inputs['Alpha'].default_value = glb_material.base_color_factor[3]
+    if base_color := add_texture(glb_material.base_color_image, 300):
+        links.new(base_color.outputs['Color'], bsdf.inputs['Base Color'])
+        if glb_material.alpha_mode != "OPAQUE":
+            links.new(base_color.outputs['Alpha'], bsdf.inputs['Alpha'])
+
+    bsdf.inputs['Metallic'].default_value = glb_material.metallic_factor
+    bsdf.inputs['Roughness'].default_value = glb_material.roughness_factor
+    if metallic_roughness := add_texture(glb_material.metallic_roughness_image, 0):
+        separate = nodes.new('ShaderNodeSeparateColor')
+        separate.location = (-350, 0)
+        links.new(metallic_roughness.outputs['Color'], separate.inputs['Color'])
+        links.new(separate.outputs['Green'], bsdf.inputs['Roughness'])
+        links.new(separate.outputs['Blue'], bsdf.inputs['Metallic'])
+
+    if normal := add_texture(glb_material.normal_image, -300):
+        normal_map = nodes.new('ShaderNodeNormalMap')
+        normal_map.location = (-350, -300)
+        normal_map.inputs['Strength'].default_value = glb_material.normal_scale
+        links.new(normal.outputs['Color'], normal_map.inputs['Color'])
+        links.new(normal_map.outputs['Normal'], bsdf.inputs['Normal'])
+
+    if emissive := add_texture(glb_material.emissive_image, -600):
+        links.new(emissive.outputs['Color'], bsdf.inputs['Emission Color'])
+        bsdf.inputs['Emission Strength'].default_value = 1.0
+    elif any(glb_material.emissive_factor):
+        bsdf.inputs['Emission Color'].default_value = (*glb_material.emissive_factor, 1.0)
+        bsdf.inputs['Emission Strength'].default_value = 1.0
+    return material
+
+
+def _build_mesh(glb_mesh: GLBMesh, materials: list) -> Iterator[bpy.types.Mesh | None]:
+    """Builds the mesh with bulk `foreach_set` calls, yielding between them. Yields the mesh last."""
+    mesh = bpy.data.meshes.new(glb_mesh.name)
+    vertex_count = len(glb_mesh.positions)
+    face_count = glb_mesh.face_count
+    loop_vertices = glb_mesh.triangles.ravel().astype(np.int32)
+
+    mesh.vertices.add(vertex_count)
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(glb_mesh.positions, dtype=np.float32).ravel())
+    yield None
+
+    mesh.loops.add(face_count * 3)
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * 3, 3, dtype=np.int32))
+    yield None
+
+    for material_index in glb_mesh.materials:
+        mesh.materials.append(materials[material_index] if material_index is not None else None)
+    if len(glb_mesh.materials) > 1:
+        mesh.polygons.foreach_set("material_index", glb_mesh.material_indices)
+
+    if glb_mesh.uvs is not None:
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        uv_layer.uv.foreach_set("vector", np.ascontiguousarray(glb_mesh.uvs[loop_vertices], dtype=np.float32).ravel())
+    yield None
+
+    mesh.update(calc_edges=True)
+    mesh.validate(clean_customdata=False)
+    yield None
+
+    if glb_mesh.normals is not None:
+        mesh.shade_smooth()
+        mesh.normals_split_custom_set_from_vertices(np.ascontiguousarray(glb_mesh.normals, dtype=np.float32))
+    else:
+        # glTF meshes without normals are flat shaded.
+        mesh.shade_flat()
+    yield mesh
+
+
+def _get_target_collection() -> bpy.types.Collection:
+    try:
+        return bpy.context.view_layer.active_layer_collection.collection
+    except AttributeError:
+        return bpy.context.scene.collection
+
+
+def _build_scene(name: str, scene: GLBScene, on_complete: Optional[Callable]) -> Iterator[None]:
+    """Creates the datablocks of a parsed GLB, a few at a time."""
+    # Images by extracted file, as levels of detail may reuse full resolution images.
+    images_by_filepath = {}
+    # Per level (0: full resolution): images, materials and meshes.
+    level_meshes = []
+    levels = [(scene.images, scene.meshes, "")]
+    levels += [(level.images, level.meshes, f"_LOD{index}") for index, level in enumerate(scene.lods, start=1)]
+    try:
+        materials = []
+        for glb_images, glb_meshes, suffix in levels:
+            images = []
+            has_new_images = False
+            for glb_image in glb_images:
+                if glb_image.filepath and glb_image.filepath not in images_by_filepath:
+                    images_by_filepath[glb_image.filepath] = _build_image(glb_image)
+                    has_new_images = True
+                    yield
+                images.append(images_by_filepath.get(glb_image.filepath))
+
+            if not materials or has_new_images:
+                # Full resolution, or a level with its own (downsampled) images.
+                materials = []
+                for glb_material in scene.materials:
+                    material = _build_material(glb_material, images)
+                    material.name += suffix
+                    materials.append(material)
+                    yield
+
+            meshes = []
+            for glb_mesh in glb_meshes:
+                for mesh in _build_mesh(glb_mesh, materials):
+                    if mesh is not None:
+                        mesh.name += suffix
+                        meshes.append(mesh)
+                    yield
+            level_meshes.append(meshes)
+    finally:
+        scene.cleanup()
+    meshes = level_meshes[0]
+
+    collection = _get_target_collection()
+    objects = []
+    for glb_object in scene.objects:
+        obj = bpy.data.objects.new(glb_object.name, meshes[glb_object.mesh])
+        obj.matrix_world = Matrix(glb_object.matrix.tolist())
+        if len(level_meshes) > 1:
+            for level, ratio in zip(level_meshes, [1.0] + [level.ratio for level in scene.lods]):
+                lod_level = obj.h3d_lod.levels.add()
+                lod_level.mesh = level[glb_object.mesh]
+                lod_level.ratio = ratio
+        collection.objects.link(obj)
+        objects.append(obj)
+
+    if len(objects) == 1:
+        root = objects[0]
+        root.name = name
+    else:
+        root = bpy.data.objects.new(name, None)
+        collection.objects.link(root)
+        for obj in objects:
+            obj.parent = root
+
+    if len(level_meshes) > 1:
+        update_scene_lods(bpy.context.scene)
+        if bpy.context.scene.h3d.lod_mode == 'DISTANCE':
+            ensure_lod_switch_timer()
+
+    view_layer = bpy.context.view_layer
+    for obj in view_layer.objects.selected:
+        obj.select_set(False)
+    for obj in (root, *objects):
+        obj.select_set(True)
+    view_layer.objects.active = root
+    print(f"Imported GLB '{name}' from {scene.filepath}")
+    if on_complete is not None:
+        on_complete(root)
+
+
+def _fallback_import(name: str, filepath: str, on_complete: Optional[Callable]) -> None:
+    bpy.ops.import_scene.gltf(filepath=filepath)
+    root = bpy.context.active_object
+    if root is not None:
+        root.name = name
+    if on_complete is not None:
+        on_complete(root)
+
+
+def glb_import_timer():
+    global pending_parses
+    start = time.perf_counter()
+    while time.perf_counter() - start < SLICE_BUDGET:
+        if not active_builds:
+            if not parsed_queue:
+                break
+            name, filepath, scene, error, on_complete = parsed_queue.popleft()
+            pending_parses -= 1
+            if scene is None:
+                if isinstance(error, GLBUnsupportedError):
+                    print(f"⚠️  Warning: {error}, using the glTF importer for '{name}'")
+                    _fallback_import(name, filepath, on_complete)
+                else:
+                    print(f"❌ Error reading GLB {filepath}: {error}")
+                continue
+            active_builds.append(_build_scene(name, scene, on_complete))
+
+        try:
+            next(active_builds[0])
+        except StopIteration:
+            active_builds.popleft()
+        except Exception as e:
+            print(f"❌ Error building GLB: {e}")
+            active_builds.popleft()
+
+    if pending_parses <= 0 and not active_builds:
+        return None
+    return TIMER_INTERVAL
+
+
+def request_glb_import(name: str, filepath: str, on_complete: Optional[Callable[[bpy.types.Object | None], None]] = None,
+                       lod_ratios: tuple[float, ...] = ()) -> None:
+    """Imports a GLB without blocking the UI: parsed on a worker thread, then built on the
+    main thread in small steps. `on_complete` gets the root object once built.
+
+    With `lod_ratios`, objects also get a chain of decimated meshes (see `lod_switch`).
+    """
+    global pending_parses
+    pending_parses += 1
+    _get_executor().submit(_parse, name, filepath, on_complete, lod_ratios)
+    if not TimerManager.exists(timer_id):
+        TimerManager.add(timer_id, glb_import_timer, first_interval=TIMER_INTERVAL)
+
+
+def unregister():
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
@@ -1,196 +1,509 @@
 import bpy
 import imageio.v3 as iio  # Use modern imageio.v3 API
 import numpy as np
+import requests
+import os
 import threading
+import itertools
+import heapq
+import hashlib
 from collections import deque
+from dataclasses import dataclass, field
 import time
 from typing import Callable, Optional
 
 from .timer_manager import TimerManager
+from .asset_cache import get_thumbnail_cache
+from .image_encode import PILImage, downscale_pixels
+
+
+# Las imágenes de la página mostrada van antes que las precargadas de la siguiente.
+PRIORITY_VISIBLE = 0
+PRIORITY_PREFETCH = 1
+DEFAULT_MAX_WORKERS = 6
+TIMER_INTERVAL = 0.1
+REQUEST_TIMEOUT = 30
+# Tiempo del hilo principal por tick del temporizador para aplicar imágenes cargadas; el resto espera al siguiente.
+UPLOAD_BUDGET = 0.008
+UPLOAD_INTERVAL = 0.01
+
+THUMBNAIL_KIND = "png"
+# Lado mayor de las miniaturas, en píxeles: más o menos la vista previa más grande del panel
+# (escala 12 x 20 px). Las imágenes a resolución completa solo se descargan al guardar un resultado.
+DEFAULT_THUMBNAIL_SIZE = 256
+# Las miniaturas en caché se muestran enseguida y, pasada esta antigüedad, se revalidan en segundo plano.
+REVALIDATE_AFTER = 24 * 60 * 60
+
+# Filas y columnas muestreadas para buscar los límites del contenido (ver `get_content_bounds`).
+BBOX_SAMPLE_STEP = 4
+# Filas por bloque al revisar la máscara a resolución completa (ver `_region_bounds`).
+BBOX_BLOCK_ROWS = 256
+WHITE_RGB = 0x00FFFFFF
+
+
+@dataclass
+class LoadRequest:
+    """Una descarga de una URL, compartida por todos los id de imagen pedidos a ella mientras está en curso."""
+    url: str
+    # Menor primero; None cuando un hilo de trabajo ya la tomó.
+    priority: int | None
+    ids: list[str] = field(default_factory=list)
+    # (id, on_complete_callback, on_error_callback), ejecutados al cargar la imagen.
+    callbacks: list[tuple] = field(default_factory=list)
+
+
+# Montículo de (prioridad, orden, petición) esperando un hilo de trabajo.
+process_queue = []
+# (petición, ruta de la miniatura | None, píxeles del icono | None) obtenidos por los hilos de trabajo.
+# Los píxeles del icono son (ancho, alto, búfer float32) listos para `foreach_set`.
+processed_queue = deque()
+queue_lock = threading.Lock()
+queue_order = itertools.count()
+max_workers = DEFAULT_MAX_WORKERS
+thumbnail_max_size = DEFAULT_THUMBNAIL_SIZE
+worker_count = 0
+# Registro de cargas en curso, protegido por `queue_lock`: url -> petición, e id -> url de su petición,
+# desde que se pide hasta que sus callbacks se ejecutan en el hilo principal.
+loading_urls: dict[str, LoadRequest] = {}
+processing_images_ids: dict[str, str] = {}
+# Trabajo de `wait_for_image_processing` en el hilo principal, ver `reset_upload_stats`.
+upload_stats = {"ticks": 0, "images": 0, "max_tick_time": 0.0, "max_queue_depth": 0, "deferred_ticks": 0}
+
+
+def get_thumbnail_key(url: str) -> str:
+    """Clave de la caché de miniaturas: hash de la URL y del tamaño de miniatura."""
+    return hashlib.sha256(f"{thumbnail_max_size}:{url}".encode('utf-8')).hexdigest()
+
+
+def to_rgba_uint8(pixels: np.ndarray) -> np.ndarray:
+    """Devuelve los píxeles como RGBA uint8 (H, W, 4) contiguos, sin copiar si ya lo son."""
+    if pixels.dtype == np.uint16:
+        pixels = (pixels >> 8).astype(np.uint8)
+    elif pixels.dtype != np.uint8:
+        pixels = (np.clip(pixels, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+    if pixels.ndim == 3 and pixels.shape[2] == 4:
+        return np.ascontiguousarray(pixels)
+    if pixels.ndim == 2:
+        pixels = pixels[..., None]
+    if pixels.ndim != 3 or pixels.shape[2] not in {1, 3}:
+        raise ValueError(f"Número de canales no soportado: {pixels.shape}")
+    # Escala de grises o RGB: un único búfer RGBA, opaco.
+    rgba = np.empty((pixels.shape[0], pixels.shape[1], 4), dtype=np.uint8)
+    rgba[..., :3] = pixels
+    rgba[..., 3] = 255
+    return rgba
+
+
+def _content_mask(packed: np.ndarray) -> np.ndarray:
+    """Píxeles ni blancos ni transparentes, con RGBA empaquetado en uint32 little-endian."""
+    return ((packed & WHITE_RGB) != WHITE_RGB) & (packed > WHITE_RGB)
+
+
+def _region_bounds(packed: np.ndarray, y_start: int, y_stop: int, x_start: int, x_stop: int) -> tuple[int, int, int, int] | None:
+    """
+    Caja (y_min, y_max, x_min, x_max), máximos incluidos, del contenido de una región de
+    `packed` a resolución completa, o None si no tiene. Se recorre en bloques de
+    BBOX_BLOCK_ROWS filas para que la máscara y sus temporales sean pequeños.
+    """
+    if y_start >= y_stop or x_start >= x_stop:
+        return None
+    row_hits = []
+    cols = np.zeros(x_stop - x_start, dtype=bool)
+    for start in range(y_start, y_stop, BBOX_BLOCK_ROWS):
+        mask = _content_mask(packed[start:min(y_stop, start + BBOX_BLOCK_ROWS), x_start:x_stop])
+        rows = np.flatnonzero(mask.any(axis=1))
+        if len(rows) > 0:
+            row_hits += (start + int(rows[0]), start + int(rows[-1]))
+            cols |= mask.any(axis=0)
+    if not row_hits:
+        return None
+    col_hits = np.flatnonzero(cols)
+    return min(row_hits), max(row_hits), x_start + int(col_hits[0]), x_start + int(col_hits[-1])
 
-# Removed requests and io as imageio will handle URL fetching and data.
 
+def get_content_bounds(pixels: np.ndarray, margin: int = 5) -> tuple[int, int, int, int] | None:
+    """
+    Caja (y_min, y_max, x_min, x_max), máximos excluidos, de lo que no es blanco ni
+    transparente, más un margen. None si la imagen está vacía.
 
-process_queue = deque()
-processed_queue = deque()
-thread = None
-processing_images_ids = {}
+    Una máscara reducida (una fila y columna de cada BBOX_SAMPLE_STEP) da una caja cuyos
+    bordes son píxeles con contenido, así que el contenido dentro de ella no cambia el
+    resultado. Solo se revisa a resolución completa lo que queda fuera de la caja, y la caja
+    se amplía con lo que aparezca: el resultado es exacto, también con detalles sueltos.
+    """
+    height, width = pixels.shape[:2]
+    packed = pixels.view('<u4')[..., 0]
+    step = BBOX_SAMPLE_STEP
+    coarse = _content_mask(packed[::step, ::step])
+    rows = np.flatnonzero(coarse.any(axis=1))
+    cols = np.flatnonzero(coarse.any(axis=0))
+    if len(rows) == 0:
+        # Contenido más fino que el muestreo, o ninguno: máscara completa.
+        bounds = _region_bounds(packed, 0, height, 0, width)
+        if bounds is None:
+            return None
+        y_min, y_max, x_min, x_max = bounds
+    else:
+        y_min, y_max = int(rows[0]) * step, int(rows[-1]) * step
+        x_min, x_max = int(cols[0]) * step, int(cols[-1]) * step
+        # Arriba y abajo a todo el ancho; a los lados, solo entre las filas de la caja.
+        outside = ((0, y_min, 0, width), (y_max + 1, height, 0, width),
+                   (y_min, y_max + 1, 0, x_min), (y_min, y_max + 1, x_max + 1, width))
+        for region in outside:
+            if (bounds := _region_bounds(packed, *region)) is not None:
+                y_min, y_max = min(y_min, bounds[0]), max(y_max, bounds[1])
+                x_min, x_max = min(x_min, bounds[2]), max(x_max, bounds[3])
 
+    return (max(0, y_min - margin), min(height, y_max + margin + 1),
+            max(0, x_min - margin), min(width, x_max + margin + 1))
 
-def crop_transparent_or_white_edges(img: np.ndarray, margin: int = 5) -> np.ndarray:
+
+def make_thumbnail(pixels: np.ndarray, max_edge: int, margin: int = 5) -> np.ndarray | None:
     """
-    Recorta las filas y columnas que son completamente blancas o transparentes.
-    Deja un margen configurable alrededor del contenido útil.
+    Recorta los bordes blancos o transparentes (dejando `margin`) y reduce la imagen para que
+    su lado mayor sea como mucho `max_edge`. Trabaja en uint8 sobre vistas: el recorte no copia
+    y la reducción lee directamente la región recortada.
     """
-    assert img.shape[2] == 4, "Se espera una imagen RGBA."
+    pixels = to_rgba_uint8(pixels)
+    bounds = get_content_bounds(pixels, margin)
+    if bounds is None:
+        return None
+    y_min, y_max, x_min, x_max = bounds
+    width, height = x_max - x_min, y_max - y_min
+    if max(width, height) <= max_edge or PILImage is None:
+        return downscale_pixels(pixels[y_min:y_max, x_min:x_max], max_edge)
 
-    # Separar canales
-    r, g, b, a = img[..., 0], img[..., 1], img[..., 2], img[..., 3]
+    factor = max_edge / max(width, height)
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    # Pillow comparte el búfer del array contiguo; `box` recorta dentro del mismo remuestreo.
+    pil_image = PILImage.fromarray(pixels, 'RGBA')
+    return np.asarray(pil_image.resize(size, PILImage.Resampling.BOX, box=(x_min, y_min, x_max, y_max)))
 
-    # Crear una máscara donde los píxeles NO son blancos ni transparentes
-    mask = ~((r == 1.0) & (g == 1.0) & (b == 1.0) | (a == 0.0))
 
-    # Combinar por filas y columnas
-    rows = np.any(mask, axis=1)
-    cols = np.any(mask, axis=0)
+def decode_image_pixels(id: str, data: bytes) -> np.ndarray | None:
+    """
+    Decodifica una imagen (primer fotograma en los GIF) con imageio, sin tocar bpy.
+    Devuelve la miniatura RGBA uint8 (ver `make_thumbnail`), de arriba a abajo, o None si falla.
+    """
+    try:
+        pixels = iio.imread(data, index=0, pilmode="RGBA") # Request RGBA to simplify channel handling
+        thumbnail = make_thumbnail(pixels, thumbnail_max_size)
+        if thumbnail is None:
+            print(f"Error: La imagen '{id}' está vacía (blanca o transparente).")
+        return thumbnail
+    except Exception as e:
+        print(f"Error al decodificar la imagen '{id}' con imageio: {e}")
+        return None
 
-    # Obtener índices útiles
-    y_min, y_max = np.where(rows)[0][[0, -1]]
-    x_min, x_max = np.where(cols)[0][[0, -1]]
 
-    # Aplicar margen
-    y_min = max(0, y_min - margin)
-    y_max = min(img.shape[0] - 1, y_max + margin)
-    x_min = max(0, x_min - margin)
-    x_max = min(img.shape[1] - 1, x_max + margin)
+def download_thumbnail(id: str, url: str, cached_filepath: str | None = None) -> str | None:
+    """
+    Descarga la imagen y guarda su miniatura (PNG recortado) en la caché de miniaturas.
+    Con `cached_filepath`, revalida la entrada con ETag/Last-Modified: si no cambió en el
+    servidor (304) devuelve la misma ruta. Devuelve la ruta de la miniatura o None si falla.
+    """
+    cache = get_thumbnail_cache()
+    key = get_thumbnail_key(url)
+    info = (cache.get_info(key, THUMBNAIL_KIND) or {}) if cached_filepath else {}
+    headers = {}
+    if etag := info.get("etag"):
+        headers['If-None-Match'] = etag
+    if last_modified := info.get("last_modified"):
+        headers['If-Modified-Since'] = last_modified
+
+    print(f"Descargando imagen '{id}' desde {url}...")
+    try:
+        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            cache.update_info(key, THUMBNAIL_KIND, {**info, "validated": time.time()})
+            return cached_filepath
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Error al descargar la imagen '{id}' desde {url}: {e}")
+        # Mejor una miniatura quizá desactualizada que ninguna.
+        return cached_filepath
+
+    pixels = decode_image_pixels(id, response.content)
+    if pixels is None:
+        return cached_filepath
+
+    download_path = cache.get_download_path(key, THUMBNAIL_KIND)
+    try:
+        iio.imwrite(download_path, pixels, extension=".png")
+    except Exception as e:
+        print(f"Error al guardar la miniatura '{id}': {e}")
+        return cached_filepath
+    info = {
+        "etag": response.headers.get('ETag'),
+        "last_modified": response.headers.get('Last-Modified'),
+        "validated": time.time(),
+    }
+    return str(cache.store(key, THUMBNAIL_KIND, download_path, url=url, info=info))
+
+
+def make_preview_pixels(filepath: str) -> tuple[int, int, np.ndarray] | None:
+    """
+    Lee la miniatura y la prepara para el icono de la imagen: float32 contiguo, de abajo a
+    arriba, listo para `foreach_set`. Se hace en los hilos de trabajo, sin tocar bpy.
+    """
+    try:
+        pixels = to_rgba_uint8(iio.imread(filepath))
+    except Exception as e:
+        print(f"Error al leer la miniatura {filepath}: {e}")
+        return None
+    height, width = pixels.shape[:2]
+    # Una sola pasada: volteo (vista) y conversión a un búfer nuevo.
+    buffer = np.multiply(pixels[::-1], 1.0 / 255.0, dtype=np.float32)
+    return width, height, buffer.ravel()
+
+
+def _queue_processed(request: LoadRequest, filepath: str | None) -> None:
+    preview_pixels = make_preview_pixels(filepath) if filepath is not None else None
+    processed_queue.append((request, filepath, preview_pixels))
+
+
+def _load_thumbnail(request: LoadRequest) -> None:
+    """Parte de la carga en el hilo de trabajo: la miniatura en caché si la hay, si no una descarga."""
+    cache = get_thumbnail_cache()
+    url = request.url
+    key = get_thumbnail_key(url)
+    # Para los mensajes: los id pueden aumentar mientras se ejecuta.
+    id = request.ids[0]
+    cached_filepath = cache.lookup(key, THUMBNAIL_KIND)
+    if cached_filepath is None:
+        _queue_processed(request, download_thumbnail(id, url))
+        return
 
-    # Recorte
-    return img[y_min:y_max+1, x_min:x_max+1]
+    # Se muestra sin esperar a la red.
+    _queue_processed(request, str(cached_filepath))
+    info = cache.get_info(key, THUMBNAIL_KIND) or {}
+    if time.time() - info.get("validated", 0) < REVALIDATE_AFTER:
+        return
+    filepath = download_thumbnail(id, url, str(cached_filepath))
+    if filepath is not None and filepath != str(cached_filepath):
+        # Cambió en el servidor: sustituye el archivo de las imágenes ya mostradas.
+        _queue_processed(request, filepath)
+
+
+def _has_image_data(image: bpy.types.Image) -> bool:
+    if image.packed_file is not None or image.source == 'GENERATED':
+        return True
+    return os.path.isfile(bpy.path.abspath(image.filepath))
+
+
+def load_thumbnail_image(id: str, filepath: str) -> bpy.types.Image | None:
+    """Crea (o actualiza) la imagen de Blender desde la miniatura. Solo en el hilo principal."""
+    image = bpy.data.images.get(id)
+    try:
+        if image is None:
+            image = bpy.data.images.load(filepath)
+            image.name = id
+        elif bpy.path.abspath(image.filepath) != filepath:
+            image.filepath = filepath
+            image.reload()
+    except Exception as e:
+        print(f"Error al cargar la miniatura '{id}' desde {filepath}: {e}")
+        return None
+    return image
 
 
 def get_image_from_url(id: str, url: str) -> bpy.types.Image | None:
     """
-    Carga una imagen desde una URL en Blender usando imageio.
-    Si una imagen con el 'id' dado ya existe, la devuelve.
-    De lo contrario, descarga la imagen, la carga en Blender y la devuelve.
+    Carga una imagen desde una URL en Blender, de forma síncrona y pasando por la caché
+    de miniaturas. Si una imagen con el 'id' dado ya existe, la devuelve.
     Devuelve None si la descarga o carga falla.
     """
-    global processing_images_ids
-
-    image = bpy.data.images.get(id) 
-    
-    if image is None:
-        print(f"Imagen '{id}' no encontrada. Descargando y procesando con imageio desde {url}...")
-        new_image_created = False # Flag to track if we need to clean up a new image on failure
-        try:
-            # Leer la imagen desde la URL usando imageio
-            # imageio.v3.imread can take a URI directly
-            try:
-                img_array_raw = iio.imread(url,pilmode="RGBA") # Request RGBA to simplify channel handling
-            except TimeoutError as e:
-                print(e)
-                print("Trying again...")
-                time.sleep(0.15)
-                img_array_raw = iio.imread(url,pilmode="RGBA")
-
-            # imageio might return different dtypes, Blender pixels usually expect float32 (0.0 to 1.0)
-            if img_array_raw.dtype == np.uint8:
-                img_array_float = img_array_raw.astype(np.float32) / 255.0
-            elif img_array_raw.dtype == np.uint16:
-                img_array_float = img_array_raw.astype(np.float32) / 65535.0
-            elif img_array_raw.dtype == np.float32:
-                # Assume it's already in 0-1 range if float32, or clamp/normalize if necessary
-                img_array_float = np.clip(img_array_raw, 0.0, 1.0) # Ensure it's in 0-1 range
-            else:
-                print(f"Error: Tipo de dato no soportado por imageio: {img_array_raw.dtype} para la imagen '{id}'. Intentando convertir.")
-                # Fallback: try to convert to uint8 first then to float
-                img_array_float = iio.imread(url, mode='RGBA', pilmode="RGBA").astype(np.float32) / 255.0
-
-            # Ensure we have 4 channels (RGBA)
-            if len(img_array_float.shape) == 3 and img_array_float.shape[2] == 3: # RGB
-                print(f"  Imagen '{id}' es RGB, añadiendo canal alfa.")
-                alpha_channel = np.ones((height, width, 1), dtype=np.float32)
-                img_array_rgba = np.concatenate((img_array_float, alpha_channel), axis=2)
-            elif len(img_array_float.shape) == 3 and img_array_float.shape[2] == 4: # RGBA
-                img_array_rgba = img_array_float
-            elif len(img_array_float.shape) == 2: # Grayscale
-                print(f"  Imagen '{id}' es escala de grises, convirtiendo a RGBA.")
-                img_array_gray_3channel = np.stack((img_array_float,)*3, axis=-1) # HxW -> HxWx3
-                alpha_channel = np.ones((height, width, 1), dtype=np.float32)
-                img_array_rgba = np.concatenate((img_array_gray_3channel, alpha_channel), axis=2)
-            else:
-                print(f"Error: Número de canales no soportado ({img_array_float.shape}) para la imagen '{id}' tras conversión.")
-                return None
-
-            img_array_rgba = crop_transparent_or_white_edges(img_array_rgba, margin=5)
-            height, width = img_array_rgba.shape[0], img_array_rgba.shape[1]
-
-            image = bpy.data.images.new(name=id, width=width, height=height, alpha=True)
-            new_image_created = True
-
-            # Blender expects pixels from bottom-left, some image formats are top-left.
-            # imageio.imread with default plugins usually gives top-left (standard for many formats).
-            # So, we might need to flip it vertically.
-            # However, bpy.types.Image.pixels expects a 1D array (R,G,B,A,R,G,B,A...)
-            # and seems to handle the y-inversion internally or expects top-to-bottom rows.
-            # Let's try direct assignment first. If inverted, uncomment flipud.
-            img_array_rgba_flipped = np.flipud(img_array_rgba)
-            image.pixels.foreach_set(img_array_rgba_flipped.ravel())
-
-            # image.pack() # Opcional: empaqueta los datos de la imagen en el archivo .blend
-
-            print(f"Imagen '{id}' cargada y procesada con imageio.")
-
-        except Exception as e:
-            print(f"Error al cargar la imagen '{id}' desde {url} con imageio: {e}")
-            if new_image_created and image and image.users == 0 : 
-                # Si creamos una nueva imagen y no tiene usuarios (no se asignó a nada), la eliminamos.
-                bpy.data.images.remove(image)
-            if id in processing_images_ids:
-                del processing_images_ids[id]
-            return None
-    else:
+    image = bpy.data.images.get(id)
+    if image is not None and _has_image_data(image):
         print(f"Imagen '{id}' ya existe en Blender. Usando la existente.")
-        if id in processing_images_ids:
-            del processing_images_ids[id]
-
-    return image
-
-
-def wait_for_image_processing():
-    global processed_queue
-    while len(processed_queue) > 0:
-        id, image, on_complete_callback, on_error_callback = processed_queue.popleft()
-        if image is not None:
+        return image
+    cached_filepath = get_thumbnail_cache().lookup(get_thumbnail_key(url), THUMBNAIL_KIND)
+    filepath = str(cached_filepath) if cached_filepath else download_thumbnail(id, url)
+    if filepath is None:
+        return None
+    return load_thumbnail_image(id, filepath)
+
+
+def set_preview_pixels(image: bpy.types.Image, preview_pixels: tuple[int, int, np.ndarray]) -> None:
+    """Rellena el icono de la imagen con los píxeles preparados por un hilo de trabajo, para que
+    Blender no vuelva a decodificar el archivo al dibujarlo."""
+    width, height, buffer = preview_pixels
+    preview = image.preview_ensure()
+    preview.image_size = (width, height)
+    preview.image_pixels_float.foreach_set(buffer)
+
+
+def reset_upload_stats() -> None:
+    """Ticks del temporizador, imágenes aplicadas, el tick más largo (s) y la cola más larga al
+    empezar un tick, además de los ticks que dejaron imágenes para el siguiente."""
+    upload_stats.update(ticks=0, images=0, max_tick_time=0.0, max_queue_depth=0, deferred_ticks=0)
+
+
+def get_upload_stats() -> dict:
+    return dict(upload_stats)
+
+
+def _apply_processed(request: LoadRequest, filepath: str | None, preview_pixels) -> None:
+    """Carga las imágenes de una petición y ejecuta sus callbacks. Solo en el hilo principal."""
+    with queue_lock:
+        # Un resultado posterior de la misma petición (revalidación) solo sustituye las imágenes.
+        callbacks, request.callbacks = request.callbacks, []
+        if callbacks:
+            if loading_urls.get(request.url) is request:
+                del loading_urls[request.url]
+            for id in request.ids:
+                processing_images_ids.pop(id, None)
+
+    images = {}
+    for id in request.ids:
+        # Las imágenes solo existen una vez cargadas aquí, en el hilo principal.
+        image = bpy.data.images.get(id)
+        if filepath is not None:
+            image = load_thumbnail_image(id, filepath)
+            if image is not None and preview_pixels is not None:
+                try:
+                    set_preview_pixels(image, preview_pixels)
+                except Exception as e:
+                    print(f"⚠️  Aviso: no se pudo asignar el icono de '{id}': {e}")
+        elif image is not None and not _has_image_data(image):
+            image = None
+        images[id] = image
+
+    for id, on_complete_callback, on_error_callback in callbacks:
+        if images[id] is not None:
             if on_complete_callback is not None and callable(on_complete_callback):
-                on_complete_callback(image)
+                on_complete_callback(images[id])
         else:
             if on_error_callback is not None and callable(on_error_callback):
                 on_error_callback()
-        global processing_images_ids
-        if id in processing_images_ids:
-            del processing_images_ids[id]
 
-    global thread
-    if thread is None or not thread.is_alive():
-        return None
-    return 0.5
 
-def process_image_thread():
-    global process_queue, processed_queue
-    while len(process_queue) > 0:
-        id, url, on_complete_callback, on_error_callback = process_queue.popleft()
-        image = get_image_from_url(id, url)
-        print("Thread: image was processed", image)
-        processed_queue.append((id, image, on_complete_callback, on_error_callback))
-        time.sleep(0.15)
-
-    global thread
-    thread = None
+def wait_for_image_processing():
+    """Aplica las imágenes cargadas en el hilo principal, dentro de `UPLOAD_BUDGET` por llamada."""
+    start = time.perf_counter()
+    upload_stats["max_queue_depth"] = max(upload_stats["max_queue_depth"], len(processed_queue))
+    images = 0
+    # Al menos una por tick, cueste lo que cueste.
+    while processed_queue and (images == 0 or time.perf_counter() - start < UPLOAD_BUDGET):
+        request, filepath, preview_pixels = processed_queue.popleft()
+        images += len(request.ids)
+        _apply_processed(request, filepath, preview_pixels)
+
+    if images:
+        upload_stats["ticks"] += 1
+        upload_stats["images"] += images
+        upload_stats["max_tick_time"] = max(upload_stats["max_tick_time"], time.perf_counter() - start)
+    if processed_queue:
+        # Sin presupuesto: el resto va en el siguiente tick, sin la espera habitual.
+        upload_stats["deferred_ticks"] += 1
+        return UPLOAD_INTERVAL
+    with queue_lock:
+        if worker_count == 0 and not process_queue and not processed_queue:
+            return None
+    return TIMER_INTERVAL
+
+
+def _pop_request() -> LoadRequest | None:
+    """Siguiente petición por prioridad, saltando las entradas sustituidas por un cambio de
+    prioridad o canceladas. Llamar con `queue_lock` adquirido."""
+    while process_queue:
+        priority, _order, request = heapq.heappop(process_queue)
+        if loading_urls.get(request.url) is request and request.priority == priority:
+            request.priority = None
+            return request
     return None
 
 
+def process_image_thread():
+    global worker_count
+    while True:
+        with queue_lock:
+            request = _pop_request()
+            if request is None:
+                worker_count -= 1
+                return
+        try:
+            _load_thumbnail(request)
+        except Exception as e:
+            print(f"Error al cargar la imagen '{request.url}': {e}")
+            processed_queue.append((request, None, None))
+
+
+def _start_workers() -> None:
+    """Arranca hilos de trabajo hasta `max_workers`, no más que peticiones en cola. Llamar con `queue_lock` adquirido."""
+    global worker_count
+    while worker_count < min(max_workers, len(process_queue)):
+        worker_count += 1
+        threading.Thread(target=process_image_thread, daemon=True).start()
+
+
+def set_thumbnail_max_size(size: int) -> None:
+    """Las miniaturas cargadas a partir de ahora se guardan en caché y se muestran a este tamaño."""
+    global thumbnail_max_size
+    thumbnail_max_size = max(16, size)
+
+
+def set_max_workers(count: int) -> None:
+    global max_workers
+    with queue_lock:
+        max_workers = max(1, count)
+        _start_workers()
+
+
 def request_image_load(id: str, url: str,
                        on_complete_callback: Optional[Callable[[bpy.types.Image], None]] = None,
-                       on_error_callback: Optional[Callable[[], None]] = None):
-    global process_queue, thread, processing_images_ids
-    
-    if id in processing_images_ids and processing_images_ids[id]:
-        return
-    processing_images_ids[id] = True
+                       on_error_callback: Optional[Callable[[], None]] = None,
+                       priority: int = PRIORITY_VISIBLE):
+    """Carga la imagen en un grupo de hilos de trabajo; los callbacks se ejecutan en el hilo principal.
 
-    # Add the request to the queue
-    process_queue.append((id, url, on_complete_callback, on_error_callback))
-
-    # # If no thread is running, start one...
-    if thread is None or not thread.is_alive():
-        thread = threading.Thread(target=process_image_thread)
-        thread.start()
+    Las peticiones de un `id` ya en curso se ignoran, salvo que suban su prioridad.
+    Las peticiones de una URL ya en curso con otros id se suman a su descarga.
+    """
+    with queue_lock:
+        if id in processing_images_ids:
+            request = loading_urls.get(processing_images_ids[id])
+            # En ejecución, o en cola con la misma prioridad o una mayor.
+            if request is not None and request.priority is not None and priority < request.priority:
+                request.priority = priority
+                heapq.heappush(process_queue, (priority, next(queue_order), request))
+            return
+
+        image = bpy.data.images.get(id)
+        if image is not None and _has_image_data(image):
+            # Ya cargada: solo quedan por ejecutar los callbacks, fuera del registro.
+            request = LoadRequest(url, None, [id], [(id, on_complete_callback, on_error_callback)])
+            processing_images_ids[id] = url
+            processed_queue.append((request, None, None))
+        else:
+            request = loading_urls.get(url)
+            if request is None:
+                request = loading_urls[url] = LoadRequest(url, priority)
+                heapq.heappush(process_queue, (priority, next(queue_order), request))
+                _start_workers()
+            elif request.priority is not None and priority < request.priority:
+                request.priority = priority
+                heapq.heappush(process_queue, (priority, next(queue_order), request))
+            request.ids.append(id)
+            request.callbacks.append((id, on_complete_callback, on_error_callback))
+            processing_images_ids[id] = url
 
     # If no timer is running, start one...
     if not TimerManager.exists('image_processing'):
-        TimerManager.add('image_processing', wait_for_image_processing, first_interval=0.1)
-
+        TimerManager.add('image_processing', wait_for_image_processing, first_interval=TIMER_INTERVAL)
+
+
+def cancel_image_loads() -> int:
+    """Descarta las peticiones en cola (las que están en ejecución terminan igualmente), p. ej. al
+    cambiar de página. Devuelve el número de id de imagen descartados."""
+    with queue_lock:
+        cancelled = [request for request in loading_urls.values() if request.priority is not None]
+        for request in cancelled:
+            del loading_urls[request.url]
+            for id in request.ids:
+                processing_images_ids.pop(id, None)
+        process_queue.clear()
+    return sum(len(request.ids) for request in cancelled)
 
 
 def register():
@@ -0,0 +1,152 @@
+import io
+import base64
+import numpy as np
+from dataclasses import dataclass
+from bpy.types import Image
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+    print("⚠️  Warning: Pillow (PIL) not available. Image-to-3D functionality will not work.")
+
+
+# Upload budget defaults, overridable from the addon preferences.
+DEFAULT_MAX_EDGE = 2048
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+MIN_EDGE = 256
+
+# (format, quality) candidates tried in order until the payload fits the byte budget.
+OPAQUE_CANDIDATES = (('JPEG', 92), ('JPEG', 85), ('JPEG', 75), ('WEBP', 70))
+ALPHA_CANDIDATES = (('PNG', None), ('WEBP', 90), ('WEBP', 80), ('WEBP', 70))
+
+MIME_TYPES = {
+    'PNG': "image/png",
+    'JPEG': "image/jpeg",
+    'WEBP': "image/webp",
+}
+
+
+@dataclass
+class EncodedImage:
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+
+    @property
+    def payload_size(self) -> int:
+        """Size in bytes of the base64 data URL that ends up in the request body."""
+        return len(f"data:{self.mime_type};base64,") + 4 * ((len(self.data) + 2) // 3)
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{base64.b64encode(self.data).decode('ascii')}"
+
+
+def read_image_pixels(image: Image) -> np.ndarray:
+    """Reads the pixels of a Blender image as a top-down (height, width, 4) uint8 array.
+
+    Pixels are fetched with `foreach_get` into a single preallocated float32 buffer,
+    which is then clamped and quantized in place. Must be called from the main thread.
+    """
+    width, height = image.size
+    channels = image.channels
+    buffer = np.empty(width * height * channels, dtype=np.float32)
+    image.pixels.foreach_get(buffer)
+
+    np.clip(buffer, 0.0, 1.0, out=buffer)
+    buffer *= 255.0
+    buffer += 0.5
+    pixels = buffer.astype(np.uint8).reshape(height, width, channels)
+
+    if channels == 4:
+        rgba = pixels
+    else:
+        rgba = np.empty((height, width, 4), dtype=np.uint8)
+        rgba[..., :3] = pixels[..., :3] if channels >= 3 else pixels[..., :1]
+        rgba[..., 3] = 255
+
+    # Blender stores rows bottom-up, image files expect them top-down.
+    return rgba[::-1]
+
+
+def encode_pixels(pixels: np.ndarray, image_format: str = 'AUTO', quality: int = 90) -> EncodedImage:
+    """Encodes a top-down (height, width, 4) uint8 array into PNG, JPEG or WebP bytes.
+
+    With 'AUTO', PNG is used when the alpha channel carries information and JPEG otherwise.
+    Safe to call from any thread.
+    """
+    if PILImage is None:
+        raise RuntimeError("Pillow (PIL) is required to encode images")
+
+    height, width = pixels.shape[:2]
+    has_alpha = bool((pixels[..., 3] != 255).any())
+    if image_format == 'AUTO':
+        image_format = 'PNG' if has_alpha else 'JPEG'
+
+    if image_format == 'JPEG' or (image_format == 'WEBP' and not has_alpha):
+        pil_image = PILImage.fromarray(np.ascontiguousarray(pixels[..., :3]), 'RGB')
+    else:
+        pil_image = PILImage.fromarray(np.ascontiguousarray(pixels), 'RGBA')
+
+    buffer = io.BytesIO()
+    if image_format == 'PNG':
+        pil_image.save(buffer, format='PNG')
+    else:
+        pil_image.save(buffer, format=image_format, quality=quality)
+
+    return EncodedImage(buffer.getvalue(), MIME_TYPES[image_format], width, height)
+
+
+def downscale_pixels(pixels: np.ndarray, max_edge: int) -> np.ndarray:
+    """Area-averages a (height, width, 4) uint8 array so its longest edge is at most `max_edge`."""
+    height, width = pixels.shape[:2]
+    longest_edge = max(width, height)
+    if longest_edge <= max_edge:
+        return pixels
+
+    if PILImage is None:
+        raise RuntimeError("Pillow (PIL) is required to downscale images")
+
+    factor = max_edge / longest_edge
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    # BOX is a true area average; Pillow premultiplies alpha for RGBA resampling.
+    pil_image = PILImage.fromarray(np.ascontiguousarray(pixels), 'RGBA')
+    return np.asarray(pil_image.resize(size, PILImage.Resampling.BOX))
+
+
+def encode_pixels_to_budget(pixels: np.ndarray,
+                            max_edge: int = DEFAULT_MAX_EDGE,
+                            max_bytes: int = DEFAULT_MAX_BYTES) -> EncodedImage:
+    """Downscales and encodes pixels so the resulting data URL fits in `max_bytes`.
+
+    Format and quality candidates are tried from best to smallest; if none fits, the
+    image is shrunk by 25% and the candidates are tried again, down to MIN_EDGE.
+    The smallest attempt is returned when the budget can't be met.
+    """
+    has_alpha = bool((pixels[..., 3] != 255).any())
+    candidates = ALPHA_CANDIDATES if has_alpha else OPAQUE_CANDIDATES
+
+    edge = min(max_edge, max(pixels.shape[:2]))
+    smallest = None
+    while True:
+        scaled = downscale_pixels(pixels, edge)
+        for image_format, quality in candidates:
+            encoded = encode_pixels(scaled, image_format, quality or 90)
+            if encoded.payload_size <= max_bytes:
+                return encoded
+            if smallest is None or encoded.payload_size < smallest.payload_size:
+                smallest = encoded
+        if edge <= MIN_EDGE:
+            print(f"⚠️  Warning: Image payload is {smallest.payload_size} bytes, over the {max_bytes} bytes budget.")
+            return smallest
+        edge = max(MIN_EDGE, int(edge * 0.75))
+
+
+def encode_image(image: Image,
+                 max_edge: int = DEFAULT_MAX_EDGE,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> EncodedImage:
+    """Reads and encodes a Blender image for upload within the size budget.
+    Must be called from the main thread."""
+    return encode_pixels_to_budget(read_image_pixels(image), max_edge, max_bytes)
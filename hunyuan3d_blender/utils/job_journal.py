@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import numpy as np
+from pathlib import Path
+from typing import Any, Iterator
+
+from .paths import get_user_data_dir
+
+
+# Journal operations.
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+TARGET = 'target'
+
+# Rewrite the journal when it holds this many more lines than live jobs.
+COMPACTION_SLACK = 200
+
+
+class JobJournal:
+    """Durable, append-only JSONL journal of generation jobs.
+
+    Each line records one transition of a job: queued (with its generation arguments and
+    target, the .blend file and scene it was started from), running (with its creation ID),
+    done, or a new target once an unsaved file got saved. Replaying the lines gives the jobs
+    still pending or running after a crash or restart, to be resumed in their own file only.
+    The journal is per user, shared by every .blend file. Image pixels of queued jobs are kept
+    in `.npy` sidecar files. The journal is compacted on load and whenever it grows too
+    far beyond the number of live jobs. Main thread only.
+    """
+
+    def __init__(self, dirpath: Path):
+        self.dirpath = dirpath
+        self.filepath = dirpath / "jobs.jsonl"
+        # job_id -> {"state", "data", "creation_id", "blend_filepath", "scene"}
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self._line_count = 0
+        self._load()
+        self.compact()
+
+    # --- Replay. ---
+
+    def _load(self) -> None:
+        if not self.filepath.exists():
+            return
+        with self.filepath.open('r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-write.
+                    continue
+                self._apply(entry)
+
+    def _apply(self, entry: dict[str, Any]) -> None:
+        job_id = entry.get("job_id")
+        if not job_id:
+            return
+        op = entry.get("op")
+        if op == QUEUED:
+            self.jobs[job_id] = {"state": QUEUED, "data": entry.get("data", {}), "creation_id": None,
+                                 "blend_filepath": entry.get("blend_filepath", ""), "scene": entry.get("scene", "")}
+        elif op == RUNNING:
+            job = self.jobs.setdefault(job_id, {"data": {}, "blend_filepath": "", "scene": ""})
+            job["state"] = RUNNING
+            job["creation_id"] = entry.get("creation_id")
+        elif op == TARGET:
+            if job := self.jobs.get(job_id):
+                job["blend_filepath"] = entry.get("blend_filepath", "")
+                job["scene"] = entry.get("scene", "")
+        elif op == DONE:
+            self.jobs.pop(job_id, None)
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        entry["t"] = time.time()
+        self._apply(entry)
+        with self.filepath.open('a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._line_count += 1
+        if self._line_count > len(self.jobs) + COMPACTION_SLACK:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrites the journal with one line per live job, atomically."""
+        tmp_filepath = self.filepath.with_suffix(".jsonl.tmp")
+        with tmp_filepath.open('w', encoding='utf-8') as f:
+            for job_id, job in self.jobs.items():
+                f.write(json.dumps({"op": QUEUED, "job_id": job_id, "data": job.get("data", {}),
+                                    "blend_filepath": job.get("blend_filepath", ""), "scene": job.get("scene", "")}) + "\n")
+                if job["state"] == RUNNING:
+                    f.write(json.dumps({"op": RUNNING, "job_id": job_id, "creation_id": job["creation_id"]}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filepath, self.filepath)
+        self._line_count = sum(2 if job["state"] == RUNNING else 1 for job in self.jobs.values())
+
+        # Sidecars of jobs no longer queued.
+        queued_ids = {job_id for job_id, job in self.jobs.items() if job["state"] == QUEUED}
+        for sidecar in self.dirpath.glob("*.npy"):
+            if sidecar.stem not in queued_ids:
+                sidecar.unlink(missing_ok=True)
+
+    # --- Transitions. ---
+
+    def record_queued(self, job_id: str, data: dict[str, Any], blend_filepath: str, scene: str) -> None:
+        data = dict(data)
+        pixels = data.pop("image", None)
+        if isinstance(pixels, np.ndarray):
+            np.save(self.dirpath / f"{job_id}.npy", pixels)
+            data["image"] = f"{job_id}.npy"
+        self._append({"op": QUEUED, "job_id": job_id, "data": data, "blend_filepath": blend_filepath, "scene": scene})
+
+    def record_target(self, job_id: str, blend_filepath: str, scene: str) -> None:
+        if job_id not in self.jobs:
+            return
+        self._append({"op": TARGET, "job_id": job_id, "blend_filepath": blend_filepath, "scene": scene})
+
+    def record_running(self, job_id: str, creation_id: str) -> None:
+        self._append({"op": RUNNING, "job_id": job_id, "creation_id": creation_id})
+        (self.dirpath / f"{job_id}.npy").unlink(missing_ok=True)
+
+    def record_done(self, job_id: str) -> None:
+        if job_id not in self.jobs:
+            return
+        self._append({"op": DONE, "job_id": job_id})
+        (self.dirpath / f"{job_id}.npy").unlink(missing_ok=True)
+
+    def record_creation_done(self, creation_id: str) -> None:
+        for job_id, job in self.jobs.items():
+            if job.get("creation_id") == creation_id:
+                self.record_done(job_id)
+                return
+
+    # --- Queries. ---
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        return self.jobs.get(job_id)
+
+    def get_creation_job(self, creation_id: str) -> dict[str, Any] | None:
+        for job in self.jobs.values():
+            if job.get("creation_id") == creation_id:
+                return job
+        return None
+
+    def iter_queued(self, blend_filepath: str | None = None) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yields (job_id, generation arguments) of queued jobs, with their image pixels loaded.
+        Only those started from `blend_filepath`, if given."""
+        for job_id, job in list(self.jobs.items()):
+            if job["state"] != QUEUED:
+                continue
+            if blend_filepath is not None and job.get("blend_filepath", "") != blend_filepath:
+                continue
+            data = dict(job.get("data", {}))
+            if image_file := data.get("image"):
+                try:
+                    data["image"] = np.load(self.dirpath / image_file)
+                except OSError as e:
+                    print(f"❌ Error loading queued image for job '{job_id}': {e}")
+                    self.record_done(job_id)
+                    continue
+            yield job_id, data
+
+    def get_running_creation_ids(self, blend_filepath: str | None = None) -> list[str]:
+        """Creation IDs of the running jobs, only those started from `blend_filepath` if given."""
+        return [job["creation_id"] for job in self.jobs.values()
+                if job["state"] == RUNNING and job.get("creation_id")
+                and (blend_filepath is None or job.get("blend_filepath", "") == blend_filepath)]
+
+
+journal = None
+
+
+def get_job_journal() -> JobJournal:
+    global journal
+    if journal is None:
+        journal = JobJournal(get_user_data_dir("jobs"))
+    return journal
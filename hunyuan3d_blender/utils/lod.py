@@ -0,0 +1,126 @@
+"""Level-of-detail chains for parsed GLB scenes. NumPy + Pillow only, safe on worker threads."""
+import os
+import tempfile
+import numpy as np
+
+from .glb import GLBScene, GLBMesh, GLBImage, GLBLevel
+from .image_encode import PILImage
+
+
+DEFAULT_LOD_RATIOS = (0.5, 0.2, 0.05)
+# Levels that would go below this many faces are skipped.
+MIN_LOD_FACES = 1000
+MIN_GRID = 2
+MAX_GRID = 1024
+GRID_ITERATIONS = 5
+MIN_TEXTURE_SIZE = 64
+
+
+def parse_lod_ratios(text: str) -> tuple[float, ...]:
+    """Parses "0.5, 0.2, 0.05" into decreasing ratios in (0, 1)."""
+    ratios = []
+    for value in text.replace(';', ',').split(','):
+        try:
+            ratio = float(value)
+        except ValueError:
+            continue
+        if 0.0 < ratio < 1.0:
+            ratios.append(ratio)
+    return tuple(sorted(set(ratios), reverse=True))
+
+
+def _cluster_mesh(mesh: GLBMesh, grid: int) -> GLBMesh:
+    """Vertex clustering: merges the vertices falling in the same cell of a `grid`^3 lattice
+    over the bounds. UVs are clustered too, so UV seams stay split."""
+    positions = mesh.positions
+    low = positions.min(axis=0)
+    extent = float(np.ptp(positions, axis=0).max()) or 1.0
+    cells = np.minimum(((positions - low) * (grid / extent)).astype(np.int64), grid)
+    keys = (cells[:, 0] * (grid + 1) + cells[:, 1]) * (grid + 1) + cells[:, 2]
+    if mesh.uvs is not None:
+        uv_cells = np.clip(np.floor(mesh.uvs * grid), -grid, 2 * grid).astype(np.int64) + grid
+        keys = (keys * (3 * grid + 1) + uv_cells[:, 0]) * (3 * grid + 1) + uv_cells[:, 1]
+    _unique, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.ravel()
+    cluster_count = int(inverse.max()) + 1
+    weights = np.bincount(inverse, minlength=cluster_count).astype(np.float32)[:, None]
+
+    def average(values: np.ndarray) -> np.ndarray:
+        return np.stack([np.bincount(inverse, values[:, axis], cluster_count) for axis in range(values.shape[1])], axis=1).astype(np.float32) / weights
+
+    triangles = inverse[mesh.triangles].astype(np.uint32)
+    keep = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    triangles = triangles[keep]
+    material_indices = mesh.material_indices[keep] if mesh.material_indices is not None else None
+    # Clusters can fold several triangles onto the same vertices.
+    sorted_triangles = np.sort(triangles, axis=1).astype(np.int64)
+    face_keys = (sorted_triangles[:, 0] * cluster_count + sorted_triangles[:, 1]) * cluster_count + sorted_triangles[:, 2]
+    _unique, first = np.unique(face_keys, return_index=True)
+    first.sort()
+
+    result = GLBMesh(
+        name=mesh.name,
+        positions=average(positions),
+        triangles=triangles[first],
+        material_indices=material_indices[first] if material_indices is not None else None,
+        materials=list(mesh.materials),
+    )
+    if mesh.normals is not None:
+        normals = average(mesh.normals)
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        result.normals = normals / np.maximum(lengths, 1e-8)
+    if mesh.uvs is not None:
+        result.uvs = average(mesh.uvs)
+    return result
+
+
+def decimate_mesh(mesh: GLBMesh, ratio: float) -> GLBMesh:
+    """Reduces the mesh to about `ratio` of its faces. The grid size is searched for, as
+    face count grows with the square of the grid resolution on surfaces."""
+    target = max(1, int(mesh.face_count * ratio))
+    grid = int(np.clip(np.sqrt(mesh.face_count) / 2, MIN_GRID, MAX_GRID))
+    best = None
+    for _ in range(GRID_ITERATIONS):
+        result = _cluster_mesh(mesh, grid)
+        if best is None or abs(result.face_count - target) < abs(best.face_count - target):
+            best = result
+        if result.face_count == 0 or abs(result.face_count - target) <= target * 0.1:
+            break
+        next_grid = int(np.clip(round(grid * np.sqrt(target / max(result.face_count, 1))), MIN_GRID, MAX_GRID))
+        if next_grid == grid:
+            break
+        grid = next_grid
+    return best
+
+
+def downsample_image(image: GLBImage, factor: int, dirpath: str) -> GLBImage:
+    """Writes a copy of the image file reduced by `factor` (box filter)."""
+    with PILImage.open(image.filepath) as pil_image:
+        factor = max(1, min(factor, min(pil_image.size) // MIN_TEXTURE_SIZE))
+        reduced = pil_image.reduce(factor) if factor > 1 else pil_image.copy()
+        suffix = os.path.splitext(image.filepath)[1] or ".png"
+        fd, filepath = tempfile.mkstemp(prefix=f"{image.name}_", suffix=suffix, dir=dirpath)
+        with os.fdopen(fd, 'wb') as f:
+            if suffix in {".jpg", ".jpeg"}:
+                reduced.convert("RGB").save(f, format="JPEG", quality=90)
+            else:
+                reduced.save(f, format=pil_image.format or "PNG", compress_level=1)
+    return GLBImage(name=image.name, filepath=filepath, non_color=image.non_color)
+
+
+def build_lods(scene: GLBScene, ratios: tuple[float, ...], images_dirpath: str | None = None) -> None:
+    """Fills `scene.lods` with decimated meshes and downsampled images for each ratio."""
+    images_dirpath = images_dirpath or tempfile.gettempdir()
+    face_counts = [mesh.face_count for mesh in scene.meshes]
+    for ratio in ratios:
+        if sum(face_counts) * ratio < MIN_LOD_FACES:
+            break
+        level = GLBLevel(ratio=ratio, meshes=[decimate_mesh(mesh, ratio) for mesh in scene.meshes])
+        # Texel density follows the edge length: sqrt of the face ratio.
+        factor = int(2 ** round(np.log2(1.0 / np.sqrt(ratio))))
+        for image in scene.images:
+            if image.filepath and PILImage is not None and factor > 1:
+                level.images.append(downsample_image(image, factor, images_dirpath))
+            else:
+                level.images.append(image)
+        scene.lods.append(level)
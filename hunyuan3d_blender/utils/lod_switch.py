@@ -0,0 +1,116 @@
+import bpy
+from bpy.app.handlers import persistent
+from mathutils import Vector
+
+from .timer_manager import TimerManager
+
+
+TIMER_INTERVAL = 0.5
+timer_id = "lod_switch_timer"
+
+# Object name -> LOD level shown before a render forced full resolution.
+levels_before_render: dict[str, int] = {}
+
+
+def get_lod_objects(scene: bpy.types.Scene) -> list[bpy.types.Object]:
+    return [obj for obj in scene.objects if obj.type == 'MESH' and len(obj.h3d_lod.levels) > 1]
+
+
+def set_object_lod(obj: bpy.types.Object, level: int) -> None:
+    lod = obj.h3d_lod
+    level = max(0, min(level, len(lod.levels) - 1))
+    mesh = lod.levels[level].mesh
+    if mesh is not None and obj.data != mesh:
+        obj.data = mesh
+    lod.active_level = level
+
+
+def get_view_location(context: bpy.types.Context) -> Vector | None:
+    """Eye location of the first 3D viewport (the camera, in camera view)."""
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                return area.spaces.active.region_3d.view_matrix.inverted().translation
+    return None
+
+
+def update_scene_lods(scene: bpy.types.Scene, context: bpy.types.Context | None = None) -> None:
+    """Applies the scene LOD mode to every object with a LOD chain."""
+    if context is None:
+        context = bpy.context
+    h3d_scn = scene.h3d
+    objects = get_lod_objects(scene)
+    if h3d_scn.lod_mode == 'FULL':
+        for obj in objects:
+            set_object_lod(obj, 0)
+    elif h3d_scn.lod_mode == 'PROXY':
+        for obj in objects:
+            set_object_lod(obj, len(obj.h3d_lod.levels) - 1)
+    elif h3d_scn.lod_mode == 'DISTANCE':
+        view_location = get_view_location(context)
+        if view_location is None:
+            return
+        for obj in objects:
+            distance = (obj.matrix_world.translation - view_location).length
+            set_object_lod(obj, int(distance / h3d_scn.lod_distance))
+
+
+def lod_switch_timer():
+    scene = bpy.context.scene
+    if scene is None or scene.h3d.lod_mode != 'DISTANCE':
+        return None
+    if not levels_before_render:
+        update_scene_lods(scene)
+    return TIMER_INTERVAL
+
+
+def ensure_lod_switch_timer() -> None:
+    if not TimerManager.exists(timer_id):
+        TimerManager.add(timer_id, lod_switch_timer, first_interval=TIMER_INTERVAL)
+
+
+def update_lod_mode(scn_h3d, context) -> None:
+    update_scene_lods(context.scene, context)
+    if scn_h3d.lod_mode == 'DISTANCE':
+        ensure_lod_switch_timer()
+
+
+# --- Renders always use full resolution. ---
+
+@persistent
+def _on_render_init(scene, *args):
+    for obj in get_lod_objects(scene):
+        levels_before_render[obj.name] = obj.h3d_lod.active_level
+        set_object_lod(obj, 0)
+
+
+@persistent
+def _on_render_end(scene, *args):
+    for name, level in levels_before_render.items():
+        if (obj := scene.objects.get(name)) is not None:
+            set_object_lod(obj, level)
+    levels_before_render.clear()
+
+
+@persistent
+def _on_load_post(*args):
+    if bpy.context.scene is not None and bpy.context.scene.h3d.lod_mode == 'DISTANCE':
+        ensure_lod_switch_timer()
+
+
+def register():
+    bpy.app.handlers.render_init.append(_on_render_init)
+    bpy.app.handlers.render_complete.append(_on_render_end)
+    bpy.app.handlers.render_cancel.append(_on_render_end)
+    bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    for handlers, handler in (
+        (bpy.app.handlers.render_init, _on_render_init),
+        (bpy.app.handlers.render_complete, _on_render_end),
+        (bpy.app.handlers.render_cancel, _on_render_end),
+        (bpy.app.handlers.load_post, _on_load_post),
+    ):
+        if handler in handlers:
+            handlers.remove(handler)
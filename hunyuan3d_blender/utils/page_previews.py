@@ -0,0 +1,56 @@
+"""Loads the result previews of the generations page shown, from a timer, never from the panel draw."""
+import bpy
+from bpy.app.handlers import persistent
+
+from .timer_manager import TimerManager
+from .image import PRIORITY_VISIBLE, PRIORITY_PREFETCH
+from .generation_index import get_page_generations
+
+
+timer_id = "request_page_previews"
+
+
+def iter_page_previews(generations: list):
+    """Previews the panel draws for the generations of a page: those expanded."""
+    for generation in generations:
+        if not generation.expand_in_gen_ui:
+            continue
+        for result in generation.result:
+            yield from (result.intermediate_output.image, result.url_result.gif, result.intermediate_output.gif)
+
+
+def request_page_previews():
+    """Requests the previews of the page shown, then those of the next one as prefetch."""
+    context = bpy.context
+    if context.scene is None or context.window_manager is None:
+        return None
+    scn_h3d = context.scene.h3d
+    wm_h3d = context.window_manager.h3d
+    page_index = wm_h3d.ui_filter_generation_page_index
+    for offset, priority in ((0, PRIORITY_VISIBLE), (1, PRIORITY_PREFETCH)):
+        for preview in iter_page_previews(get_page_generations(scn_h3d, wm_h3d, page_index + offset)):
+            if preview.url and preview.image_ptr is None:
+                preview.load_image(priority=priority)
+    return None
+
+
+def schedule_page_previews() -> None:
+    """Requests the page previews on the next timer tick, once however many times it's called
+    before. For property updates and handlers, where the page may still change."""
+    if not TimerManager.exists(timer_id):
+        TimerManager.add(timer_id, request_page_previews, first_interval=0.0)
+
+
+@persistent
+def _on_load_post(*args):
+    schedule_page_previews()
+
+
+def register():
+    bpy.app.handlers.load_post.append(_on_load_post)
+    schedule_page_previews()
+
+
+def unregister():
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
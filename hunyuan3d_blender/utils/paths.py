@@ -0,0 +1,18 @@
+import bpy
+from pathlib import Path
+
+
+# Root package of the addon (e.g. "bl_ext.user_default.hunyuan3d_bridge").
+addon_package = __package__.rpartition('.')[0]
+package_name_sort = addon_package.split('.')[-1]
+
+
+def get_user_data_dir(name: str) -> Path:
+    """Returns (creating it if needed) a persistent per-user directory for addon data."""
+    try:
+        dirpath = Path(bpy.utils.extension_path_user(addon_package, path=name, create=True))
+    except (ValueError, AttributeError):
+        # Not installed as an extension: fall back next to the addon config file.
+        dirpath = Path(bpy.utils.user_resource('CONFIG')) / f"{package_name_sort}_{name}"
+        dirpath.mkdir(parents=True, exist_ok=True)
+    return dirpath
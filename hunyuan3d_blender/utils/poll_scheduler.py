@@ -0,0 +1,119 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+MIN_INTERVAL = 1.0
+DEFAULT_INTERVAL = 4.0
+MAX_INTERVAL = 60.0
+# Fraction of the estimated remaining time to wait before the next poll.
+ETA_FRACTION = 0.5
+NEAR_COMPLETION_PROGRESS = 90.0
+
+
+def _clamp(value: float, min_value: float = MIN_INTERVAL, max_value: float = MAX_INTERVAL) -> float:
+    return max(min_value, min(max_value, value))
+
+
+def get_response_progress(response: Dict[str, Any]) -> float:
+    """Overall progress (0-100) of a creation details response, averaged over its results."""
+    progresses = []
+    for result in response.get("result", []):
+        if result.get("status") == "fail":
+            continue
+        progress = result.get("progress", 0.0) or 0.0
+        stages = (result.get("progressGeometry", 0.0) or 0.0) + (result.get("progressTexture", 0.0) or 0.0)
+        progresses.append(max(progress, stages / 2.0))
+    if not progresses:
+        return 0.0
+    return sum(progresses) / len(progresses)
+
+
+@dataclass
+class PollState:
+    next_poll: float = 0.0
+    interval: float = DEFAULT_INTERVAL
+    last_progress: float | None = None
+    last_update: float = 0.0
+    stalled_polls: int = 0
+
+
+class PollScheduler:
+    """Decides when each running generation should be polled next.
+
+    - Queued jobs ('wait') are polled at a fraction of the server's `waitTime`.
+    - Processing jobs are polled at a fraction of the ETA estimated from their progress
+      velocity, so polls get more frequent as they approach completion.
+    - Jobs whose progress doesn't move back off exponentially.
+    """
+
+    def __init__(self):
+        self._states: dict[str, PollState] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._states
+
+    def __iter__(self):
+        return iter(self._states)
+
+    def add(self, key: str, now: float | None = None) -> None:
+        """Starts tracking a generation, due for polling right away."""
+        if now is None:
+            now = time.monotonic()
+        self._states[key] = PollState(next_poll=now, last_update=now)
+
+    def remove(self, key: str) -> None:
+        self._states.pop(key, None)
+
+    def get_due(self, now: float | None = None) -> list[str]:
+        if now is None:
+            now = time.monotonic()
+        return [key for key, state in self._states.items() if state.next_poll <= now]
+
+    def postpone(self, key: str, now: float | None = None) -> None:
+        """Reschedules a generation whose poll failed, using its current interval."""
+        if (state := self._states.get(key)) is None:
+            return
+        if now is None:
+            now = time.monotonic()
+        state.next_poll = now + state.interval
+
+    def update(self, key: str, response: Dict[str, Any], now: float | None = None) -> float:
+        """Schedules the next poll of a generation from its latest details response.
+
+        Returns the chosen interval in seconds.
+        """
+        if (state := self._states.get(key)) is None:
+            return 0.0
+        if now is None:
+            now = time.monotonic()
+
+        status = response.get("status", "wait")
+        progress = get_response_progress(response)
+        wait_time = response.get("waitTime", 0) or 0
+
+        if status == "wait" and progress <= 0.0:
+            interval = _clamp(wait_time * ETA_FRACTION) if wait_time > 0 else DEFAULT_INTERVAL
+            state.stalled_polls = 0
+        elif progress >= NEAR_COMPLETION_PROGRESS:
+            interval = MIN_INTERVAL
+            state.stalled_polls = 0
+        elif state.last_progress is not None and progress > state.last_progress:
+            velocity = (progress - state.last_progress) / max(now - state.last_update, 1e-3)
+            eta = (100.0 - progress) / velocity
+            interval = _clamp(eta * ETA_FRACTION)
+            state.stalled_polls = 0
+        elif state.last_progress is None:
+            interval = DEFAULT_INTERVAL
+        else:
+            state.stalled_polls += 1
+            interval = _clamp(DEFAULT_INTERVAL * (2 ** state.stalled_polls))
+
+        state.interval = interval
+        state.next_poll = now + interval
+        state.last_progress = progress
+        state.last_update = now
+        return interval
@@ -0,0 +1,220 @@
+"""Animated turntable previews: GIF frames packed into a sprite atlas, played back in an icon."""
+import bpy
+import bpy.utils.previews
+import io
+import time
+import requests
+import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import imageio.v3 as iio
+
+from .timer_manager import TimerManager
+from .asset_cache import get_thumbnail_cache
+from .image import get_content_bounds, to_rgba_uint8, get_thumbnail_key, REQUEST_TIMEOUT
+from .image_encode import PILImage
+from .ui import ui_tag_redraw
+
+
+ATLAS_KIND = "png"
+# Frames kept from a GIF (evenly sampled) and their longest edge in the atlas, in pixels.
+MAX_FRAMES = 24
+FRAME_SIZE = 192
+DEFAULT_FRAME_DURATION = 0.08
+# Atlases kept decoded in memory, least recently used dropped first.
+MAX_ATLAS_BYTES = 32 * 1024 * 1024
+
+timer_id = "preview_animation_timer"
+executor = None
+# (url, Atlas | None) built by the worker.
+loaded_atlases = deque()
+atlases: OrderedDict[str, "Atlas"] = OrderedDict()
+loading_urls: set[str] = set()
+
+# The one animated preview: key shown by the panel, GIF URL, and playback state.
+animated_key: str | None = None
+animated_url: str | None = None
+frame_index = -1
+frame_time = 0.0
+previews = None
+# Reused float buffer written to the icon, sized for the current atlas frame.
+frame_buffer: np.ndarray | None = None
+
+
+@dataclass
+class Atlas:
+    pixels: np.ndarray  # (rows * frame_height, columns * frame_width, 4) uint8, top to bottom.
+    frame_count: int
+    columns: int
+    frame_width: int
+    frame_height: int
+    frame_duration: float
+
+    def get_frame(self, index: int) -> np.ndarray:
+        row, column = divmod(index % self.frame_count, self.columns)
+        return self.pixels[row * self.frame_height:(row + 1) * self.frame_height,
+                           column * self.frame_width:(column + 1) * self.frame_width]
+
+    def get_info(self) -> dict:
+        return {"frame_count": self.frame_count, "columns": self.columns, "frame_width": self.frame_width,
+                "frame_height": self.frame_height, "frame_duration": self.frame_duration}
+
+
+# --- Worker side. ---
+
+def build_atlas(data: bytes) -> Atlas | None:
+    """Decodes the sampled frames one at a time (never the whole GIF at full size) into small
+    frames, then crops them all to their common content bounds and packs them in a grid."""
+    with PILImage.open(io.BytesIO(data)) as gif:
+        frame_count = getattr(gif, "n_frames", 1)
+        indices = np.unique(np.linspace(0, frame_count - 1, min(frame_count, MAX_FRAMES)).astype(int))
+        frame_duration = gif.info.get("duration", 0) / 1000.0 * frame_count / len(indices)
+        frames = []
+        for index in indices:
+            gif.seek(int(index))
+            frame = gif.convert("RGBA")
+            frame.thumbnail((FRAME_SIZE, FRAME_SIZE), PILImage.Resampling.BOX)
+            frames.append(to_rgba_uint8(np.asarray(frame)))
+
+    bounds = [get_content_bounds(frame) for frame in frames]
+    bounds = [bound for bound in bounds if bound is not None]
+    if not bounds:
+        return None
+    y_min, x_min = min(bound[0] for bound in bounds), min(bound[2] for bound in bounds)
+    y_max, x_max = max(bound[1] for bound in bounds), max(bound[3] for bound in bounds)
+    frame_width, frame_height = x_max - x_min, y_max - y_min
+    columns = int(np.ceil(np.sqrt(len(frames))))
+    rows = int(np.ceil(len(frames) / columns))
+
+    pixels = np.zeros((rows * frame_height, columns * frame_width, 4), dtype=np.uint8)
+    atlas = Atlas(pixels, len(frames), columns, frame_width, frame_height, frame_duration or DEFAULT_FRAME_DURATION)
+    for index, frame in enumerate(frames):
+        atlas.get_frame(index)[...] = frame[y_min:y_max, x_min:x_max]
+    return atlas
+
+
+def _load_atlas(url: str) -> Atlas | None:
+    """The atlas from the thumbnail cache, else built from the downloaded GIF and cached."""
+    cache = get_thumbnail_cache()
+    key = get_thumbnail_key(f"atlas:{url}")
+    cached_filepath = cache.lookup(key, ATLAS_KIND)
+    info = cache.get_info(key, ATLAS_KIND)
+    if cached_filepath is not None and info:
+        return Atlas(pixels=to_rgba_uint8(iio.imread(cached_filepath)), **info)
+
+    response = requests.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    atlas = build_atlas(response.content)
+    if atlas is not None:
+        download_path = cache.get_download_path(key, ATLAS_KIND)
+        iio.imwrite(download_path, atlas.pixels, extension=".png")
+        cache.store(key, ATLAS_KIND, download_path, url=url, info=atlas.get_info())
+    return atlas
+
+
+def _load(url: str) -> None:
+    try:
+        loaded_atlases.append((url, _load_atlas(url)))
+    except Exception as e:
+        print(f"⚠️  Warning: Could not load the animated preview {url}: {e}")
+        loaded_atlases.append((url, None))
+
+
+# --- Main thread. ---
+
+def _store_atlas(url: str, atlas: Atlas) -> None:
+    atlases[url] = atlas
+    atlases.move_to_end(url)
+    total_bytes = sum(atlas.pixels.nbytes for atlas in atlases.values())
+    while len(atlases) > 1 and total_bytes > MAX_ATLAS_BYTES:
+        _url, dropped = atlases.popitem(last=False)
+        total_bytes -= dropped.pixels.nbytes
+
+
+def _get_preview() -> bpy.types.ImagePreview:
+    global previews
+    if previews is None:
+        previews = bpy.utils.previews.new()
+    if "animated" not in previews:
+        previews.new("animated")
+    return previews["animated"]
+
+
+def _show_frame(atlas: Atlas, index: int) -> None:
+    """Writes a frame into the icon, through the reused float buffer."""
+    global frame_buffer
+    preview = _get_preview()
+    size = atlas.frame_width * atlas.frame_height * 4
+    if frame_buffer is None or len(frame_buffer) != size:
+        frame_buffer = np.empty(size, dtype=np.float32)
+    # Icons are stored bottom to top: flipped through a negative stride view, not a copy.
+    np.multiply(atlas.get_frame(index)[::-1], 1.0 / 255.0, out=frame_buffer.reshape(atlas.frame_height, atlas.frame_width, 4))
+    preview.image_size = (atlas.frame_width, atlas.frame_height)
+    preview.image_pixels_float.foreach_set(frame_buffer)
+
+
+def preview_animation_timer():
+    global frame_index, frame_time
+    while loaded_atlases:
+        url, atlas = loaded_atlases.popleft()
+        loading_urls.discard(url)
+        if atlas is not None:
+            _store_atlas(url, atlas)
+        elif url == animated_url:
+            stop_preview_animation()
+
+    if animated_url is None:
+        return None
+    atlas = atlases.get(animated_url)
+    if atlas is None:
+        # Still loading.
+        return DEFAULT_FRAME_DURATION
+
+    now = time.monotonic()
+    if frame_index < 0 or now - frame_time >= atlas.frame_duration:
+        frame_index = (frame_index + 1) % atlas.frame_count
+        frame_time = now
+        _show_frame(atlas, frame_index)
+        # Only the sidebars, where the panel is.
+        ui_tag_redraw("VIEW_3D", "UI")
+    return max(0.01, atlas.frame_duration - (time.monotonic() - frame_time))
+
+
+def get_animated_icon(key: str) -> int | None:
+    """Icon of the playing animation if `key` is the animated preview and a frame is shown."""
+    if key != animated_key or frame_index < 0 or previews is None or "animated" not in previews:
+        return None
+    return previews["animated"].icon_id
+
+
+def start_preview_animation(key: str, url: str) -> None:
+    global animated_key, animated_url, frame_index, frame_time, executor
+    animated_key, animated_url = key, url
+    frame_index, frame_time = -1, 0.0
+    if url in atlases:
+        atlases.move_to_end(url)
+    elif url not in loading_urls:
+        loading_urls.add(url)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="h3d_preview_animation")
+        executor.submit(_load, url)
+    if not TimerManager.exists(timer_id):
+        TimerManager.add(timer_id, preview_animation_timer, first_interval=0.0)
+
+
+def stop_preview_animation() -> None:
+    global animated_key, animated_url
+    animated_key = animated_url = None
+    ui_tag_redraw("VIEW_3D", "UI")
+
+
+def unregister():
+    global previews, executor
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
+    if previews is not None:
+        bpy.utils.previews.remove(previews)
+        previews = None
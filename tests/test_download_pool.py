@@ -0,0 +1,147 @@
+"""DownloadPool scheduling: coalescing, priority, per-host limit, and restarts after a cancel.
+
+Runs without Blender: the module is loaded from its file, as importing the addon package needs bpy.
+"""
+import threading
+import importlib.util
+from pathlib import Path
+
+
+DOWNLOAD_POOL_PATH = Path(__file__).resolve().parent.parent / "hunyuan3d_blender" / "utils" / "download_pool.py"
+spec = importlib.util.spec_from_file_location("h3d_download_pool", DOWNLOAD_POOL_PATH)
+download_pool = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(download_pool)
+
+TIMEOUT = 5.0
+
+
+class FakeDownloads:
+    """`download_func` that writes the URL to the file once its gate opens, or fails if cancelled first."""
+
+    def __init__(self, gated: bool = True):
+        self.lock = threading.Lock()
+        self.gate = threading.Event()
+        if not gated:
+            self.gate.set()
+        self.started = threading.Semaphore(0)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def __call__(self, url, filepath, progress_key, cancel_event):
+        with self.lock:
+            self.calls.append(url)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.started.release()
+        try:
+            while not self.gate.wait(0.01):
+                if cancel_event.is_set():
+                    return False, None
+            Path(filepath).write_text(url)
+            return True, filepath
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class Results:
+    def __init__(self, count: int):
+        self.done = threading.Semaphore(0)
+        self.count = count
+        self.by_key = {}
+
+    def callback(self, key: str):
+        def on_complete(success, filepath):
+            self.by_key[key] = (success, filepath)
+            self.done.release()
+        return on_complete
+
+    def wait(self) -> dict:
+        for _ in range(self.count):
+            assert self.done.acquire(timeout=TIMEOUT)
+        return self.by_key
+
+
+def test_same_url_is_downloaded_once(tmp_path):
+    downloads = FakeDownloads()
+    pool = download_pool.DownloadPool(downloads)
+    results = Results(2)
+    first, second = tmp_path / "first.glb", tmp_path / "second.glb"
+    pool.request("a", "http://host/model.glb", str(first), on_complete=results.callback("a"))
+    assert downloads.started.acquire(timeout=TIMEOUT)
+    pool.request("b", "http://host/model.glb", str(second), on_complete=results.callback("b"))
+    downloads.gate.set()
+
+    assert results.wait() == {"a": (True, str(first)), "b": (True, str(second))}
+    assert downloads.calls == ["http://host/model.glb"]
+    assert second.read_text() == "http://host/model.glb"
+    assert not pool.is_busy()
+
+
+def test_higher_priority_runs_first(tmp_path):
+    downloads = FakeDownloads()
+    pool = download_pool.DownloadPool(downloads, max_workers=1)
+    results = Results(3)
+    pool.request("blocker", "http://host/0", str(tmp_path / "0"), on_complete=results.callback("blocker"))
+    assert downloads.started.acquire(timeout=TIMEOUT)
+    pool.request("low", "http://host/low", str(tmp_path / "low"), download_pool.PRIORITY_LOW,
+                 on_complete=results.callback("low"))
+    pool.request("high", "http://host/high", str(tmp_path / "high"), download_pool.PRIORITY_HIGH,
+                 on_complete=results.callback("high"))
+    downloads.gate.set()
+
+    results.wait()
+    assert downloads.calls == ["http://host/0", "http://host/high", "http://host/low"]
+
+
+def test_per_host_limit(tmp_path):
+    downloads = FakeDownloads()
+    pool = download_pool.DownloadPool(downloads, max_workers=6, max_per_host=2)
+    results = Results(6)
+    for index in range(5):
+        pool.request(f"a{index}", f"http://a/{index}", str(tmp_path / f"a{index}"), on_complete=results.callback(f"a{index}"))
+    pool.request("b", "http://b/0", str(tmp_path / "b"), on_complete=results.callback("b"))
+    for _ in range(3):
+        assert downloads.started.acquire(timeout=TIMEOUT)
+    with downloads.lock:
+        # Two from host a, one from host b.
+        assert downloads.active == 3
+    downloads.gate.set()
+
+    assert all(success for success, _filepath in results.wait().values())
+    assert downloads.max_active == 3
+
+
+def test_cancel_then_request_again_restarts_after_the_cancelled_run(tmp_path):
+    downloads = FakeDownloads()
+    pool = download_pool.DownloadPool(downloads)
+    results = Results(1)
+    filepath = str(tmp_path / "model.glb")
+    pool.request("a", "http://host/model.glb", filepath, on_complete=results.callback("a"))
+    assert downloads.started.acquire(timeout=TIMEOUT)
+    assert pool.cancel("a")
+    # While the cancelled run still holds the partial file.
+    pool.request("b", "http://host/model.glb", filepath, on_complete=results.callback("b"))
+    assert downloads.started.acquire(timeout=TIMEOUT)
+    downloads.gate.set()
+
+    assert results.wait() == {"b": (True, filepath)}
+    assert downloads.calls == ["http://host/model.glb"] * 2
+    assert downloads.max_active == 1
+    assert not pool.is_pending("a") and not pool.is_pending("b")
+
+
+def test_cancelled_queued_request_never_runs(tmp_path):
+    downloads = FakeDownloads()
+    pool = download_pool.DownloadPool(downloads, max_workers=1)
+    results = Results(1)
+    pool.request("blocker", "http://host/0", str(tmp_path / "0"), on_complete=results.callback("blocker"))
+    assert downloads.started.acquire(timeout=TIMEOUT)
+    pool.request("queued", "http://host/1", str(tmp_path / "1"), on_complete=results.callback("queued"))
+    assert pool.cancel("queued")
+    assert not pool.cancel("queued")
+    downloads.gate.set()
+
+    assert results.wait() == {"blocker": (True, str(tmp_path / "0"))}
+    assert downloads.calls == ["http://host/0"]
@@ -0,0 +1,55 @@
+"""StreamingJSONBody must send exactly the bytes of `json.dumps`, with a matching Content-Length.
+
+Runs without Blender: the module is loaded from its file, as importing the addon package needs bpy.
+"""
+import json
+import base64
+import importlib.util
+from pathlib import Path
+
+import pytest
+import requests
+
+
+STREAMING_PATH = Path(__file__).resolve().parent.parent / "hunyuan3d_blender" / "api" / "streaming.py"
+spec = importlib.util.spec_from_file_location("h3d_streaming", STREAMING_PATH)
+streaming = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(streaming)
+
+PAYLOAD = {"prompt": "a \"quoted\" prompt ✓", "count": 4, "enable_pbr": True, "guidance_scale": 5.0}
+
+
+def expected_body(payload: dict, data: bytes) -> bytes:
+    data_url = f"data:image/png;base64,{base64.b64encode(data).decode('ascii')}"
+    return json.dumps({**payload, "image": data_url}).encode('utf-8')
+
+
+@pytest.mark.parametrize("payload", [PAYLOAD, {}])
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 4, 1000, 3 * 16 * 1024 + 7])
+@pytest.mark.parametrize("chunk_size", [3, 4, 1024, streaming.CHUNK_SIZE])
+def test_body_matches_json_dumps(payload, size, chunk_size):
+    data = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+    body = streaming.StreamingJSONBody(payload, "image", data, "image/png", chunk_size=chunk_size)
+    expected = expected_body(payload, data)
+
+    assert b"".join(body) == expected
+    assert len(body) == len(expected)
+    assert json.loads(expected)["image"].endswith(base64.b64encode(data).decode('ascii'))
+
+
+def test_body_accepts_memoryview():
+    data = bytes(range(256)) * 10
+    body = streaming.StreamingJSONBody(PAYLOAD, "image", memoryview(data), "image/png")
+
+    assert b"".join(body) == expected_body(PAYLOAD, data)
+
+
+def test_requests_sends_content_length():
+    data = bytes(range(256)) * 1000
+    body = streaming.StreamingJSONBody(PAYLOAD, "image", data, "image/png")
+    prepared = requests.Request("POST", "http://127.0.0.1/api/3d/creations/generations", data=body,
+                                headers={"Content-Type": "application/json"}).prepare()
+
+    assert prepared.headers["Content-Length"] == str(len(expected_body(PAYLOAD, data)))
+    assert "Transfer-Encoding" not in prepared.headers
+    assert b"".join(prepared.body) == expected_body(PAYLOAD, data)